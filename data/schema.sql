@@ -1,14 +1,78 @@
--- data/schema.sql
--- Schema for User Activity Logs
-
-CREATE TABLE IF NOT EXISTS user_activity_logs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id INTEGER NOT NULL,
-    action TEXT NOT NULL,
-    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-    metadata_json TEXT, -- Storing JSON as TEXT
-    ip_address TEXT
+-- Generated from the models in src/core/database.py; do not edit.
+-- Regenerate with: python -m src.scripts.datasets --schema
+
+CREATE TABLE logs (
+	id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, 
+	user_id INTEGER, 
+	action VARCHAR, 
+	timestamp DATETIME, 
+	ip_address VARCHAR, 
+	metadata_json TEXT
+);
+
+CREATE INDEX ix_logs_action_timestamp_id ON logs (action, timestamp, id);
+
+CREATE INDEX ix_logs_meta_page_timestamp_id ON logs (json_extract(CASE WHEN json_valid(metadata_json) THEN metadata_json END, '$.page'), timestamp, id);
+
+CREATE INDEX ix_logs_meta_session_timestamp_id ON logs (json_extract(CASE WHEN json_valid(metadata_json) THEN metadata_json END, '$.session'), timestamp, id);
+
+CREATE INDEX ix_logs_timestamp_id ON logs (timestamp, id);
+
+CREATE INDEX ix_logs_user_timestamp_id ON logs (user_id, timestamp, id);
+
+CREATE TABLE rollup_actions (
+	action VARCHAR NOT NULL, 
+	count INTEGER NOT NULL, 
+	PRIMARY KEY (action)
 );
 
-CREATE INDEX IF NOT EXISTS idx_user_id ON user_activity_logs (user_id);
-CREATE INDEX IF NOT EXISTS idx_timestamp ON user_activity_logs (timestamp);
+CREATE TABLE rollup_minute_actions (
+	minute VARCHAR NOT NULL, 
+	action VARCHAR NOT NULL, 
+	count INTEGER NOT NULL, 
+	PRIMARY KEY (minute, action)
+)
+ WITHOUT ROWID;
+
+CREATE TABLE rollup_users (
+	user_id INTEGER NOT NULL, 
+	count INTEGER NOT NULL, 
+	PRIMARY KEY (user_id)
+);
+
+CREATE TRIGGER IF NOT EXISTS logs_rollup_insert AFTER INSERT ON logs BEGIN
+    INSERT INTO rollup_actions (action, count)
+        VALUES (coalesce(NEW.action, ''), 1)
+        ON CONFLICT (action) DO UPDATE SET count = count + 1;
+    INSERT INTO rollup_minute_actions (minute, action, count)
+        VALUES (coalesce(substr(NEW.timestamp, 1, 16), ''), coalesce(NEW.action, ''), 1)
+        ON CONFLICT (minute, action) DO UPDATE SET count = count + 1;
+    INSERT INTO rollup_users (user_id, count)
+        SELECT NEW.user_id, 1 WHERE NEW.user_id IS NOT NULL
+        ON CONFLICT (user_id) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS logs_rollup_delete AFTER DELETE ON logs BEGIN
+    UPDATE rollup_actions SET count = count - 1
+        WHERE action = coalesce(OLD.action, '');
+    DELETE FROM rollup_actions WHERE action = coalesce(OLD.action, '') AND count = 0;
+    UPDATE rollup_minute_actions SET count = count - 1
+        WHERE minute = coalesce(substr(OLD.timestamp, 1, 16), '')
+        AND action = coalesce(OLD.action, '');
+    DELETE FROM rollup_minute_actions
+        WHERE minute = coalesce(substr(OLD.timestamp, 1, 16), '')
+        AND action = coalesce(OLD.action, '') AND count = 0;
+    UPDATE rollup_users SET count = count - 1 WHERE user_id = OLD.user_id;
+    DELETE FROM rollup_users WHERE user_id = OLD.user_id AND count = 0;
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(metadata_json, content='logs', content_rowid='id');
+
+CREATE TRIGGER IF NOT EXISTS logs_fts_insert AFTER INSERT ON logs BEGIN
+    INSERT INTO logs_fts (rowid, metadata_json) VALUES (NEW.id, NEW.metadata_json);
+END;
+
+CREATE TRIGGER IF NOT EXISTS logs_fts_delete AFTER DELETE ON logs BEGIN
+    INSERT INTO logs_fts (logs_fts, rowid, metadata_json)
+        VALUES ('delete', OLD.id, OLD.metadata_json);
+END;
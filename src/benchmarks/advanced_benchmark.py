@@ -18,13 +18,22 @@ from rich.progress import (
 )
 from rich.table import Table
 
+from src.client.graphql_client import post_persisted
+from src.client.grpc_client import stream_logs
+from src.servers.manager import ServerManager
 from src.servers.protos import logs_pb2, logs_pb2_grpc
 
 # --- CONFIG ---
 ITERATIONS = 50
 CONCURRENT_CLIENTS = 10
 BATCH_SIZES = [1, 100, 1000]
+STREAM_SIZES = [1_000, 100_000, 1_000_000]
+# Unary GetLogs cannot return large pages at all under the default 4 MB cap
+UNCAPPED = [("grpc.max_receive_message_length", -1)]
 PORTS = {"REST": 8000, "GraphQL": 8001, "SSE": 8002, "WebSocket": 8003, "gRPC": 50051}
+# A cached response is served before the query is looked at, hash or text, so
+# the APQ row and its text baseline run against a GraphQL server without one
+NO_CACHE = {"ARENA_CACHE_MB": "0"}
 
 console = Console()
 
@@ -76,13 +85,20 @@ class RestBenchmark(ProtocolBenchmark):
 
 
 class GraphQlBenchmark(ProtocolBenchmark):
+    def __init__(self, name, port, apq=False, env=None):
+        super().__init__(name, port)
+        self.apq = apq
+        self.env = env or {}  # ARENA_* settings the server is restarted with
+
     async def benchmark_latency(self, limit=100):
         query = "query { logs(limit: %d) { id action timestamp } }" % limit
+        url = f"http://localhost:{self.port}/graphql"
         async with httpx.AsyncClient() as client:
             start = time.perf_counter()
-            resp = await client.post(
-                f"http://localhost:{self.port}/graphql", json={"query": query}
-            )
+            if self.apq:
+                resp = await post_persisted(client, url, query)
+            else:
+                resp = await client.post(url, json={"query": query})
             resp.raise_for_status()
             duration = time.perf_counter() - start
             return duration
@@ -97,6 +113,48 @@ class GrpcBenchmark(ProtocolBenchmark):
             duration = time.perf_counter() - start
             return duration
 
+    async def benchmark_unary(self, limit):
+        """(ttfb, total, rows, bytes) for one GetLogs; nothing arrives before the end"""
+        target = f"localhost:{self.port}"
+        async with grpc.aio.insecure_channel(target, options=UNCAPPED) as channel:
+            stub = logs_pb2_grpc.ActivityServiceStub(channel)
+            start = time.perf_counter()
+            resp = await stub.GetLogs(logs_pb2.GetLogsRequest(limit=limit))
+            duration = time.perf_counter() - start
+            return duration, duration, len(resp.logs), resp.ByteSize()
+
+    async def benchmark_stream(self, limit, chunk_size=0):
+        """(ttfb, total, rows) for one StreamLogs call"""
+        async with grpc.aio.insecure_channel(f"localhost:{self.port}") as channel:
+            stub = logs_pb2_grpc.ActivityServiceStub(channel)
+            start = time.perf_counter()
+            ttfb = None
+            rows = 0
+            async for _ in stream_logs(stub, limit, chunk_size):
+                if ttfb is None:
+                    ttfb = time.perf_counter() - start
+                rows += 1
+            duration = time.perf_counter() - start
+            return ttfb or duration, duration, rows
+
+
+graphql_env = {}  # what the running GraphQL server was started with
+
+
+def serve_graphql(env):
+    """Restarts GraphQL when the next row needs other ARENA_* settings"""
+    global graphql_env
+    if env == graphql_env:
+        return
+    if not ServerManager.restart("GraphQL", env):
+        raise RuntimeError("GraphQL server did not come back up")
+    graphql_env = env
+
+
+def prepare(benchmark_obj):
+    if isinstance(benchmark_obj, GraphQlBenchmark):
+        serve_graphql(benchmark_obj.env)
+
 
 async def run_iterations(benchmark_obj, limit, count):
     latencies = []
@@ -119,6 +177,14 @@ async def run_concurrent(benchmark_obj, limit, clients, reqs_per_client):
 
 
 async def main():
+    try:
+        await run_suite()
+    finally:
+        # Leave GraphQL running the way the suite found it
+        serve_graphql({})
+
+
+async def run_suite():
     rprint(
         Panel.fit(
             "[bold blue]🚀 Protocol Lab: Advanced Benchmark Suite[/bold blue]\n[italic]Comparing REST, GraphQL, and gRPC at Scale[/italic]"
@@ -128,6 +194,10 @@ async def main():
     benchmarks = [
         RestBenchmark("REST", PORTS["REST"]),
         GraphQlBenchmark("GraphQL", PORTS["GraphQL"]),
+        GraphQlBenchmark("GraphQL (no cache)", PORTS["GraphQL"], env=NO_CACHE),
+        GraphQlBenchmark(
+            "GraphQL (APQ, no cache)", PORTS["GraphQL"], apq=True, env=NO_CACHE
+        ),
         GrpcBenchmark("gRPC", PORTS["gRPC"]),
     ]
 
@@ -150,6 +220,7 @@ async def main():
         payload_table.add_column(f"{size} items", justify="right")
 
     for b in benchmarks:
+        prepare(b)
         row = [b.name]
         for size in BATCH_SIZES:
             latencies = await run_iterations(b, size, ITERATIONS)
@@ -171,6 +242,7 @@ async def main():
     concurrent_table.add_column("Throughput (req/s)", justify="right")
 
     for b in benchmarks:
+        prepare(b)
         duration, latencies = await run_concurrent(b, 100, CONCURRENT_CLIENTS, 10)
         total_reqs = CONCURRENT_CLIENTS * 10
         avg_ms = statistics.mean(latencies) * 1000
@@ -187,6 +259,31 @@ async def main():
 
     console.print(concurrent_table)
 
+    # 4. Unary vs Server-Streaming gRPC
+    rprint(
+        "\n[bold yellow]🌊 Category 3: gRPC GetLogs vs StreamLogs (one call each)[/bold yellow]"
+    )
+    stream_table = Table(title="Large Result Sets (ms)")
+    stream_table.add_column("Limit", style="cyan", justify="right")
+    stream_table.add_column("Rows", justify="right")
+    stream_table.add_column("Unary Msg (MB)", justify="right")
+    stream_table.add_column("Unary TTFB / Total", justify="right")
+    stream_table.add_column("Stream TTFB / Total", justify="right")
+
+    grpc_bench = benchmarks[-1]
+    for size in STREAM_SIZES:
+        u_ttfb, u_total, rows, size_bytes = await grpc_bench.benchmark_unary(size)
+        s_ttfb, s_total, _ = await grpc_bench.benchmark_stream(size)
+        stream_table.add_row(
+            f"{size:,}",
+            f"{rows:,}",
+            f"{size_bytes / 1e6:.1f}",
+            f"{u_ttfb * 1000:.0f} / {u_total * 1000:.0f}",
+            f"{s_ttfb * 1000:.0f} / {s_total * 1000:.0f}",
+        )
+
+    console.print(stream_table)
+
     rprint("\n[bold green]🏆 Benchmark Summary:[/bold green]")
     rprint(
         "gRPC continues to dominate in high-concurrency and large-payload scenarios due to binary serialization and multiplexing."
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import multiprocessing
+import statistics
+import time
+from datetime import datetime, timezone
+
+import httpx
+import websockets
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.benchmarks.ingest_benchmark import delete_after, max_id
+from src.servers.manager import SERVER_MAP, ServerManager
+
+# --- CONFIG ---
+RATES = [100, 1000, 5000]  # inserted rows per second
+SUBSCRIBERS = 10
+DURATION_SEC = 5
+TICK_MS = 10  # the writer sends rate * tick rows per request
+# (pushed by, written through): REST writes land in another process and are
+# found by polling; /ingest writes wake the WebSocket server's feed directly
+PATHS = [("SSE", "REST"), ("WebSocket", "REST"), ("WebSocket", "WebSocket")]
+ENV = {"ARENA_PUSH_SOURCE": "feed"}
+
+REST_URL = f"http://localhost:{SERVER_MAP['REST']['port']}"
+SSE_URL = f"http://localhost:{SERVER_MAP['SSE']['port']}/stream"
+WS_PORT = SERVER_MAP["WebSocket"]["port"]
+
+console = Console()
+
+
+def inserted_at(timestamp: str) -> float:
+    """Epoch seconds of a row's stored timestamp, stamped by the server on insert"""
+    return datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
+
+
+async def sse_subscriber(client, latencies, ready):
+    async with client.stream("GET", SSE_URL) as response:
+        ready.set()
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                event = json.loads(line[6:])
+                latencies.append(time.time() - inserted_at(event["timestamp"]))
+
+
+async def ws_subscriber(client, latencies, ready):
+    async with websockets.connect(f"ws://localhost:{WS_PORT}/ws") as ws:
+        await ws.send(json.dumps({"action_filter": None}))
+        ready.set()
+        async for raw in ws:
+            event = json.loads(raw)
+            latencies.append(time.time() - inserted_at(event["timestamp"]))
+
+
+def writer_process(job):
+    """Inserts rate rows/s for the duration, in one request per tick; returns rows written"""
+    via, rate, duration = job
+    per_tick = max(1, round(rate * TICK_MS / 1000))
+    body = "\n".join(
+        json.dumps({"user_id": 1, "action": "VIEW"}) for _ in range(per_tick)
+    )
+
+    async def run():
+        written = 0
+        start = time.perf_counter()
+        if via == "REST":
+            client = httpx.AsyncClient(base_url=REST_URL, timeout=30)
+            send = lambda: client.post("/logs", content=body)
+        else:
+            client = await websockets.connect(f"ws://localhost:{WS_PORT}/ingest")
+
+            async def send():
+                await client.send(body)
+                await client.recv()
+
+        tick = 0
+        while time.perf_counter() - start < duration:
+            # Paced against the clock, so a slow request is caught up on, not skipped
+            tick += 1
+            await send()
+            written += per_tick
+            due = start + tick * TICK_MS / 1000
+            await asyncio.sleep(max(0, due - time.perf_counter()))
+        await (client.aclose() if via == "REST" else client.close())
+        return written
+
+    return asyncio.run(run())
+
+
+async def subscribe_and_write(protocol, via, rate):
+    subscriber = sse_subscriber if protocol == "SSE" else ws_subscriber
+    latencies = [[] for _ in range(SUBSCRIBERS)]
+    limits = httpx.Limits(max_connections=SUBSCRIBERS + 1)
+    async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+        readies = [asyncio.Event() for _ in range(SUBSCRIBERS)]
+        tasks = [
+            asyncio.create_task(subscriber(client, lats, ready))
+            for lats, ready in zip(latencies, readies)
+        ]
+        await asyncio.gather(*(r.wait() for r in readies))
+        await asyncio.sleep(0.5)
+
+        # The writer is its own process, so its pacing does not share our loop
+        loop = asyncio.get_running_loop()
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(1) as pool:
+            written = await loop.run_in_executor(
+                None, pool.apply, writer_process, ((via, rate, DURATION_SEC),)
+            )
+        await asyncio.sleep(1)  # let the tail of the stream arrive
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return written, latencies
+
+
+def measure(protocol, via, rate):
+    """Insert-to-delivery latency (ms) and the share of inserted rows each client got"""
+    written, per_client = asyncio.run(subscribe_and_write(protocol, via, rate))
+    latencies = sorted(lat * 1000 for lats in per_client for lat in lats)
+    if not latencies:
+        return None
+    return {
+        "written": written,
+        "delivered": statistics.mean(len(lats) for lats in per_client) / written,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]📡 Change Feed Benchmark[/bold blue]\n"
+            f"[italic]{SUBSCRIBERS} subscribers; latency from the row's insert "
+            "timestamp to its arrival at the client[/italic]"
+        )
+    )
+
+    table = Table(
+        title=f"New rows pushed over {DURATION_SEC}s (ARENA_PUSH_SOURCE=feed)"
+    )
+    table.add_column("Pushed by", style="cyan")
+    table.add_column("Written via")
+    table.add_column("Rows/s", justify="right")
+    table.add_column("Delivered / client", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+
+    first_new = max_id()
+    try:
+        for protocol, via in PATHS:
+            for rate in RATES:
+                with console.status(f"[bold green]{protocol} <- {via} at {rate}/s..."):
+                    for name in {protocol, via}:
+                        if not ServerManager.restart(name, ENV):
+                            rprint(f"❌ {name} did not come up")
+                            return
+                    res = measure(protocol, via, rate)
+                if res is None:
+                    table.add_row(protocol, via, str(rate), "0%", "-", "-")
+                    continue
+                table.add_row(
+                    protocol,
+                    via,
+                    f"{res['written'] / DURATION_SEC:,.0f}",
+                    f"{res['delivered']:.1%}",
+                    f"{res['p50']:.1f}",
+                    f"{res['p99']:.1f}",
+                )
+    finally:
+        ServerManager.stop_all()
+        delete_after(first_new)
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import asyncio
+
+import grpc
+import httpx
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.benchmarks.engine import BenchmarkEngine
+from src.servers.manager import SERVER_MAP, ServerManager
+from src.servers.protos import logs_pb2, logs_pb2_grpc
+
+# --- CONFIG ---
+PROTOCOLS = ["REST", "GraphQL", "gRPC"]
+CONCURRENCY = [20, 100, 500]
+DURATION_SEC = 3
+# The response cache would absorb identical requests before they reach the DB
+BASE_ENV = {"ARENA_CACHE_MB": "0"}
+
+console = Console()
+
+
+async def flight_stats(protocol):
+    port = SERVER_MAP[protocol]["port"]
+    if protocol == "gRPC":
+        async with grpc.aio.insecure_channel(f"localhost:{port}") as ch:
+            stub = logs_pb2_grpc.ActivityServiceStub(ch)
+            resp = await stub.CheckHealth(logs_pb2.HealthRequest())
+            return resp.counters["flight_calls"], resp.counters["flight_executions"]
+    async with httpx.AsyncClient() as client:
+        stats = (await client.get(f"http://localhost:{port}/health")).json()[
+            "coalescing"
+        ]
+        return stats["calls"], stats["executions"]
+
+
+async def run_protocol(engine, protocol, enabled):
+    """RPS and coalescing ratio at each concurrency level for one server mode"""
+    results = {}
+    for concurrency in CONCURRENCY:
+        calls0, execs0 = await flight_stats(protocol)
+        rps = await engine.run_throughput_test(
+            protocol,
+            SERVER_MAP[protocol]["port"],
+            duration_sec=DURATION_SEC,
+            concurrency=concurrency,
+        )
+        calls1, execs1 = await flight_stats(protocol)
+        executions = max(execs1 - execs0, 1)
+        results[concurrency] = (rps, (calls1 - calls0) / executions)
+    return results
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]🛬 Single-Flight Coalescing Benchmark[/bold blue]\n[italic]Identical limit=1 requests, response cache off[/italic]"
+        )
+    )
+    engine = BenchmarkEngine()
+
+    table = Table(
+        title=f"Throughput with and without coalescing ({DURATION_SEC}s per cell)"
+    )
+    table.add_column("Protocol", style="cyan")
+    table.add_column("Concurrency", justify="right")
+    table.add_column("RPS (off)", justify="right")
+    table.add_column("RPS (on)", justify="right")
+    table.add_column("Gain", justify="right")
+    table.add_column("Calls per DB query", justify="right")
+
+    try:
+        for protocol in PROTOCOLS:
+            runs = {}
+            for enabled in (False, True):
+                env = {**BASE_ENV, "ARENA_SINGLE_FLIGHT": "1" if enabled else "0"}
+                with console.status(
+                    f"[bold green]{protocol} (single-flight {'on' if enabled else 'off'})..."
+                ):
+                    if not ServerManager.restart(protocol, env):
+                        rprint(f"❌ {protocol} did not come up")
+                        break
+                    runs[enabled] = asyncio.run(run_protocol(engine, protocol, enabled))
+            if len(runs) < 2:
+                continue
+            for concurrency in CONCURRENCY:
+                off_rps, _ = runs[False][concurrency]
+                on_rps, ratio = runs[True][concurrency]
+                table.add_row(
+                    protocol,
+                    str(concurrency),
+                    f"{off_rps:.0f}",
+                    f"{on_rps:.0f}",
+                    f"{on_rps / off_rps:.2f}x" if off_rps else "n/a",
+                    f"{ratio:.1f}",
+                )
+    finally:
+        ServerManager.stop_all()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
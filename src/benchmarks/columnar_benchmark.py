@@ -0,0 +1,149 @@
+import asyncio
+import statistics
+import time
+
+import httpx
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.benchmarks.advanced_benchmark import (
+    GraphQlBenchmark,
+    GrpcBenchmark,
+    RestBenchmark,
+    run_concurrent,
+)
+from src.core.database import get_db_stats
+from src.servers.manager import SERVER_MAP, ServerManager
+
+# --- CONFIG ---
+STORAGES = ["sqlite", "columnar"]
+BENCHMARKS = {"REST": RestBenchmark, "GraphQL": GraphQlBenchmark, "gRPC": GrpcBenchmark}
+CONCURRENT_CLIENTS = [10, 50]
+REQS_PER_CLIENT = 20
+LIMIT = 100
+# Cache and coalescing off so every request reaches the storage backend
+BASE_ENV = {"ARENA_CACHE_MB": "0", "ARENA_SINGLE_FLIGHT": "0"}
+SETTLE_SEC = 2  # let RSS settle after startup before sampling it
+
+console = Console()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+async def run_storage(protocol):
+    """RPS and latency percentiles at each client count against a running server"""
+    bench = BENCHMARKS[protocol](protocol, SERVER_MAP[protocol]["port"])
+    await bench.benchmark_latency(LIMIT)  # warm up
+    results = {}
+    for clients in CONCURRENT_CLIENTS:
+        duration, latencies = await run_concurrent(
+            bench, LIMIT, clients, REQS_PER_CLIENT
+        )
+        results[clients] = (
+            len(latencies) / duration,
+            statistics.median(latencies) * 1000,
+            percentile(latencies, 0.99) * 1000,
+        )
+    return results
+
+
+def startup(storage):
+    """Seconds until REST accepts requests, its settled RSS, and the store's stats"""
+    ServerManager.stop("REST")
+    start = time.perf_counter()
+    if not ServerManager.restart("REST", {**BASE_ENV, "ARENA_STORAGE": storage}):
+        return None
+    # The port opens only once the lifespan (and so the load) has finished
+    ready = time.perf_counter() - start
+    time.sleep(SETTLE_SEC)
+    rss = ServerManager.get_stats("REST")["memory_mb"]
+    url = f"http://localhost:{SERVER_MAP['REST']['port']}/health"
+    return ready, rss, httpx.get(url).json()["storage"]
+
+
+def main():
+    rows = asyncio.run(get_db_stats())
+    rprint(
+        Panel.fit(
+            "[bold blue]🧮 Columnar Storage Benchmark[/bold blue]\n"
+            f"[italic]SQLite per request vs in-memory NumPy columns on {rows:,} rows[/italic]"
+        )
+    )
+
+    load = Table(title="REST server startup")
+    load.add_column("Storage", style="cyan")
+    load.add_column("Ready after (s)", justify="right")
+    load.add_column("Load (ms)", justify="right")
+    load.add_column("Server RSS (MB)", justify="right")
+    load.add_column("Columns MB / 1M rows", justify="right")
+    load.add_column("RSS +MB / 1M rows", justify="right")
+
+    table = Table(title=f"limit={LIMIT}, {REQS_PER_CLIENT} requests per client")
+    table.add_column("Protocol", style="cyan")
+    table.add_column("Clients", justify="right")
+    for storage in STORAGES:
+        table.add_column(f"RPS ({storage})", justify="right")
+        table.add_column(f"p50/p99 ms ({storage})", justify="right")
+    table.add_column("Gain", justify="right", style="green")
+
+    try:
+        starts = {storage: startup(storage) for storage in STORAGES}
+        base_rss = starts["sqlite"][1] if starts["sqlite"] else None
+        for storage, res in starts.items():
+            if res is None:
+                load.add_row(storage, "did not start", "-", "-", "-", "-")
+                continue
+            ready, rss, stats = res
+            per_million = 1_000_000 / max(rows, 1)
+            columns_mb = (
+                f"{stats['memory_mb'] * per_million:.0f}"
+                if "memory_mb" in stats
+                else "-"
+            )
+            growth = (
+                f"{(rss - base_rss) * per_million:.0f}"
+                if storage != "sqlite" and base_rss
+                else "-"
+            )
+            load.add_row(
+                storage,
+                f"{ready:.2f}",
+                f"{stats['load_ms']:.0f}" if "load_ms" in stats else "-",
+                f"{rss:.0f}",
+                columns_mb,
+                growth,
+            )
+
+        for protocol in BENCHMARKS:
+            runs = {}
+            for storage in STORAGES:
+                env = {**BASE_ENV, "ARENA_STORAGE": storage}
+                with console.status(f"[bold green]{protocol} ({storage})..."):
+                    if not ServerManager.restart(protocol, env):
+                        rprint(f"❌ {protocol} did not come up")
+                        break
+                    runs[storage] = asyncio.run(run_storage(protocol))
+            if len(runs) < len(STORAGES):
+                continue
+            for clients in CONCURRENT_CLIENTS:
+                cells = []
+                for storage in STORAGES:
+                    rps, p50, p99 = runs[storage][clients]
+                    cells += [f"{rps:.0f}", f"{p50:.1f} / {p99:.1f}"]
+                base, columnar = (runs[s][clients][0] for s in STORAGES)
+                gain = f"{columnar / base:.2f}x" if base else "n/a"
+                table.add_row(protocol, str(clients), *cells, gain)
+    finally:
+        ServerManager.stop_all()
+
+    console.print(load)
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
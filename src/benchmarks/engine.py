@@ -6,10 +6,20 @@ import httpx
 import pandas as pd
 import websockets
 
+from src.client.graphql_client import post_persisted
+from src.servers.manager import ServerManager
 from src.servers.protos import logs_pb2, logs_pb2_grpc
 
+# A cached response is served before the query is looked at, hash or text, so
+# persisted queries are measured against a GraphQL server without one
+APQ_SERVER_ENV = {"ARENA_CACHE_MB": "0"}
+
 
 class BenchmarkEngine:
+    def __init__(self, graphql_apq=False):
+        # Send GraphQL queries as persisted-query hashes instead of text
+        self.graphql_apq = graphql_apq
+
     async def run_latency_test(self, protocol, port, n=50):
         """Category 1: Latency (Sequential Requests)"""
         results = []
@@ -23,17 +33,28 @@ class BenchmarkEngine:
 
         return pd.DataFrame(results, columns=["Latency (ms)"])
 
-    async def run_throughput_test(self, protocol, port, duration_sec=3):
+    async def run_throughput_test(self, protocol, port, duration_sec=3, concurrency=20):
         """Category 2: Throughput (RPS)"""
+        if protocol != "GraphQL" or not self.graphql_apq:
+            return await self._throughput(protocol, port, duration_sec, concurrency)
+        await asyncio.to_thread(ServerManager.restart, "GraphQL", APQ_SERVER_ENV)
+        try:
+            return await self._throughput(protocol, port, duration_sec, concurrency)
+        finally:
+            await asyncio.to_thread(ServerManager.restart, "GraphQL")
+
+    async def _throughput(self, protocol, port, duration_sec, concurrency):
         start_time = time.time()
         count = 0
 
         # REST and GraphQL use HTTP
         if protocol in ["REST", "GraphQL"]:
-            async with httpx.AsyncClient() as client:
+            limits = httpx.Limits(max_connections=concurrency)
+            async with httpx.AsyncClient(limits=limits) as client:
                 while time.time() - start_time < duration_sec:
                     tasks = [
-                        self._make_request(protocol, port, client) for _ in range(20)
+                        self._make_request(protocol, port, client)
+                        for _ in range(concurrency)
                     ]
                     results = await asyncio.gather(*tasks)
                     count += sum(1 for r in results if r)
@@ -44,11 +65,11 @@ class BenchmarkEngine:
                 while time.time() - start_time < duration_sec:
                     tasks = [
                         stub.GetLogs(logs_pb2.GetLogsRequest(limit=1))
-                        for _ in range(20)
+                        for _ in range(concurrency)
                     ]
                     try:
                         await asyncio.gather(*tasks)
-                        count += 20
+                        count += concurrency
                     except:
                         pass
 
@@ -70,9 +91,11 @@ class BenchmarkEngine:
             elif protocol == "GraphQL":
                 c = client or httpx.AsyncClient()
                 q = "{ logs(limit: 1) { id } }"
-                resp = await c.post(
-                    f"http://localhost:{port}/graphql", json={"query": q}, timeout=2
-                )
+                url = f"http://localhost:{port}/graphql"
+                if self.graphql_apq:
+                    resp = await post_persisted(c, url, q, timeout=2)
+                else:
+                    resp = await c.post(url, json={"query": q}, timeout=2)
                 if not client:
                     await c.aclose()
                 return resp.status_code == 200
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import httpx
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.servers.manager import ServerManager
+
+# --- CONFIG ---
+SUBSCRIBER_COUNTS = [1, 10, 100, 500, 1000, 2000]
+DURATION_SEC = 5
+PORT = 8002
+
+console = Console()
+
+
+async def hub_stats(client):
+    resp = await client.get(f"http://localhost:{PORT}/health", timeout=5)
+    return resp.json().get("hub", {})
+
+
+async def subscriber(client, counts, idx, ready, stop):
+    async with client.stream("GET", f"http://localhost:{PORT}/stream") as response:
+        ready.set()
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                counts[idx] += 1
+            if stop.is_set():
+                break
+
+
+async def run_fanout(n):
+    """Connects n SSE subscribers and measures delivery and server cost"""
+    limits = httpx.Limits(max_connections=n + 1, max_keepalive_connections=n + 1)
+    async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+        counts = [0] * n
+        stop = asyncio.Event()
+        readies = [asyncio.Event() for _ in range(n)]
+        tasks = [
+            asyncio.create_task(subscriber(client, counts, i, readies[i], stop))
+            for i in range(n)
+        ]
+        await asyncio.gather(*(r.wait() for r in readies))
+
+        before = await hub_stats(client)
+        start_counts = sum(counts)
+        start = time.perf_counter()
+        await asyncio.sleep(DURATION_SEC)
+        elapsed = time.perf_counter() - start
+        delivered = sum(counts) - start_counts
+        after = await hub_stats(client)
+        server = ServerManager.get_stats("SSE") or {}
+
+        stop.set()
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {
+        "msgs_per_sec": delivered / elapsed,
+        "per_client": delivered / elapsed / n,
+        "db_queries_per_sec": (after.get("published", 0) - before.get("published", 0))
+        / elapsed,
+        "dropped": after.get("dropped", 0) - before.get("dropped", 0),
+        "memory_mb": server.get("memory_mb"),
+    }
+
+
+async def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]📡 SSE Fan-out Benchmark[/bold blue]\n[italic]One shared producer, N subscribers[/italic]"
+        )
+    )
+
+    table = Table(title=f"Fan-out Scaling ({DURATION_SEC}s per step)")
+    table.add_column("Subscribers", justify="right", style="cyan")
+    table.add_column("Delivered (msg/s)", justify="right")
+    table.add_column("Per Client (msg/s)", justify="right")
+    table.add_column("DB Queries (q/s)", justify="right")
+    table.add_column("Dropped", justify="right")
+    table.add_column("Server RSS (MB)", justify="right")
+
+    for n in SUBSCRIBER_COUNTS:
+        with console.status(f"[bold green]Running {n} subscribers..."):
+            res = await run_fanout(n)
+        mem = res["memory_mb"]
+        table.add_row(
+            str(n),
+            f"{res['msgs_per_sec']:.1f}",
+            f"{res['per_client']:.2f}",
+            f"{res['db_queries_per_sec']:.1f}",
+            str(res["dropped"]),
+            f"{mem:.1f}" if mem is not None else "n/a",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+import os
+import sqlite3
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+from sqlalchemy import select
+
+from src.core.database import DBLog
+from src.core.filters import apply_filter, literal_sql, make_filter, query_plan
+from src.core.pagination import encode_cursor, paginate
+from src.scripts.datasets import DATASETS, build
+
+# --- CONFIG ---
+SIZES = ["small-100k", "wide-payload-1M", "zipf-users-10M"]  # built on first use
+LIMIT = 100
+REPEATS = 5  # timed runs per page, after one warm-up
+WORKERS = os.cpu_count() or 1
+# Every token of the generated pages' "/p/N" is in every row, so this search
+# matches the whole table: FTS finds it fast, but every match is then sorted
+COMMON_TERM = "p"
+
+console = Console()
+
+
+def ms(value):
+    return f"{value:.3f}" if value < 10 else f"{value:,.1f}"
+
+
+def timed(conn, sql):
+    """Median ms of sql over REPEATS runs, and its rows"""
+    rows = conn.execute(sql).fetchall()
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        conn.execute(sql).fetchall()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), rows
+
+
+def filters_for(conn):
+    """name -> make_filter arguments, with values drawn from the dataset"""
+    busiest = "SELECT user_id FROM rollup_users ORDER BY count DESC LIMIT 1"
+    latest = conn.execute("SELECT max(timestamp) FROM logs").fetchone()[0]
+    # The newest row's session has ROWS_PER_SESSION rows spread over the table
+    newest = conn.execute(
+        "SELECT metadata_json FROM logs ORDER BY timestamp DESC, id DESC LIMIT 1"
+    ).fetchone()[0]
+    session = newest.split('"')[3]
+    return {
+        "Busiest user": {"user_id": conn.execute(busiest).fetchone()[0]},
+        "Action": {"action": "BUY"},
+        "Last hour": {
+            "since": datetime.fromisoformat(latest) - timedelta(hours=1),
+        },
+        "Action, older day": {
+            "action": "ERROR",
+            "until": datetime.fromisoformat(latest) - timedelta(days=7),
+        },
+        "Metadata session": {"metadata": {"session": session}},
+        "Metadata page": {"metadata": {"page": "/p/7"}},
+        "Search (rare term)": {"search": session},
+        "Search (common term)": {"search": COMMON_TERM},
+    }
+
+
+def index_of(plan):
+    """The index or virtual table the plan reads logs through"""
+    for step in plan:
+        for marker in ("USING COVERING INDEX ", "USING INDEX "):
+            if marker in step:
+                return step.split(marker)[1].split(" ")[0]
+    if any("VIRTUAL TABLE" in step for step in plan):
+        return "logs_fts"
+    return "none"
+
+
+def measure(name):
+    """(filter, index, sorts, first page ms, next page ms, rows) on one dataset"""
+    path = build(name, WORKERS)
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        results = []
+        for label, args in filters_for(conn).items():
+            stmt = apply_filter(select(DBLog), make_filter(**args))
+            first = paginate(stmt, LIMIT)
+            first_ms, rows = timed(conn, literal_sql(first))
+            next_ms = None
+            if len(rows) == LIMIT:
+                last = rows[-1]
+                cursor = encode_cursor(last[3], last[0])
+                next_ms, _ = timed(conn, literal_sql(paginate(stmt, LIMIT, cursor)))
+            plan = query_plan(conn, first)
+            sorts = any("TEMP B-TREE" in step for step in plan)
+            results.append((label, index_of(plan), sorts, first_ms, next_ms, len(rows)))
+        return results
+    finally:
+        conn.close()
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]🔎 Filter Benchmark[/bold blue]\n"
+            f"[italic]One {LIMIT}-row filtered page straight from SQLite, "
+            f"median of {REPEATS} warm runs[/italic]"
+        )
+    )
+
+    table = Table(title="Filtered page latency (ms)")
+    table.add_column("Dataset", style="cyan")
+    table.add_column("Filter")
+    table.add_column("Index")
+    table.add_column("Sort", justify="center")
+    table.add_column("First page", justify="right")
+    table.add_column("Next page", justify="right")
+    table.add_column("Rows", justify="right")
+
+    for name in SIZES:
+        with console.status(f"[bold green]{name}..."):
+            results = measure(name)
+        label = f"{name} ({DATASETS[name]['rows']:,} rows)"
+        for filt, index, sorts, first_ms, next_ms, rows in results:
+            table.add_row(
+                label,
+                filt,
+                index,
+                "⚠️" if sorts else "-",
+                ms(first_ms),
+                ms(next_ms) if next_ms is not None else "-",
+                str(rows),
+            )
+            label = ""
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.client.graphql_client import persisted_query
+from src.core.cache import response_cache
+from src.servers.gql import DOCUMENT_CACHE_SIZE, app, documents
+
+# --- CONFIG ---
+ITERATIONS = 500
+LIMIT = 1
+QUERIES = {
+    "Small": "query { logs(limit: %d) { id } }" % LIMIT,
+    "Full selection": "query Logs { logs(limit: %d) { id userId action timestamp ipAddress metadataJson } }"
+    % LIMIT,
+}
+
+console = Console()
+
+
+def cpu_per_request(client, payload):
+    client.post("/graphql", json=payload).raise_for_status()  # warm up / register
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        resp = client.post("/graphql", json=payload)
+        resp.raise_for_status()
+    return (time.process_time() - start) / ITERATIONS * 1000
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]🔖 GraphQL Persisted Query Benchmark[/bold blue]\n"
+            f"[italic]In-process, limit={LIMIT}, response cache off[/italic]"
+        )
+    )
+
+    table = Table(title=f"/graphql cost ({ITERATIONS} requests per cell)")
+    table.add_column("Query", style="cyan")
+    table.add_column("Mode")
+    table.add_column("Body (B)", justify="right")
+    table.add_column("CPU (ms/req)", justify="right")
+    table.add_column("Saved", justify="right")
+
+    # A cached response is returned before the document is even looked at, so
+    # every mode would time the same cache hit. With it off each request runs
+    # JSON decode, parse, validate, execute and encode; only parse + validate
+    # differ between the modes
+    response_cache.max_bytes = 0
+    with TestClient(app) as client:
+        for name, query in QUERIES.items():
+            modes = {
+                "Text, parse + validate": (0, {"query": query}),
+                "Text, cached document": (
+                    DOCUMENT_CACHE_SIZE,
+                    {"query": query},
+                ),
+                "APQ hash only": (
+                    DOCUMENT_CACHE_SIZE,
+                    {"extensions": persisted_query(query)},
+                ),
+            }
+            baseline = None
+            for mode, (size, payload) in modes.items():
+                documents.max_entries = size
+                documents._entries.clear()
+                if "extensions" in payload:
+                    # Register the hash the way a client's first miss would
+                    client.post("/graphql", json={**payload, "query": query})
+                with console.status(f"[bold green]{name}: {mode}..."):
+                    cpu = cpu_per_request(client, payload)
+                baseline = baseline or cpu
+                table.add_row(
+                    name,
+                    mode,
+                    str(len(json.dumps(payload))),
+                    f"{cpu:.3f}",
+                    f"{baseline - cpu:.3f} ({1 - cpu / baseline:.0%})",
+                )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
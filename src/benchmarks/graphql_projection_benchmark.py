@@ -0,0 +1,109 @@
+import asyncio
+import statistics
+import time
+
+import httpx
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+from sqlalchemy import desc, select
+
+from src.core.cache import response_cache
+from src.core.database import AsyncSessionLocal, DBLog
+from src.servers.gql import LOG_COLUMNS, fetch_selected_rows
+from src.servers.manager import ServerManager
+
+# --- CONFIG ---
+ITERATIONS = 50
+LIMIT = 1000
+PORT = 8001
+# The server would otherwise answer every repeat from its response cache
+SERVER_ENV = {"ARENA_CACHE_MB": "0"}
+
+QUERIES = {
+    "Full": "{ logs(limit: %d) { id userId action timestamp ipAddress metadataJson } }",
+    "Sparse": "{ logs(limit: %d) { id action } }",
+}
+
+console = Console()
+
+
+async def orm_full_fetch():
+    """The old resolver: hydrate every column as ORM objects regardless of selection"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(DBLog).order_by(desc(DBLog.timestamp)).limit(LIMIT)
+        )
+        return result.scalars().all()
+
+
+async def time_fetch(fn):
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.mean(samples) * 1000
+
+
+async def time_http(query):
+    samples = []
+    size = 0
+    async with httpx.AsyncClient() as client:
+        for _ in range(ITERATIONS):
+            start = time.perf_counter()
+            resp = await client.post(
+                f"http://localhost:{PORT}/graphql", json={"query": query % LIMIT}
+            )
+            resp.raise_for_status()
+            samples.append(time.perf_counter() - start)
+            size = len(resp.content)
+    return statistics.mean(samples) * 1000, size
+
+
+async def main():
+    rprint(
+        Panel.fit(
+            f"[bold blue]🎯 GraphQL Projection Pushdown[/bold blue]\n[italic]limit={LIMIT}, {ITERATIONS} iterations[/italic]"
+        )
+    )
+
+    # Time the queries themselves, not in-process cache hits
+    response_cache.max_bytes = 0
+
+    db_table = Table(title="Data Access (in-process, ms)")
+    db_table.add_column("Strategy", style="cyan")
+    db_table.add_column("Avg Fetch (ms)", justify="right")
+    with console.status("[bold green]Timing data access..."):
+        db_table.add_row("ORM select(DBLog)", f"{await time_fetch(orm_full_fetch):.2f}")
+        db_table.add_row(
+            "Core rows, all columns",
+            f"{await time_fetch(lambda: fetch_selected_rows(set(LOG_COLUMNS), LIMIT, None)):.2f}",
+        )
+        db_table.add_row(
+            "Core rows, { id action }",
+            f"{await time_fetch(lambda: fetch_selected_rows({'id', 'action'}, LIMIT, None)):.2f}",
+        )
+    console.print(db_table)
+
+    http_table = Table(title="End-to-end /graphql")
+    http_table.add_column("Selection", style="cyan")
+    http_table.add_column("Avg Latency (ms)", justify="right")
+    http_table.add_column("Body (KB)", justify="right")
+    if not ServerManager.restart("GraphQL", SERVER_ENV):
+        rprint("[red]GraphQL server did not come back up[/red]")
+        return
+    try:
+        with console.status("[bold green]Timing /graphql..."):
+            for name, query in QUERIES.items():
+                ms, size = await time_http(query)
+                http_table.add_row(name, f"{ms:.2f}", f"{size / 1024:.1f}")
+    finally:
+        # Back to the default settings
+        ServerManager.restart("GraphQL")
+    console.print(http_table)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+import asyncio
+import multiprocessing
+import os
+import time
+
+import grpc
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.servers.manager import SERVER_MAP, ServerManager
+from src.servers.protos import logs_pb2, logs_pb2_grpc
+
+# --- CONFIG ---
+CPUS = os.cpu_count() or 1
+WORKER_COUNTS = sorted({1, 2, 4, CPUS})
+CLIENT_PROCS = CPUS  # load generators, so the client is not the bottleneck
+CHANNELS_PER_PROC = 4  # SO_REUSEPORT balances connections, not requests
+IN_FLIGHT_PER_CHANNEL = 16
+DURATION_SEC = 5
+LIMIT = 100
+# Every request does its own query and encode
+BASE_ENV = {"ARENA_CACHE_MB": "0", "ARENA_SINGLE_FLIGHT": "0"}
+# Without a local subchannel pool, channels to one target share a single connection
+CHANNEL_OPTIONS = [("grpc.use_local_subchannel_pool", 1)]
+
+console = Console()
+
+
+async def drive_channel(start, deadline):
+    port = SERVER_MAP["gRPC"]["port"]
+    async with grpc.aio.insecure_channel(
+        f"localhost:{port}", options=CHANNEL_OPTIONS
+    ) as ch:
+        stub = logs_pb2_grpc.ActivityServiceStub(ch)
+
+        async def loop():
+            await asyncio.sleep(max(0, start - time.time()))
+            done = 0
+            while time.time() < deadline:
+                try:
+                    await stub.GetLogs(logs_pb2.GetLogsRequest(limit=LIMIT))
+                    done += 1
+                except grpc.aio.AioRpcError:
+                    pass
+            return done
+
+        counts = await asyncio.gather(*[loop() for _ in range(IN_FLIGHT_PER_CHANNEL)])
+        return sum(counts)
+
+
+def client_process(window):
+    """One load-generator process: several independent connections, many calls each"""
+
+    async def run():
+        counts = await asyncio.gather(
+            *[drive_channel(*window) for _ in range(CHANNELS_PER_PROC)]
+        )
+        return sum(counts)
+
+    return asyncio.run(run())
+
+
+def measure():
+    ctx = multiprocessing.get_context("spawn")
+    # Spawning takes a moment; every process starts calling at the same instant
+    start = time.time() + 3
+    window = (start, start + DURATION_SEC)
+    with ctx.Pool(CLIENT_PROCS) as pool:
+        counts = pool.map(client_process, [window] * CLIENT_PROCS)
+    return sum(counts) / DURATION_SEC
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]🧵 gRPC Worker Scaling Benchmark[/bold blue]\n"
+            f"[italic]N server processes on one port (SO_REUSEPORT), {CPUS} cores[/italic]"
+        )
+    )
+
+    table = Table(
+        title=f"GetLogs(limit={LIMIT}), {CLIENT_PROCS * CHANNELS_PER_PROC} connections, {DURATION_SEC}s per row"
+    )
+    table.add_column("Workers", style="cyan", justify="right")
+    table.add_column("RPS", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Efficiency", justify="right")
+
+    base = None
+    try:
+        for workers in WORKER_COUNTS:
+            env = {**BASE_ENV, "ARENA_WORKERS": str(workers)}
+            with console.status(f"[bold green]{workers} worker(s)..."):
+                if not ServerManager.restart("gRPC", env):
+                    rprint("❌ gRPC did not come up")
+                    break
+                time.sleep(1)  # all workers bound, not just the first
+                rps = measure()
+            base = base or rps
+            speedup = rps / base if base else 0
+            table.add_row(
+                str(workers),
+                f"{rps:.0f}",
+                f"{speedup:.2f}x",
+                f"{speedup / workers:.0%}",
+            )
+    finally:
+        ServerManager.stop_all()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
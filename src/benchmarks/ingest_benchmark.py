@@ -0,0 +1,214 @@
+import asyncio
+import json
+import multiprocessing
+import sqlite3
+import statistics
+import time
+
+import grpc
+import httpx
+import websockets
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.core.database import DB_PATH
+from src.servers.manager import SERVER_MAP, ServerManager
+from src.servers.protos import logs_pb2, logs_pb2_grpc
+
+# --- CONFIG ---
+PROTOCOLS = ["REST", "gRPC", "WebSocket"]
+PROFILES = ["default", "tuned"]  # ARENA_DB_PROFILE; "tuned" is WAL
+READER_COUNTS = [0, 8]
+DURATION_SEC = 5
+WRITERS = 16  # concurrent client connections, each waiting for its own commit
+ROWS_PER_REQUEST = 50
+READ_LIMIT = 1000  # rows per uncached /logs/stream read
+CLEAN_UP = True  # delete the benchmark's rows afterwards, so other benchmarks see the same data
+
+ROW = {
+    "user_id": 1,
+    "action": "LOGIN",
+    "ip_address": "10.0.0.1",
+    "metadata_json": json.dumps({"payload": "x" * 85}),
+}
+NDJSON = ("\n".join(json.dumps(ROW) for _ in range(ROWS_PER_REQUEST)) + "\n").encode()
+REST_URL = f"http://localhost:{SERVER_MAP['REST']['port']}"
+WS_URL = f"ws://localhost:{SERVER_MAP['WebSocket']['port']}/ingest"
+GRPC_TARGET = f"localhost:{SERVER_MAP['gRPC']['port']}"
+
+console = Console()
+
+
+async def rest_writer(deadline, latencies):
+    async with httpx.AsyncClient(base_url=REST_URL, timeout=30) as client:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            resp = await client.post("/logs", content=NDJSON)
+            resp.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def grpc_writer(deadline, latencies):
+    entry = logs_pb2.LogEntry(**ROW)
+    async with grpc.aio.insecure_channel(GRPC_TARGET) as channel:
+        stub = logs_pb2_grpc.ActivityServiceStub(channel)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await stub.IngestLogs(iter([entry] * ROWS_PER_REQUEST))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def ws_writer(deadline, latencies):
+    async with websockets.connect(WS_URL) as ws:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await ws.send(NDJSON)
+            ack = json.loads(await ws.recv())
+            if "error" in ack:
+                raise RuntimeError(ack["error"])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+
+WRITER_CLIENTS = {"REST": rest_writer, "gRPC": grpc_writer, "WebSocket": ws_writer}
+
+
+def reader_process(job):
+    """n readers pulling uncached pages off REST until the deadline; returns reads done"""
+    n, deadline = job
+
+    async def read(client):
+        reads = 0
+        while time.time() < deadline:
+            resp = await client.get("/logs/stream", params={"limit": READ_LIMIT})
+            resp.raise_for_status()
+            reads += 1
+        return reads
+
+    async def run():
+        async with httpx.AsyncClient(base_url=REST_URL, timeout=30) as client:
+            return sum(await asyncio.gather(*(read(client) for _ in range(n))))
+
+    return asyncio.run(run())
+
+
+async def server_stats(protocol):
+    """Server-side commit latency (ms) and rows per commit, from the health endpoints"""
+    if protocol == "gRPC":
+        async with grpc.aio.insecure_channel(GRPC_TARGET) as channel:
+            stub = logs_pb2_grpc.ActivityServiceStub(channel)
+            counters = (await stub.CheckHealth(logs_pb2.HealthRequest())).counters
+        return {
+            "commit_p50_ms": counters["ingest_commit_p50_us"] / 1000,
+            "commit_p99_ms": counters["ingest_commit_p99_us"] / 1000,
+            "avg_batch": counters["ingest_rows"] / max(counters["ingest_batches"], 1),
+        }
+    port = SERVER_MAP[protocol]["port"]
+    async with httpx.AsyncClient() as client:
+        return (await client.get(f"http://localhost:{port}/health")).json()["ingest"]
+
+
+async def write_for(protocol, seconds):
+    deadline = time.perf_counter() + seconds
+    latencies = []
+    writer = WRITER_CLIENTS[protocol]
+    await asyncio.gather(*(writer(deadline, latencies) for _ in range(WRITERS)))
+    return latencies
+
+
+def measure(protocol, readers):
+    """Inserts/s with client and server latency percentiles, with readers alongside"""
+    asyncio.run(write_for(protocol, 0.5))  # warm up connections and the writer task
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        pending = None
+        if readers:
+            # Readers run in their own process, so they do not slow the writers' client
+            pending = pool.map_async(
+                reader_process, [(readers, time.time() + DURATION_SEC)]
+            )
+        latencies = sorted(asyncio.run(write_for(protocol, DURATION_SEC)))
+        reads = sum(pending.get()) if pending else 0
+    server = asyncio.run(server_stats(protocol))
+    return {
+        "inserts_per_sec": len(latencies) * ROWS_PER_REQUEST / DURATION_SEC,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "commit_p50": server["commit_p50_ms"],
+        "commit_p99": server["commit_p99_ms"],
+        "avg_batch": server["avg_batch"],
+        "reads_per_sec": reads / DURATION_SEC,
+    }
+
+
+def max_id():
+    with sqlite3.connect(DB_PATH) as conn:
+        return conn.execute("SELECT max(id) FROM logs").fetchone()[0] or 0
+
+
+def delete_after(last_id):
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    try:
+        with conn:
+            conn.execute("DELETE FROM logs WHERE id > ?", (last_id,))
+        conn.execute("VACUUM")  # hand the freed pages back, or the file keeps the size
+    finally:
+        conn.close()
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]📥 Ingestion Benchmark[/bold blue]\n"
+            f"[italic]{WRITERS} writers x {ROWS_PER_REQUEST} rows per request, "
+            "group-committed; readers pull uncached REST pages alongside[/italic]"
+        )
+    )
+
+    table = Table(title=f"Sustained inserts over {DURATION_SEC}s per row")
+    table.add_column("Protocol", style="cyan")
+    table.add_column("DB profile")
+    table.add_column("Readers", justify="right")
+    table.add_column("Inserts/s", justify="right")
+    table.add_column("Request p50 / p99 (ms)", justify="right")
+    table.add_column("Commit p50 / p99 (ms)", justify="right")
+    table.add_column("Rows/commit", justify="right")
+    table.add_column("Reads/s", justify="right")
+
+    first_new = max_id()
+    try:
+        for protocol in PROTOCOLS:
+            for profile in PROFILES:
+                env = {"ARENA_DB_PROFILE": profile}
+                for readers in READER_COUNTS:
+                    with console.status(
+                        f"[bold green]{protocol} ({profile}), {readers} readers..."
+                    ):
+                        # Fresh servers per row, so commit percentiles are this run's.
+                        # REST always runs: it serves the readers
+                        for name in {protocol, "REST"}:
+                            if not ServerManager.restart(name, env):
+                                rprint(f"❌ {name} did not come up")
+                                return
+                        res = measure(protocol, readers)
+                    table.add_row(
+                        protocol,
+                        profile,
+                        str(readers),
+                        f"{res['inserts_per_sec']:,.0f}",
+                        f"{res['p50']:.1f} / {res['p99']:.1f}",
+                        f"{res['commit_p50']:.1f} / {res['commit_p99']:.1f}",
+                        f"{res['avg_batch']:.0f}",
+                        f"{res['reads_per_sec']:.1f}" if readers else "-",
+                    )
+    finally:
+        ServerManager.stop_all()
+        if CLEAN_UP:
+            delete_after(first_new)
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import asyncio
+import statistics
+import time
+
+import grpc
+import httpx
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.servers.manager import SERVER_MAP, ServerManager
+from src.servers.protos import logs_pb2, logs_pb2_grpc
+
+# --- CONFIG ---
+PAGE_SIZE = 100
+PAGES = 1000
+CHECKPOINTS = [1, 10, 100, 500, 1000]
+WINDOW = 5  # Pages averaged around each checkpoint
+# Cache off: page 1 is a cursor-less "latest N" request, the only kind it serves,
+# so it would be compared from memory against deeper pages from SQLite
+SERVER_ENV = {"ARENA_CACHE_MB": "0"}
+
+console = Console()
+
+
+async def walk_rest(port):
+    latencies = []
+    cursor = None
+    async with httpx.AsyncClient() as client:
+        # Untimed warm-up so page 1 does not pay for connection setup
+        await client.get(f"http://localhost:{port}/logs", params={"limit": PAGE_SIZE})
+        for _ in range(PAGES):
+            params = {"limit": PAGE_SIZE}
+            if cursor:
+                params["cursor"] = cursor
+            start = time.perf_counter()
+            resp = await client.get(f"http://localhost:{port}/logs", params=params)
+            resp.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+            cursor = resp.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+    return latencies
+
+
+async def walk_graphql(port):
+    query = """
+    query Page($limit: Int!, $cursor: String) {
+        logsPage(limit: $limit, cursor: $cursor) { nextCursor logs { id } }
+    }
+    """
+    latencies = []
+    cursor = None
+    async with httpx.AsyncClient() as client:
+        await client.post(
+            f"http://localhost:{port}/graphql",
+            json={"query": query, "variables": {"limit": PAGE_SIZE}},
+        )
+        for _ in range(PAGES):
+            body = {"query": query, "variables": {"limit": PAGE_SIZE, "cursor": cursor}}
+            start = time.perf_counter()
+            resp = await client.post(f"http://localhost:{port}/graphql", json=body)
+            resp.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+            cursor = resp.json()["data"]["logsPage"]["nextCursor"]
+            if not cursor:
+                break
+    return latencies
+
+
+async def walk_grpc(port):
+    latencies = []
+    cursor = ""
+    async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+        stub = logs_pb2_grpc.ActivityServiceStub(channel)
+        await stub.GetLogs(logs_pb2.GetLogsRequest(limit=PAGE_SIZE))
+        for _ in range(PAGES):
+            start = time.perf_counter()
+            resp = await stub.GetLogs(
+                logs_pb2.GetLogsRequest(limit=PAGE_SIZE, cursor=cursor)
+            )
+            latencies.append(time.perf_counter() - start)
+            cursor = resp.next_cursor
+            if not cursor:
+                break
+    return latencies
+
+
+def around(latencies, page):
+    window = latencies[max(page - WINDOW, 0) : page]
+    return statistics.mean(window) * 1000 if window else None
+
+
+async def main():
+    rprint(
+        Panel.fit(
+            f"[bold blue]📜 Keyset Pagination Benchmark[/bold blue]\n[italic]Walking {PAGES} pages of {PAGE_SIZE} rows[/italic]"
+        )
+    )
+
+    table = Table(title="Page Latency by Scan Depth (ms)")
+    table.add_column("Protocol", style="cyan")
+    for page in CHECKPOINTS:
+        table.add_column(f"Page {page}", justify="right")
+
+    walkers = {"REST": walk_rest, "GraphQL": walk_graphql, "gRPC": walk_grpc}
+    try:
+        for name, walk in walkers.items():
+            with console.status(f"[bold green]Walking {name}..."):
+                if not ServerManager.restart(name, SERVER_ENV):
+                    rprint(f"❌ {name} did not come up")
+                    continue
+                latencies = await walk(SERVER_MAP[name]["port"])
+            row = [name]
+            for page in CHECKPOINTS:
+                ms = around(latencies, page) if page <= len(latencies) else None
+                row.append(f"{ms:.2f}" if ms is not None else "n/a")
+            table.add_row(*row)
+    finally:
+        ServerManager.stop_all()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
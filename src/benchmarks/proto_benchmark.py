@@ -0,0 +1,98 @@
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.core.queries import fetch_log_rows
+from src.servers.grpc_impl import ALL_FIELDS, EPOCH, log_entry, mask_columns
+from src.servers.protos import logs_pb2
+
+# --- CONFIG ---
+LIMIT = 1000
+ITERATIONS = 20
+VARIANTS = {
+    "Before: all fields, string time": tuple(
+        f for f in ALL_FIELDS if f != "timestamp_us"
+    ),
+    "All fields, timestamp_us": tuple(f for f in ALL_FIELDS if f != "timestamp"),
+    "Mask: id, action, timestamp_us": ("id", "action", "timestamp_us"),
+    "Mask: id, user_id, action, timestamp_us": (
+        "id",
+        "user_id",
+        "action",
+        "timestamp_us",
+    ),
+}
+
+console = Console()
+
+
+def read_times(page):
+    """What a client does with the timestamps after decoding"""
+    if page.logs and page.logs[0].timestamp:
+        return [datetime.fromisoformat(log.timestamp) for log in page.logs]
+    return [EPOCH + timedelta(microseconds=log.timestamp_us) for log in page.logs]
+
+
+def timed(fn):
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, result
+
+
+async def fetch_ms(fields):
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        rows = await fetch_log_rows(mask_columns(fields), LIMIT)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, rows
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]📦 gRPC LogEntry Contract Benchmark[/bold blue]\n"
+            f"[italic]Field masks and typed timestamps, {LIMIT} rows per LogList[/italic]"
+        )
+    )
+
+    table = Table(title=f"Median of {ITERATIONS} runs (ms)")
+    table.add_column("Variant", style="cyan")
+    table.add_column("Wire (KB)", justify="right")
+    table.add_column("SQL fetch", justify="right")
+    table.add_column("Encode", justify="right")
+    table.add_column("Decode + times", justify="right")
+
+    baseline = None
+    for name, fields in VARIANTS.items():
+        with console.status(f"[bold green]{name}..."):
+            fetch, rows = asyncio.run(fetch_ms(fields))
+            encode, body = timed(
+                lambda: logs_pb2.LogList(
+                    logs=[log_entry(row, fields) for row in rows]
+                ).SerializeToString()
+            )
+            decode, _ = timed(lambda: read_times(logs_pb2.LogList.FromString(body)))
+        baseline = baseline or len(body)
+        table.add_row(
+            name,
+            f"{len(body) / 1024:.1f} ({len(body) / baseline:.0%})",
+            f"{fetch:.2f}",
+            f"{encode:.2f}",
+            f"{decode:.2f}",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
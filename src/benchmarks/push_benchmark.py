@@ -0,0 +1,174 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import time
+from contextlib import aclosing
+
+import httpx
+import websockets
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.client.graphql_client import log_events
+from src.servers.manager import SERVER_MAP, ServerManager
+
+# --- CONFIG ---
+PROTOCOLS = ["SSE", "WebSocket", "GraphQL"]
+SUBSCRIBER_COUNTS = [1, 100, 1000]
+CLIENT_PROCS = os.cpu_count() or 1  # so decoding on the client side is spread out
+DURATION_SEC = 5
+CONNECTS_PER_SEC = 200  # ramp allowance before the measuring window opens
+
+console = Console()
+
+
+async def sse_events(client):
+    url = f"http://localhost:{SERVER_MAP['SSE']['port']}/stream"
+    async with client.stream("GET", url) as response:
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                yield json.loads(line[6:])
+
+
+async def ws_events():
+    uri = f"ws://localhost:{SERVER_MAP['WebSocket']['port']}/ws"
+    async with websockets.connect(uri) as ws:
+        await ws.send(json.dumps({"action_filter": None}))
+        async for raw in ws:
+            yield json.loads(raw)
+
+
+async def graphql_events():
+    async for event in log_events(fields="id emittedAt"):
+        yield {"id": event["id"], "emitted_at": event["emittedAt"]}
+
+
+async def subscriber(protocol, client, window, latencies, connected):
+    """Records publish-to-receive latency (ms) for every event inside window"""
+    start, end = window
+    if protocol == "SSE":
+        events = sse_events(client)
+    elif protocol == "WebSocket":
+        events = ws_events()
+    else:
+        events = graphql_events()
+    async with aclosing(events) as stream:
+        async for event in stream:
+            now = time.time()
+            if not connected.done():
+                connected.set_result(True)
+            if now >= end:
+                return
+            if now >= start:
+                latencies.append((now - event["emitted_at"]) * 1000)
+
+
+def client_process(job):
+    """n subscribers in one process; returns their latencies and how many got events"""
+    protocol, n, window = job
+
+    async def run():
+        latencies = []
+        limits = httpx.Limits(max_connections=n + 1, max_keepalive_connections=n + 1)
+        async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+            loop = asyncio.get_running_loop()
+            connected = [loop.create_future() for _ in range(n)]
+            tasks = [
+                asyncio.create_task(
+                    subscriber(protocol, client, window, latencies, connected[i])
+                )
+                for i in range(n)
+            ]
+            # A subscriber that never gets an event must not hang the run
+            _, stuck = await asyncio.wait(tasks, timeout=window[1] - time.time() + 5)
+            for task in stuck:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return latencies, sum(1 for f in connected if f.done())
+
+    return asyncio.run(run())
+
+
+def measure(protocol, n):
+    """Latency percentiles, delivered rate and server RSS growth for n subscribers"""
+    ctx = multiprocessing.get_context("spawn")
+    procs = min(CLIENT_PROCS, n)
+    shares = [n // procs + (1 if i < n % procs else 0) for i in range(procs)]
+    # One short subscriber first, so lazy server state is not billed per connection
+    client_process((protocol, 1, (0, time.time() + 1)))
+    baseline = ServerManager.get_stats(protocol)["memory_mb"]
+    start = time.time() + 3 + n / CONNECTS_PER_SEC
+    window = (start, start + DURATION_SEC)
+
+    with ctx.Pool(procs) as pool:
+        pending = pool.map_async(
+            client_process, [(protocol, share, window) for share in shares]
+        )
+        # Sample RSS mid-window, while every subscriber is connected
+        time.sleep(max(0, start + DURATION_SEC / 2 - time.time()))
+        loaded = ServerManager.get_stats(protocol)["memory_mb"]
+        results = pending.get()
+
+    latencies = sorted(lat for lats, _ in results for lat in lats)
+    live = sum(count for _, count in results)
+    if not latencies:
+        return None
+    return {
+        "live": live,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "msgs_per_sec": len(latencies) / DURATION_SEC,
+        "kb_per_conn": (loaded - baseline) * 1024 / n,
+    }
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]📬 Push Delivery Benchmark[/bold blue]\n"
+            "[italic]SSE vs WebSocket vs GraphQL subscriptions (graphql-transport-ws)[/italic]"
+        )
+    )
+
+    table = Table(title=f"Publish-to-receive latency over {DURATION_SEC}s")
+    table.add_column("Protocol", style="cyan")
+    table.add_column("Subscribers", justify="right")
+    table.add_column("Receiving", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+    table.add_column("Delivered (msg/s)", justify="right")
+    table.add_column("Server KB/conn", justify="right")
+
+    try:
+        for protocol in PROTOCOLS:
+            for n in SUBSCRIBER_COUNTS:
+                with console.status(f"[bold green]{protocol} x {n}..."):
+                    # Fresh process per cell, so RSS growth belongs to this run
+                    if not ServerManager.restart(protocol):
+                        rprint(f"❌ {protocol} did not come up")
+                        break
+                    res = measure(protocol, n)
+                if res is None:
+                    table.add_row(protocol, str(n), "0", "-", "-", "-", "-")
+                    continue
+                table.add_row(
+                    protocol,
+                    str(n),
+                    str(res["live"]),
+                    f"{res['p50']:.1f}",
+                    f"{res['p99']:.1f}",
+                    f"{res['msgs_per_sec']:.0f}",
+                    f"{res['kb_per_conn']:.1f}",
+                )
+    finally:
+        ServerManager.stop_all()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
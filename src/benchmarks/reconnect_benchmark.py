@@ -0,0 +1,176 @@
+import asyncio
+import statistics
+import time
+
+import httpx
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.servers.manager import SERVER_MAP, ServerManager
+
+# --- CONFIG ---
+CLIENT_COUNTS = [100, 1000]
+DOWN_SEC = 1.0  # how long every client stays away; ~10 events at 100 ms ticks
+CATCH_UP_TIMEOUT = 10
+MODES = {"No replay": {"ARENA_SSE_REPLAY": "0"}, "Last-Event-ID replay": {}}
+URL = f"http://localhost:{SERVER_MAP['SSE']['port']}"
+
+console = Console()
+
+
+class Follower:
+    """One SSE client's view of the event ids across a drop and reconnect"""
+
+    def __init__(self):
+        self.last = None
+        self.last_event_id = None  # as sent, "<worker>-<seq>"
+        self.head = None  # newest id anywhere when the reconnect started
+        self.started = None
+        self.missed = 0
+        self.first_at = None
+        self.caught_at = None
+
+    def on_id(self, last_event_id: str):
+        now = time.perf_counter()
+        self.last_event_id = last_event_id
+        event_id = int(last_event_id.rpartition("-")[2])
+        if self.head is None or self.last is None:
+            self.last = event_id
+            return
+        if self.first_at is None:
+            self.first_at = now - self.started
+        if event_id > self.last + 1:
+            self.missed += event_id - self.last - 1
+        self.last = max(self.last, event_id)
+        if self.caught_at is None and self.last >= self.head:
+            self.caught_at = now - self.started
+
+
+async def follow(client, follower, connected):
+    headers = {}
+    if follower.last is not None:
+        headers["Last-Event-ID"] = follower.last_event_id
+    async with client.stream("GET", f"{URL}/stream", headers=headers) as response:
+        connected.set()
+        async for line in response.aiter_lines():
+            if line.startswith("id: "):
+                follower.on_id(line[4:])
+
+
+async def connect_all(client, followers):
+    readies = [asyncio.Event() for _ in followers]
+    tasks = [
+        asyncio.create_task(follow(client, f, ready))
+        for f, ready in zip(followers, readies)
+    ]
+    await asyncio.gather(*(r.wait() for r in readies))
+    return tasks
+
+
+async def drop_all(tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def health(client):
+    return (await client.get(f"{URL}/health")).json()
+
+
+async def storm(n):
+    """Drops n live clients at once, reconnects them together and times the catch-up"""
+    limits = httpx.Limits(max_connections=n + 2, max_keepalive_connections=n + 2)
+    async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+        # A sentinel that never drops knows the newest id at any moment
+        sentinel = Follower()
+        sentinel_task = (await connect_all(client, [sentinel]))[0]
+        followers = [Follower() for _ in range(n)]
+        tasks = await connect_all(client, followers)
+        while any(f.last is None for f in followers):
+            await asyncio.sleep(0.05)
+
+        await drop_all(tasks)
+        await asyncio.sleep(DOWN_SEC)
+
+        before = await health(client)
+        started = time.perf_counter()
+        for f in followers:
+            f.head, f.started = sentinel.last, started
+        tasks = await connect_all(client, followers)
+        deadline = started + CATCH_UP_TIMEOUT
+        while time.perf_counter() < deadline and any(
+            f.caught_at is None for f in followers
+        ):
+            await asyncio.sleep(0.01)
+        after = await health(client)
+
+        await drop_all(tasks + [sentinel_task])
+
+    caught = sorted(f.caught_at for f in followers if f.caught_at is not None)
+    firsts = [f.first_at for f in followers if f.first_at is not None]
+    return {
+        "missed": statistics.mean(f.missed for f in followers),
+        "first_p50": statistics.median(firsts) * 1000 if firsts else None,
+        "caught_p50": statistics.median(caught) * 1000 if caught else None,
+        "caught_p99": (
+            caught[min(len(caught) - 1, int(len(caught) * 0.99))] * 1000
+            if caught
+            else None
+        ),
+        "late": n - len(caught),
+        "db_queries": after["db_queries"] - before["db_queries"],
+        "replayed": after["hub"]["replayed"] - before["hub"]["replayed"],
+    }
+
+
+def ms(value):
+    return f"{value:.0f}" if value is not None else "n/a"
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]🌩️ SSE Reconnect Storm Benchmark[/bold blue]\n"
+            f"[italic]All clients drop for {DOWN_SEC}s, then reconnect at once[/italic]"
+        )
+    )
+
+    table = Table(title="Catch-up after a reconnect storm")
+    table.add_column("Mode", style="cyan")
+    table.add_column("Clients", justify="right")
+    table.add_column("Missed / client", justify="right")
+    table.add_column("First event p50 (ms)", justify="right")
+    table.add_column("Caught up p50 / p99 (ms)", justify="right")
+    table.add_column("DB queries", justify="right")
+    table.add_column("Replayed frames", justify="right")
+
+    try:
+        for name, env in MODES.items():
+            for n in CLIENT_COUNTS:
+                with console.status(f"[bold green]{name} with {n} clients..."):
+                    if not ServerManager.restart("SSE", env):
+                        rprint("❌ SSE did not come up")
+                        return
+                    res = asyncio.run(storm(n))
+                caught = f"{ms(res['caught_p50'])} / {ms(res['caught_p99'])}"
+                if res["late"]:
+                    caught += f" ({res['late']} late)"
+                table.add_row(
+                    name,
+                    str(n),
+                    f"{res['missed']:.1f}",
+                    ms(res["first_p50"]),
+                    caught,
+                    str(res["db_queries"]),
+                    f"{res['replayed']:,}",
+                )
+    finally:
+        ServerManager.stop_all()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
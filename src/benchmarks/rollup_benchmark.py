@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.core.queries import MINUTE_FORMAT
+from src.scripts.datasets import DATASETS, build
+
+# --- CONFIG ---
+SIZES = ["wide-payload-1M", "zipf-users-10M"]  # dataset profiles, built on first use
+REPEATS = 5  # timed runs per query, after one warm-up
+WINDOW_MINUTES = 60
+WORKERS = os.cpu_count() or 1
+
+# name -> (rollup query, the ad-hoc query over logs it replaces). ? is the
+# busiest user for user queries and the window's first minute for window queries
+QUERIES = {
+    "Total rows": (
+        "SELECT sum(count) FROM rollup_actions",
+        "SELECT count(*) FROM logs",
+    ),
+    "Rows per action": (
+        "SELECT action, count FROM rollup_actions",
+        "SELECT action, count(*) FROM logs GROUP BY action",
+    ),
+    "Busiest user's rows": (
+        "SELECT count FROM rollup_users WHERE user_id = ?",
+        "SELECT count(*) FROM logs WHERE user_id = ?",
+    ),
+    f"Last {WINDOW_MINUTES} min x action": (
+        "SELECT minute, action, count FROM rollup_minute_actions WHERE minute >= ?",
+        "SELECT substr(timestamp, 1, 16), action, count(*) FROM logs "
+        "WHERE timestamp >= ? GROUP BY 1, 2",
+    ),
+    # Not a key lookup: it groups every minute, but there are far fewer of those
+    "Busiest minute (all)": (
+        "SELECT minute, sum(count) FROM rollup_minute_actions "
+        "GROUP BY 1 ORDER BY 2 DESC, 1 LIMIT 1",
+        "SELECT substr(timestamp, 1, 16), count(*) FROM logs "
+        "GROUP BY 1 ORDER BY 2 DESC, 1 LIMIT 1",
+    ),
+}
+
+console = Console()
+
+
+def ms(value):
+    return f"{value:.3f}" if value < 10 else f"{value:,.1f}"
+
+
+def timed(conn, sql, params):
+    """Median ms of sql over REPEATS runs, and its result"""
+    result = conn.execute(sql, params).fetchall()
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def params_for(conn, name):
+    if "user" in name:
+        # The rollup answers this for any user; the index scan grows with the user
+        busiest = "SELECT user_id FROM rollup_users ORDER BY count DESC LIMIT 1"
+        return conn.execute(busiest).fetchone()
+    if "Last" in name:
+        latest = conn.execute("SELECT max(minute) FROM rollup_minute_actions")
+        first = datetime.strptime(latest.fetchone()[0], MINUTE_FORMAT) - timedelta(
+            minutes=WINDOW_MINUTES - 1
+        )
+        return (first.strftime(MINUTE_FORMAT),)
+    return ()
+
+
+def measure(name):
+    """(query, rollup ms, scan ms, results agree) for each query on one dataset"""
+    path = build(name, WORKERS)
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        results = []
+        for query, (rollup_sql, scan_sql) in QUERIES.items():
+            params = params_for(conn, query)
+            rollup_ms, rollup = timed(conn, rollup_sql, params)
+            scan_ms, scan = timed(conn, scan_sql, params)
+            results.append((query, rollup_ms, scan_ms, sorted(rollup) == sorted(scan)))
+        return results
+    finally:
+        conn.close()
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]📈 Rollup Benchmark[/bold blue]\n"
+            "[italic]Trigger-maintained rollup tables vs ad-hoc GROUP BY over logs, "
+            f"median of {REPEATS} warm runs[/italic]"
+        )
+    )
+
+    table = Table(title="Query latency (ms)")
+    table.add_column("Dataset", style="cyan")
+    table.add_column("Query")
+    table.add_column("Rollup", justify="right")
+    table.add_column("Scan", justify="right")
+    table.add_column("Speedup", justify="right", style="green")
+    table.add_column("Same answer", justify="center")
+
+    for name in SIZES:
+        with console.status(f"[bold green]{name}..."):
+            results = measure(name)
+        label = f"{name} ({DATASETS[name]['rows']:,} rows)"
+        for query, rollup_ms, scan_ms, same in results:
+            table.add_row(
+                label,
+                query,
+                ms(rollup_ms),
+                ms(scan_ms),
+                f"{scan_ms / rollup_ms:,.0f}x" if rollup_ms else "n/a",
+                "✅" if same else "❌",
+            )
+            label = ""
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import asyncio
+import multiprocessing
+import os
+import time
+
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.benchmarks.engine import BenchmarkEngine
+from src.servers.manager import SERVER_MAP, ServerManager
+
+# --- CONFIG ---
+PROTOCOLS = ["REST", "GraphQL", "gRPC"]
+CPUS = os.cpu_count() or 1
+WORKER_COUNTS = sorted({1, 2, 4, CPUS})
+CLIENT_PROCS = CPUS  # load generators, so the client is not the bottleneck
+CONCURRENCY_PER_PROC = 20
+DURATION_SEC = 5
+# Every request reaches the database; a per-worker cache would flatter the curve
+BASE_ENV = {"ARENA_CACHE_MB": "0", "ARENA_SINGLE_FLIGHT": "0"}
+
+console = Console()
+
+
+def client_process(job):
+    """One load-generator process driving the engine's throughput loop"""
+    protocol, start, duration = job
+    time.sleep(max(0, start - time.time()))
+    engine = BenchmarkEngine()
+    return asyncio.run(
+        engine.run_throughput_test(
+            protocol,
+            SERVER_MAP[protocol]["port"],
+            duration_sec=duration,
+            concurrency=CONCURRENCY_PER_PROC,
+        )
+    )
+
+
+def measure(protocol, duration=DURATION_SEC, clients=CLIENT_PROCS):
+    """Aggregate RPS of all client processes, started together"""
+    ctx = multiprocessing.get_context("spawn")
+    # Spawning takes a moment; every process starts calling at the same instant
+    start = time.time() + 3
+    with ctx.Pool(clients) as pool:
+        return sum(pool.map(client_process, [(protocol, start, duration)] * clients))
+
+
+def scaling_curve(
+    protocols=PROTOCOLS,
+    worker_counts=WORKER_COUNTS,
+    duration=DURATION_SEC,
+    on_step=None,
+):
+    """RPS per protocol per worker count, restarting the server for each point"""
+    rows = []
+    for protocol in protocols:
+        for workers in worker_counts:
+            if on_step:
+                on_step(protocol, workers)
+            env = {**BASE_ENV, "ARENA_WORKERS": str(workers)}
+            if not ServerManager.restart(protocol, env):
+                rows.append({"Protocol": protocol, "Workers": workers, "RPS": None})
+                continue
+            time.sleep(1)  # all workers bound, not just the first
+            stats = ServerManager.get_stats(protocol) or {}
+            rows.append(
+                {
+                    "Protocol": protocol,
+                    "Workers": workers,
+                    "Processes": stats.get("processes", 0),
+                    "RPS": measure(protocol, duration),
+                }
+            )
+    return rows
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]📈 Worker Scaling Curve[/bold blue]\n"
+            f"[italic]ARENA_WORKERS server processes, {CLIENT_PROCS} client processes, {CPUS} cores[/italic]"
+        )
+    )
+
+    table = Table(
+        title=f"limit=1 requests, {CLIENT_PROCS * CONCURRENCY_PER_PROC} in flight, {DURATION_SEC}s per row"
+    )
+    table.add_column("Protocol", style="cyan")
+    table.add_column("Workers", justify="right")
+    table.add_column("Processes", justify="right")
+    table.add_column("RPS", justify="right")
+    table.add_column("Speedup", justify="right")
+
+    try:
+        with console.status("[bold green]Measuring...") as status:
+            rows = scaling_curve(
+                on_step=lambda p, n: status.update(
+                    f"[bold green]{p} with {n} worker(s)..."
+                )
+            )
+    finally:
+        ServerManager.stop_all()
+
+    base = {}
+    for row in rows:
+        if row["RPS"] is None:
+            table.add_row(row["Protocol"], str(row["Workers"]), "-", "failed", "-")
+            continue
+        base.setdefault(row["Protocol"], row["RPS"])
+        first = base[row["Protocol"]]
+        table.add_row(
+            row["Protocol"],
+            str(row["Workers"]),
+            str(row["Processes"]),
+            f"{row['RPS']:.0f}",
+            f"{row['RPS'] / first:.2f}x" if first else "n/a",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import time
+import tracemalloc
+
+from fastapi.testclient import TestClient
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.benchmarks.advanced_benchmark import BATCH_SIZES
+from src.core.cache import response_cache
+from src.servers.rest import app
+
+# --- CONFIG ---
+ITERATIONS = 50
+MODES = {"Standard (ORM + pydantic)": False, "Fast (Core rows + orjson)": True}
+
+console = Console()
+
+
+def cpu_per_request(client, limit, fast):
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        resp = client.get("/logs", params={"limit": limit, "fast": fast})
+        resp.raise_for_status()
+    return (time.process_time() - start) / ITERATIONS * 1000
+
+
+def alloc_per_request(client, limit, fast):
+    """Peak traced allocation of a single request, in KB"""
+    client.get("/logs", params={"limit": limit, "fast": fast})  # warm caches
+    tracemalloc.start()
+    client.get("/logs", params={"limit": limit, "fast": fast})
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]⚙️ REST Serialization Benchmark[/bold blue]\n[italic]In-process, per request[/italic]"
+        )
+    )
+
+    table = Table(title=f"REST /logs cost ({ITERATIONS} requests per cell)")
+    table.add_column("Mode", style="cyan")
+    table.add_column("Limit", justify="right")
+    table.add_column("CPU (ms/req)", justify="right")
+    table.add_column("Peak Alloc (KB/req)", justify="right")
+
+    # Measure the encoders, not the response cache
+    response_cache.max_bytes = 0
+
+    with TestClient(app) as client:
+        for name, fast in MODES.items():
+            for limit in BATCH_SIZES:
+                with console.status(f"[bold green]{name} @ {limit}..."):
+                    cpu = cpu_per_request(client, limit, fast)
+                    alloc = alloc_per_request(client, limit, fast)
+                table.add_row(name, str(limit), f"{cpu:.2f}", f"{alloc:.1f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
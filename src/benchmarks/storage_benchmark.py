@@ -0,0 +1,107 @@
+import asyncio
+import sqlite3
+import statistics
+
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.benchmarks.advanced_benchmark import (
+    GraphQlBenchmark,
+    GrpcBenchmark,
+    RestBenchmark,
+    run_concurrent,
+)
+from src.core.database import DB_PATH, get_db_stats
+from src.servers.manager import SERVER_MAP, ServerManager
+
+# --- CONFIG ---
+PROFILES = ["default", "tuned"]
+BENCHMARKS = {"REST": RestBenchmark, "GraphQL": GraphQlBenchmark, "gRPC": GrpcBenchmark}
+CONCURRENT_CLIENTS = [10, 50]
+REQS_PER_CLIENT = 20
+LIMIT = 100
+# Cache and coalescing off so every request is a real SQLite read
+BASE_ENV = {"ARENA_CACHE_MB": "0", "ARENA_SINGLE_FLIGHT": "0"}
+
+console = Console()
+
+
+def reset_journal_mode():
+    """WAL sticks to the file once set, so put it back before measuring the default"""
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+async def run_profile(protocol):
+    """RPS and latency percentiles at each client count against a running server"""
+    bench = BENCHMARKS[protocol](protocol, SERVER_MAP[protocol]["port"])
+    await bench.benchmark_latency(LIMIT)  # warm the pool and page cache
+    results = {}
+    for clients in CONCURRENT_CLIENTS:
+        duration, latencies = await run_concurrent(
+            bench, LIMIT, clients, REQS_PER_CLIENT
+        )
+        results[clients] = (
+            len(latencies) / duration,
+            statistics.median(latencies) * 1000,
+            percentile(latencies, 0.99) * 1000,
+        )
+    return results
+
+
+def main():
+    rows = asyncio.run(get_db_stats())
+    rprint(
+        Panel.fit(
+            "[bold blue]🗄️ SQLite Storage Profile Benchmark[/bold blue]\n"
+            f"[italic]default vs tuned (WAL, mmap, read-only readers) on {rows:,} rows[/italic]"
+        )
+    )
+
+    table = Table(title=f"limit={LIMIT}, {REQS_PER_CLIENT} requests per client")
+    table.add_column("Protocol", style="cyan")
+    table.add_column("Clients", justify="right")
+    for profile in PROFILES:
+        table.add_column(f"RPS ({profile})", justify="right")
+        table.add_column(f"p50/p99 ms ({profile})", justify="right")
+    table.add_column("Gain", justify="right", style="green")
+
+    try:
+        for protocol in BENCHMARKS:
+            runs = {}
+            for profile in PROFILES:
+                env = {**BASE_ENV, "ARENA_DB_PROFILE": profile}
+                ServerManager.stop(protocol)
+                if profile == "default":
+                    reset_journal_mode()
+                with console.status(f"[bold green]{protocol} ({profile})..."):
+                    if not ServerManager.restart(protocol, env):
+                        rprint(f"❌ {protocol} did not come up")
+                        break
+                    runs[profile] = asyncio.run(run_profile(protocol))
+            if len(runs) < len(PROFILES):
+                continue
+            for clients in CONCURRENT_CLIENTS:
+                cells = []
+                for profile in PROFILES:
+                    rps, p50, p99 = runs[profile][clients]
+                    cells += [f"{rps:.0f}", f"{p50:.1f} / {p99:.1f}"]
+                base, tuned = (runs[p][clients][0] for p in PROFILES)
+                gain = f"{tuned / base:.2f}x" if base else "n/a"
+                table.add_row(protocol, str(clients), *cells, gain)
+    finally:
+        ServerManager.stop_all()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
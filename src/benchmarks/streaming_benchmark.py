@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import httpx
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.servers.manager import SERVER_MAP, ServerManager
+
+# --- CONFIG ---
+LIMITS = [1_000, 10_000, 100_000]
+CHUNK = 1000
+MODES = {
+    "Buffered": ("/logs", {"fast": True}),
+    "NDJSON stream": ("/logs/stream", {"chunk": CHUNK}),
+}
+SAMPLE_SEC = 0.005
+# The cache would serve repeat bodies without touching the encoder
+ENV = {"ARENA_CACHE_MB": "0"}
+
+console = Console()
+
+
+async def sample_memory(peak):
+    """Tracks the server's peak RSS while the request runs"""
+    while True:
+        stats = ServerManager.get_stats("REST")
+        if stats:
+            peak[0] = max(peak[0], stats["memory_mb"])
+        await asyncio.sleep(SAMPLE_SEC)
+
+
+async def measure(path, params, limit):
+    """TTFB, total time (both ms), body size and server RSS growth (MB) for one request"""
+    url = f"http://localhost:{SERVER_MAP['REST']['port']}{path}"
+    async with httpx.AsyncClient(timeout=120) as client:
+        await client.get(url, params={**params, "limit": 10})  # warm up
+        baseline = ServerManager.get_stats("REST")["memory_mb"]
+        peak = [baseline]
+        sampler = asyncio.create_task(sample_memory(peak))
+        try:
+            start = time.perf_counter()
+            ttfb = None
+            size = 0
+            async with client.stream(
+                "GET", url, params={**params, "limit": limit}
+            ) as r:
+                r.raise_for_status()
+                async for data in r.aiter_raw():
+                    if ttfb is None:
+                        ttfb = time.perf_counter() - start
+                    size += len(data)
+            total = time.perf_counter() - start
+        finally:
+            sampler.cancel()
+    return ttfb * 1000, total * 1000, size, peak[0] - baseline
+
+
+def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]🌊 REST Streaming Benchmark[/bold blue]\n[italic]One JSON array vs NDJSON chunks of {0} rows[/italic]".format(
+                CHUNK
+            )
+        )
+    )
+
+    table = Table(title="Single request per cell, fresh server each")
+    table.add_column("Mode", style="cyan")
+    table.add_column("Limit", justify="right")
+    table.add_column("TTFB (ms)", justify="right")
+    table.add_column("Total (ms)", justify="right")
+    table.add_column("Body (MB)", justify="right")
+    table.add_column("Server RSS +MB", justify="right")
+
+    try:
+        for limit in LIMITS:
+            for name, (path, params) in MODES.items():
+                with console.status(f"[bold green]{name} @ {limit:,}..."):
+                    # A fresh process per cell, so one run's heap does not hide the next
+                    if not ServerManager.restart("REST", ENV):
+                        rprint("❌ REST did not come up")
+                        return
+                    ttfb, total, size, rss = asyncio.run(measure(path, params, limit))
+                table.add_row(
+                    name,
+                    f"{limit:,}",
+                    f"{ttfb:.1f}",
+                    f"{total:.1f}",
+                    f"{size / 1e6:.1f}",
+                    f"{rss:.1f}",
+                )
+    finally:
+        ServerManager.stop_all()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
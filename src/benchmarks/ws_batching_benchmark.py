@@ -0,0 +1,154 @@
+import asyncio
+import json
+import statistics
+import time
+
+import websockets
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.client.ws_client import decode_events
+from src.servers.manager import SERVER_MAP, ServerManager
+
+# --- CONFIG ---
+DURATION_SEC = 5
+CONNECTIONS = 4
+INTERVAL_MS = 1  # a high-rate stream: up to 1000 events/s per connection
+BATCH = {"max_events": 50, "max_ms": 20}
+PROXY_PORT = 18003
+# permessage-deflate is opt-in on the server; rows without it simply do not offer it
+SERVER_ENV = {"ARENA_WS_DEFLATE": "1"}
+# name -> (first-message options, client compression)
+SETTINGS = {
+    "JSON, per event": ({}, None),
+    "JSON, per event + deflate": ({}, "deflate"),
+    "JSON, batched": ({"batch": BATCH}, None),
+    "JSON, batched + deflate": ({"batch": BATCH}, "deflate"),
+    "msgpack, batched": ({"batch": BATCH, "encoding": "msgpack"}, None),
+    "msgpack, batched + deflate": (
+        {"batch": BATCH, "encoding": "msgpack"},
+        "deflate",
+    ),
+}
+
+console = Console()
+
+
+class CountingProxy:
+    """TCP relay in front of the WebSocket server that counts bytes sent to clients"""
+
+    def __init__(self, port, upstream_port):
+        self.port = port
+        self.upstream_port = upstream_port
+        self.downstream_bytes = 0
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._relay, "localhost", self.port)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+
+    async def _pipe(self, reader, writer, count):
+        try:
+            while data := await reader.read(65536):
+                if count:
+                    self.downstream_bytes += len(data)
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _relay(self, client_reader, client_writer):
+        reader, writer = await asyncio.open_connection("localhost", self.upstream_port)
+        await asyncio.gather(
+            self._pipe(client_reader, writer, False),
+            self._pipe(reader, client_writer, True),
+        )
+
+
+async def consume(options, compression, deadline, stats):
+    uri = f"ws://localhost:{PROXY_PORT}/ws"
+    async with websockets.connect(uri, compression=compression) as ws:
+        await ws.send(
+            json.dumps({"action_filter": None, "interval_ms": INTERVAL_MS, **options})
+        )
+        while (remaining := deadline - time.time()) > 0:
+            try:
+                message = await asyncio.wait_for(ws.recv(), remaining)
+            except asyncio.TimeoutError:
+                break
+            now = time.time()
+            stats["frames"] += 1
+            for event in decode_events(message):
+                stats["latencies"].append((now - event["emitted_at"]) * 1000)
+
+
+async def measure(options, compression):
+    stats = {"frames": 0, "latencies": []}
+    async with CountingProxy(PROXY_PORT, SERVER_MAP["WebSocket"]["port"]) as proxy:
+        deadline = time.time() + DURATION_SEC
+        await asyncio.gather(
+            *[
+                consume(options, compression, deadline, stats)
+                for _ in range(CONNECTIONS)
+            ]
+        )
+        wire = proxy.downstream_bytes
+    latencies = sorted(stats["latencies"])
+    events = len(latencies)
+    return {
+        "events_per_sec": events / DURATION_SEC,
+        "frames_per_sec": stats["frames"] / DURATION_SEC,
+        "bytes_per_event": wire / events if events else 0,
+        "wire_kb_per_sec": wire / 1024 / DURATION_SEC,
+        "p50": statistics.median(latencies) if latencies else 0,
+        "p99": latencies[min(events - 1, int(events * 0.99))] if latencies else 0,
+    }
+
+
+async def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]📦 WebSocket Batching Benchmark[/bold blue]\n"
+            f"[italic]{CONNECTIONS} connections at {INTERVAL_MS} ms per event, "
+            f"batches of {BATCH['max_events']} or {BATCH['max_ms']} ms[/italic]"
+        )
+    )
+
+    table = Table(title=f"Wire bytes counted by a relay ({DURATION_SEC}s per row)")
+    table.add_column("Setting", style="cyan")
+    table.add_column("Events/s", justify="right")
+    table.add_column("Frames/s", justify="right")
+    table.add_column("Wire KB/s", justify="right")
+    table.add_column("Bytes/event", justify="right")
+    table.add_column("Latency p50 / p99 (ms)", justify="right")
+
+    if not ServerManager.restart("WebSocket", SERVER_ENV):
+        rprint("[red]WebSocket server did not come back up[/red]")
+        return
+    try:
+        for name, (options, compression) in SETTINGS.items():
+            with console.status(f"[bold green]{name}..."):
+                res = await measure(options, compression)
+            table.add_row(
+                name,
+                f"{res['events_per_sec']:.0f}",
+                f"{res['frames_per_sec']:.0f}",
+                f"{res['wire_kb_per_sec']:.1f}",
+                f"{res['bytes_per_event']:.1f}",
+                f"{res['p50']:.1f} / {res['p99']:.1f}",
+            )
+    finally:
+        ServerManager.stop_all()
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
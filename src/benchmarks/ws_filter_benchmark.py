@@ -0,0 +1,99 @@
+import asyncio
+import json
+import time
+
+import websockets
+from rich import print as rprint
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+from sqlalchemy import func, select
+
+from src.core.database import AsyncSessionLocal, DBLog
+from src.scripts.generate import ACTIONS
+from src.servers.manager import ServerManager
+
+# --- CONFIG ---
+DURATION_SEC = 10
+URI = "ws://localhost:8003/ws"
+# ARENA_WS_FILTER for each column: the original loop, then the index pushdown
+MODES = {"Before (sample + discard)": "discard", "After (index pushdown)": "index"}
+
+console = Console()
+
+
+async def action_shares():
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(DBLog.action, func.count()).group_by(DBLog.action)
+        )
+        counts = dict(result.all())
+    total = sum(counts.values()) or 1
+    return {action: n / total for action, n in counts.items()}
+
+
+async def measure_rate(action_filter):
+    """Counts messages delivered for one filter over DURATION_SEC"""
+    count = 0
+    async with websockets.connect(URI) as ws:
+        await ws.send(json.dumps({"action_filter": action_filter}))
+        deadline = time.perf_counter() + DURATION_SEC
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                msg = json.loads(await asyncio.wait_for(ws.recv(), remaining))
+            except asyncio.TimeoutError:
+                break
+            if action_filter:
+                assert msg["action"] == action_filter
+            count += 1
+    return count / DURATION_SEC
+
+
+async def measure_mode(mode, filters):
+    """Delivered rate for every filter at once, against a server in the given mode"""
+    if not ServerManager.restart("WebSocket", {"ARENA_WS_FILTER": mode}):
+        return None
+    return await asyncio.gather(*(measure_rate(f) for f in filters))
+
+
+async def main():
+    rprint(
+        Panel.fit(
+            "[bold blue]🔌 WebSocket Filter Benchmark[/bold blue]\n[italic]Delivered rate per action_filter[/italic]"
+        )
+    )
+
+    shares = await action_shares()
+    filters = [None] + ACTIONS
+    rates = {}
+    try:
+        for name, mode in MODES.items():
+            with console.status(
+                f"[bold green]{name}: streaming {len(filters)} filters for {DURATION_SEC}s..."
+            ):
+                rates[name] = await measure_mode(mode, filters)
+    finally:
+        ServerManager.stop_all()
+
+    table = Table(title="Delivered Messages per Second")
+    table.add_column("action_filter", style="cyan")
+    table.add_column("Row Share", justify="right")
+    for name in MODES:
+        table.add_column(name, justify="right")
+
+    for i, f in enumerate(filters):
+        share = 1.0 if f is None else shares.get(f, 0.0)
+        cells = [
+            f"{rates[name][i]:.2f}" if rates[name] else "did not start"
+            for name in MODES
+        ]
+        table.add_row(f or "(none)", f"{share:.1%}", *cells)
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
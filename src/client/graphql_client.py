@@ -0,0 +1,92 @@
+import asyncio
+import hashlib
+import json
+from contextlib import aclosing
+
+import httpx
+import websockets
+
+URL = "http://localhost:8001/graphql"
+WS_URL = "ws://localhost:8001/graphql"
+LOG_EVENTS = (
+    "subscription ($action: String) { logEvents(actionFilter: $action) { %s } }"
+)
+
+
+def persisted_query(query: str) -> dict:
+    """The APQ extension that stands in for the query text"""
+    digest = hashlib.sha256(query.encode()).hexdigest()
+    return {"persistedQuery": {"version": 1, "sha256Hash": digest}}
+
+
+def not_persisted(body: dict) -> bool:
+    codes = {
+        (error.get("extensions") or {}).get("code")
+        for error in body.get("errors") or []
+    }
+    return "PERSISTED_QUERY_NOT_FOUND" in codes
+
+
+async def post_persisted(client, url, query, variables=None, **kwargs):
+    """POSTs only the query's hash, resending the text once if the server lacks it"""
+    payload = {"extensions": persisted_query(query)}
+    if variables:
+        payload["variables"] = variables
+    resp = await client.post(url, json=payload, **kwargs)
+    if resp.status_code == 200 and not_persisted(resp.json()):
+        resp = await client.post(url, json={**payload, "query": query}, **kwargs)
+    return resp
+
+
+async def subscribe(uri, query, variables=None):
+    """Yields each result's data from a graphql-transport-ws subscription"""
+    async with websockets.connect(uri, subprotocols=["graphql-transport-ws"]) as ws:
+        await ws.send(json.dumps({"type": "connection_init"}))
+        ack = json.loads(await ws.recv())
+        if ack["type"] != "connection_ack":
+            raise RuntimeError(f"Subscription refused: {ack}")
+        payload = {"query": query, "variables": variables or {}}
+        await ws.send(json.dumps({"id": "1", "type": "subscribe", "payload": payload}))
+        async for raw in ws:
+            msg = json.loads(raw)
+            if msg["type"] == "ping":
+                await ws.send(json.dumps({"type": "pong"}))
+            elif msg["type"] == "next":
+                if msg["payload"].get("errors"):
+                    raise RuntimeError(msg["payload"]["errors"])
+                yield msg["payload"]["data"]
+            elif msg["type"] == "error":
+                raise RuntimeError(msg["payload"])
+            elif msg["type"] == "complete":
+                return
+
+
+async def log_events(action_filter=None, fields="id action emittedAt", uri=WS_URL):
+    """Live LogEvent dicts from the logEvents subscription"""
+    query = LOG_EVENTS % fields
+    async for data in subscribe(uri, query, {"action": action_filter}):
+        yield data["logEvents"]
+
+
+async def main():
+    query = "query { logs(limit: 1) { id action timestamp } }"
+    full = len(json.dumps({"query": query}))
+    hashed = len(json.dumps({"extensions": persisted_query(query)}))
+    async with httpx.AsyncClient() as client:
+        for _ in range(2):
+            resp = await post_persisted(client, URL, query)
+            print(f"< {resp.json()['data']['logs']}")
+    print(f"Request body: {full} B as text, {hashed} B as a persisted hash")
+
+    # aclosing, so breaking out also closes the socket cleanly
+    async with aclosing(log_events("LOGIN")) as events:
+        count = 0
+        async for event in events:
+            print(f"< {event}")
+            count += 1
+            if count == 3:
+                break
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+import grpc
+
+from src.servers.protos import logs_pb2, logs_pb2_grpc
+
+
+async def stream_logs(stub, limit, chunk_size=0, cursor=""):
+    """Yields LogEntry messages from StreamLogs as each chunk arrives"""
+    request = logs_pb2.StreamLogsRequest(
+        limit=limit, cursor=cursor, chunk_size=chunk_size
+    )
+    async for page in stub.StreamLogs(request):
+        for log in page.logs:
+            yield log
+
+
+async def main():
+    async with grpc.aio.insecure_channel("localhost:50051") as channel:
+        stub = logs_pb2_grpc.ActivityServiceStub(channel)
+        start = time.perf_counter()
+        count = 0
+        async for log in stream_logs(stub, limit=100_000):
+            if count == 0:
+                print(
+                    f"< First row after {(time.perf_counter() - start) * 1000:.1f} ms"
+                )
+            count += 1
+        print(f"< {count} rows in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,16 +2,26 @@ import asyncio
 import websockets
 import json
 
+import msgpack
+
+
+def decode_events(message):
+    """Events in one frame: msgpack if binary, JSON if text; batches arrive as lists"""
+    data = msgpack.unpackb(message) if isinstance(message, bytes) else json.loads(message)
+    return data if isinstance(data, list) else [data]
+
+
 async def hello():
     uri = "ws://localhost:8003/ws"
     async with websockets.connect(uri) as websocket:
-        # Send Filter
+        # Send Filter (add e.g. "batch": {"max_events": 50, "max_ms": 20},
+        # "encoding": "msgpack" to receive batched binary frames)
         await websocket.send(json.dumps({"action_filter": "LOGIN"}))
         
         # Read stream
         while True:
             response = await websocket.recv()
-            print(f"< Received: {response}")
+            print(f"< Received: {decode_events(response)}")
 
 if __name__ == "__main__":
     asyncio.run(hello())
@@ -0,0 +1,42 @@
+import asyncio
+import random
+from array import array
+from typing import Dict, Optional
+
+from sqlalchemy import select
+
+from src.core.database import ReadSessionLocal, DBLog
+
+
+class ActionIndex:
+    """Per-action row ids held as compact int arrays, so filtered sampling never misses"""
+
+    def __init__(self):
+        self.ids: Dict[str, array] = {}
+        self.max_id = 0
+        self._lock = asyncio.Lock()
+        self._loaded = False
+
+    async def load(self):
+        async with self._lock:
+            if self._loaded:
+                return
+            async with ReadSessionLocal() as session:
+                result = await session.execute(select(DBLog.id, DBLog.action))
+                for row_id, action in result:
+                    bucket = self.ids.get(action)
+                    if bucket is None:
+                        bucket = self.ids[action] = array("q")
+                    bucket.append(row_id)
+                    if row_id > self.max_id:
+                        self.max_id = row_id
+            self._loaded = True
+
+    def counts(self) -> Dict[str, int]:
+        return {action: len(ids) for action, ids in self.ids.items()}
+
+    def random_id(self, action: Optional[str] = None) -> Optional[int]:
+        if not action:
+            return random.randint(1, self.max_id) if self.max_id else None
+        ids = self.ids.get(action)
+        return ids[random.randrange(len(ids))] if ids else None
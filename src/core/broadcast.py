@@ -0,0 +1,231 @@
+import asyncio
+import itertools
+import os
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Set
+
+QUEUE_SIZE = int(os.getenv("ARENA_PUSH_QUEUE", "100"))  # frames per subscriber
+# Encoded bytes a subscriber may have waiting before the policy applies; 0 = no limit
+HIGH_WATER_BYTES = int(os.getenv("ARENA_PUSH_HIGH_WATER_KB", "256")) * 1024
+POLICIES = ("drop-oldest", "coalesce", "disconnect")
+POLICY = os.getenv("ARENA_PUSH_POLICY", "drop-oldest")
+
+_ids = itertools.count(1)
+
+
+class SlowConsumer(Exception):
+    """The subscription was closed because its client fell too far behind"""
+
+
+def frame_size(frame) -> int:
+    # Only encoded frames have a byte cost; objects count against QUEUE_SIZE only
+    return len(frame) if isinstance(frame, (bytes, str)) else 0
+
+
+class Subscription:
+    """Bounded per-client outbox; the policy decides what an overflow costs"""
+
+    def __init__(
+        self,
+        maxsize: int = QUEUE_SIZE,
+        high_water: int = HIGH_WATER_BYTES,
+        policy: str = POLICY,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown push policy {policy!r}, expected {POLICIES}")
+        self.id = next(_ids)
+        self.maxsize = maxsize
+        self.high_water = high_water
+        self.policy = policy
+        self.frames: deque = deque()
+        self.bytes = 0
+        self.peak_bytes = 0
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def put(self, frame):
+        # A stalled client only ever costs itself, it never blocks the producer
+        if self.closed:
+            return
+        size = frame_size(frame)
+        if self._overflows(size):
+            if self.policy == "disconnect":
+                self.closed = True
+                self._ready.set()
+                return
+            if self.policy == "coalesce":
+                # Behind anyway: the whole backlog collapses into the newest frame
+                self.coalesced += len(self.frames)
+                self.frames.clear()
+                self.bytes = 0
+            while self.frames and self._overflows(size):
+                self.bytes -= frame_size(self.frames.popleft())
+                self.dropped += 1
+        self.frames.append(frame)
+        self.bytes += size
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+        self._ready.set()
+
+    async def get(self):
+        while not self.frames or self.closed:
+            if self.closed:
+                raise SlowConsumer(f"Subscriber {self.id} exceeded its outbound queue")
+            self._ready.clear()
+            await self._ready.wait()
+        frame = self.frames.popleft()
+        self.bytes -= frame_size(frame)
+        self.sent += 1
+        return frame
+
+    def _overflows(self, size: int) -> bool:
+        if len(self.frames) >= self.maxsize:
+            return True
+        # A single frame above the mark still goes through on an empty queue
+        return bool(self.high_water and self.frames) and (
+            self.bytes + size > self.high_water
+        )
+
+    def stats(self) -> dict:
+        return {
+            "id": self.id,
+            "queued": len(self.frames),
+            "queued_bytes": self.bytes,
+            "peak_bytes": self.peak_bytes,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "closed": self.closed,
+        }
+
+
+class BroadcastHub:
+    """Single producer task per process that fans frames out to every subscriber"""
+
+    def __init__(
+        self,
+        source: Callable[[], Awaitable[Optional[object]]],
+        interval: float = 0.1,
+        queue_size: int = QUEUE_SIZE,
+        high_water: int = HIGH_WATER_BYTES,
+        policy: str = POLICY,
+        replay: int = 0,
+        stamp: Optional[Callable[[str, object], object]] = None,
+        worker: str = "",
+    ):
+        self.source = source
+        self.interval = interval
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown push policy {policy!r}, expected {POLICIES}")
+        self.queue_size = queue_size
+        self.high_water = high_water
+        self.policy = policy
+        # stamp(event_id, frame) lets the frame carry its own id, "<worker>-<seq>"
+        self.stamp = stamp
+        self.worker = worker
+        self.last_id = 0
+        self.history: deque = deque(maxlen=replay)  # (event_id, frame), oldest first
+        self.subscribers: Set[Subscription] = set()
+        self.published = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.disconnected = 0
+        self.replayed = 0
+        self.replay_gaps = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> Subscription:
+        sub = Subscription(self.queue_size, self.high_water, self.policy)
+        self.subscribers.add(sub)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        self.subscribers.discard(sub)
+        self.dropped += sub.dropped
+        self.coalesced += sub.coalesced
+        self.disconnected += sub.closed
+        # Nobody listening: stop polling the event source
+        if not self.subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def listen(self, last_event_id: Optional[str] = None) -> AsyncIterator:
+        """Live frames, preceded by any buffered ones published after last_event_id"""
+        sub = self.subscribe()
+        # Taken in the same step as subscribe(), so no frame is missed or doubled
+        backlog = self.since(last_event_id) if last_event_id is not None else []
+        try:
+            for frame in backlog:
+                yield frame
+            while True:
+                yield await sub.get()
+        finally:
+            self.unsubscribe(sub)
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.worker}-{seq}" if self.worker else str(seq)
+
+    def since(self, last_event_id: str) -> List:
+        """Buffered frames newer than last_event_id, oldest first"""
+        worker, _, seq = last_event_id.rpartition("-")
+        if worker != self.worker or not seq.isdigit() or int(seq) > self.last_id:
+            # Not an id this hub handed out: it came from another worker or an
+            # earlier process, whose events are not in this buffer. Replaying
+            # the buffer would only flood the client with unrelated frames
+            self.replay_gaps += 1
+            return []
+        last_id = int(seq)
+        if self.history and last_id < self.history[0][0] - 1:
+            # Older than the buffer reaches back: the client has lost some events
+            self.replay_gaps += 1
+        frames = [frame for event_id, frame in self.history if event_id > last_id]
+        self.replayed += len(frames)
+        return frames
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "policy": self.policy,
+            "queued_bytes": sum(s.bytes for s in self.subscribers),
+            "dropped": self.dropped + sum(s.dropped for s in self.subscribers),
+            "coalesced": self.coalesced + sum(s.coalesced for s in self.subscribers),
+            "disconnected": self.disconnected,
+            "worker": self.worker,
+            "last_id": self.last_id,
+            "buffered": len(self.history),
+            "replayed": self.replayed,
+            "replay_gaps": self.replay_gaps,
+        }
+
+    def connections(self) -> List[dict]:
+        """Per-subscriber outbox stats, fullest first"""
+        stats = [sub.stats() for sub in self.subscribers]
+        return sorted(stats, key=lambda c: c["queued_bytes"], reverse=True)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                frames = await self.source()
+            except Exception as e:
+                print(f"Broadcast source failed: {e}")
+                continue
+            if frames is None:
+                continue
+            # A source may hand over several frames at once
+            for frame in frames if isinstance(frames, list) else [frames]:
+                self.publish(frame)
+
+    def publish(self, frame):
+        self.published += 1
+        self.last_id += 1
+        if self.stamp:
+            frame = self.stamp(self.event_id(self.last_id), frame)
+        self.history.append((self.last_id, frame))
+        for sub in list(self.subscribers):
+            sub.put(frame)
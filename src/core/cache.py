@@ -0,0 +1,111 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from src.core.database import ReadSessionLocal, DBLog
+from src.core.ingest import writer
+
+CACHE_MB = float(os.getenv("ARENA_CACHE_MB", "64"))  # 0 disables caching
+CHECK_INTERVAL = float(os.getenv("ARENA_CACHE_CHECK_SEC", "1.0"))
+
+
+class ResponseCache:
+    """Size-bounded LRU of encoded responses, dropped whenever max(logs.id) moves"""
+
+    def __init__(self, max_bytes: int, check_interval: float = CHECK_INTERVAL):
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, Tuple[object, int]]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    async def get(self, key: Hashable):
+        if not self.enabled:
+            return None
+        await self._check_version()
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value, size: int):
+        if not self.enabled or size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    async def get_or_build(
+        self, key: Hashable, build: Callable[[], Awaitable[Tuple[object, int]]]
+    ):
+        """Returns the cached value, or runs build() -> (value, size) and stores it"""
+        value = await self.get(key)
+        if value is not None:
+            return value
+        generation = self.generation
+        value, size = await build()
+        # Skip the store if the data changed while we were building
+        if generation == self.generation:
+            self.put(key, value, size)
+        return value
+
+    def invalidate(self):
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self.bytes = 0
+        self.generation += 1
+
+    def mark_stale(self):
+        """Drops every entry and re-reads max(id) on the next get; called after local commits"""
+        self.invalidate()
+        # Otherwise the next check would see the new max(id) and drop the rebuilt entries too
+        self._checked_at = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    async def _check_version(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        async with ReadSessionLocal() as session:
+            version = await session.scalar(select(func.max(DBLog.id)))
+        if version != self._version:
+            self._version = version
+            self.invalidate()
+
+
+response_cache = ResponseCache(int(CACHE_MB * 1024 * 1024))
+# Writes through this process's ingest endpoints are visible to its next read
+writer.on_commit.append(response_cache.mark_stale)
@@ -0,0 +1,135 @@
+import asyncio
+import os
+from typing import List, Optional, Set
+
+from sqlalchemy import func, select
+
+from src.core.broadcast import Subscription
+from src.core.database import DBLog, ReadSessionLocal
+from src.core.ingest import writer
+
+# What the SSE and WebSocket servers push: "sample" replays random existing rows
+# on a timer, "feed" streams rows as they are inserted
+SOURCES = ("sample", "feed")
+SOURCE = os.getenv("ARENA_PUSH_SOURCE", "sample")
+if SOURCE not in SOURCES:
+    raise ValueError(f"Unknown push source {SOURCE!r}, expected {SOURCES}")
+# How often the feed checks for rows committed by other processes
+POLL_MS = float(os.getenv("ARENA_FEED_POLL_MS", "10"))
+BATCH_ROWS = int(os.getenv("ARENA_FEED_BATCH", "1000"))  # rows per read
+# Empty reads between looks for a tail that was deleted out from under the mark
+TAIL_CHECK_POLLS = int(os.getenv("ARENA_FEED_TAIL_CHECK", "100"))
+
+FEED_COLUMNS = (DBLog.id, DBLog.user_id, DBLog.action, DBLog.timestamp)
+
+
+class ChangeFeed:
+    """Tails newly inserted rows past an id high-water mark, one reader per process"""
+
+    def __init__(
+        self,
+        columns=FEED_COLUMNS,
+        poll_ms: float = POLL_MS,
+        batch_rows: int = BATCH_ROWS,
+        sessions=ReadSessionLocal,
+        tail_check: int = TAIL_CHECK_POLLS,
+    ):
+        self.columns = columns
+        self.sessions = sessions
+        self.poll = poll_ms / 1000
+        self.batch_rows = max(batch_rows, 1)
+        self.tail_check = max(tail_check, 1)
+        self.high_water: Optional[int] = None
+        self.subscribers: Set[Subscription] = set()
+        self.polls = 0  # every query the feed runs, tail lookups included
+        self.tail_checks = 0
+        self._empty = 0  # reads in a row that found nothing
+        self.rows = 0
+        self.batches = 0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> Subscription:
+        """Outbox of row lists, one per read, starting with the next insert"""
+        # Consumers are in-process and never wait on a socket, so this rarely fills
+        sub = Subscription(policy="drop-oldest")
+        self.subscribers.add(sub)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        self.subscribers.discard(sub)
+        if not self.subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+            # Picked up again from the tail, not from where it stopped
+            self.high_water = None
+
+    def notify(self):
+        """Reads right away instead of at the next poll; called after local commits"""
+        self._wake.set()
+
+    async def _read(self) -> List:
+        async with self.sessions() as session:
+            if self.high_water is None:
+                self.polls += 1
+                self.high_water = await session.scalar(select(func.max(DBLog.id))) or 0
+            self.polls += 1
+            result = await session.execute(
+                select(*self.columns)
+                .where(DBLog.id > self.high_water)
+                .order_by(DBLog.id)
+                .limit(self.batch_rows)
+            )
+            rows = result.all()
+            self._empty = 0 if rows else self._empty + 1
+            if self._empty >= self.tail_check:
+                # Files made before logs was AUTOINCREMENT reuse the ids of
+                # deleted newest rows; follow the tail down so new ones are seen
+                self._empty = 0
+                self.polls += 1
+                self.tail_checks += 1
+                newest = await session.scalar(select(func.max(DBLog.id))) or 0
+                self.high_water = min(self.high_water, newest)
+            return rows
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                rows = await self._read()
+            except Exception as e:
+                print(f"Change feed read failed: {e}")
+                rows = []
+            if rows:
+                # SQLite has one writer at a time and AUTOINCREMENT hands out ids
+                # past every one ever used, so nothing commits behind this mark
+                self.high_water = rows[-1].id
+                self.rows += len(rows)
+                self.batches += 1
+                for sub in list(self.subscribers):
+                    sub.put(rows)
+                if len(rows) == self.batch_rows:
+                    continue  # more are waiting
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self.subscribers),
+            "high_water": self.high_water,
+            "polls": self.polls,
+            "tail_checks": self.tail_checks,
+            "rows": self.rows,
+            "batches": self.batches,
+            "dropped": sum(s.dropped for s in self.subscribers),
+        }
+
+
+# Shared by every push connection in this process
+feed = ChangeFeed()
+# Rows written through this process's ingest endpoints are pushed without a poll
+writer.on_commit.append(feed.notify)
@@ -0,0 +1,403 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import String
+
+from src.core.database import DB_PATH
+from src.core.filters import NO_FILTER, LogFilter
+from src.core.pagination import decode_cursor
+
+# How often the store looks for rows written since it loaded; 0 = never
+REFRESH_SEC = float(os.getenv("ARENA_COLUMNAR_REFRESH_SEC", "1.0"))
+
+# Rows converted per step of a full load; bounds the Python objects alive at once
+LOAD_CHUNK = int(os.getenv("ARENA_COLUMNAR_LOAD_CHUNK", "20000"))
+
+SELECT_SQL = (
+    "SELECT id, user_id, action, timestamp, ip_address, metadata_json FROM logs"
+)
+LOAD_SQL = f"{SELECT_SQL} WHERE id > ?"
+# Both are key lookups: the rollups keep the row total, unlike count(*)
+STATE_SQL = (
+    "SELECT (SELECT max(id) FROM logs), (SELECT sum(count) FROM rollup_actions)"
+)
+# Chunks come off ix_logs_timestamp_id in order, so each one appends to the last
+ORDERED_SQL = f"{SELECT_SQL} ORDER BY timestamp, id"
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_micros(ts: datetime) -> int:
+    return (ts - EPOCH) // timedelta(microseconds=1)
+
+
+def intern(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(codes, distinct values in first-seen order) with distinct[codes] == values"""
+    distinct = list(dict.fromkeys(values))
+    index = {v: i for i, v in enumerate(distinct)}
+    codes = np.array(list(map(index.__getitem__, values)), dtype=np.int64)
+    distinct = np.array(distinct, dtype=object)
+    return small_codes(codes, distinct), distinct
+
+
+def small_codes(codes: np.ndarray, distinct: np.ndarray) -> np.ndarray:
+    return codes.astype(np.min_scalar_type(max(len(distinct) - 1, 0)))
+
+
+def merge_codes(parts: Sequence[Tuple[np.ndarray, np.ndarray]]):
+    """Interned (codes, values) columns as one; the first part's codes stay as they are"""
+    index: Dict[str, int] = {}
+    remapped = []
+    for codes, values in parts:
+        for v in values:
+            index.setdefault(v, len(index))
+        remap = np.array([index[v] for v in values], dtype=np.int64)
+        remapped.append(remap[codes])
+    values = np.array(list(index), dtype=object)
+    return small_codes(np.concatenate(remapped), values), values
+
+
+class Columns:
+    """One immutable, (timestamp, id)-sorted snapshot of the logs table"""
+
+    def __init__(
+        self, ids, ts, user_ids, action_codes, actions, ip_codes, ips, offsets, payloads
+    ):
+        self.ids = ids
+        self.ts = ts  # UTC microseconds
+        self.user_ids = user_ids
+        self.action_codes = action_codes
+        self.actions = actions  # interned: actions[action_codes] is the column
+        self.ip_codes = ip_codes
+        self.ips = ips
+        # Payloads share one UTF-8 buffer; row i is payloads[offsets[i]:offsets[i + 1]]
+        self.offsets = offsets
+        self.payloads = payloads
+        # Positions (ascending) of each action's rows, for filtered pages
+        self.by_action: Dict[str, np.ndarray] = {
+            action: np.flatnonzero(self.action_codes == code)
+            for code, action in enumerate(self.actions)
+        }
+
+    @classmethod
+    def from_rows(cls, rows: List[tuple]) -> "Columns":
+        ids, user_ids, actions, stamps, ips, payloads = (
+            zip(*rows) if rows else ([],) * 6
+        )
+        ts = np.array(stamps, dtype="datetime64[us]").astype(np.int64)
+        ids = np.array(ids, dtype=np.int64)
+        order = np.lexsort((ids, ts))
+        # NULL text comes back as "", as the gRPC server already sends it
+        action_codes, actions = intern([a or "" for a in actions])
+        ip_codes, ips = intern([ip or "" for ip in ips])
+        encoded = [(payloads[i] or "").encode() for i in order.tolist()]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        return cls(
+            ids[order],
+            ts[order],
+            np.array(user_ids, dtype=np.int64)[order],
+            action_codes[order],
+            actions,
+            ip_codes[order],
+            ips,
+            np.concatenate(([0], np.cumsum(lengths))),
+            b"".join(encoded),
+        )
+
+    @classmethod
+    def joined(cls, parts: Sequence["Columns"]) -> Optional["Columns"]:
+        """The parts end to end in one copy, or None if they do not sort in that order"""
+        parts = [p for p in parts if len(p)] or [Columns.from_rows([])]
+        for a, b in zip(parts, parts[1:]):
+            if (b.ts[0], b.ids[0]) < (a.ts[-1], a.ids[-1]):
+                return None
+        action_codes, actions = merge_codes(
+            [(p.action_codes, p.actions) for p in parts]
+        )
+        ip_codes, ips = merge_codes([(p.ip_codes, p.ips) for p in parts])
+        starts = np.cumsum([0] + [len(p.payloads) for p in parts[:-1]])
+        return cls(
+            np.concatenate([p.ids for p in parts]),
+            np.concatenate([p.ts for p in parts]),
+            np.concatenate([p.user_ids for p in parts]),
+            action_codes,
+            actions,
+            ip_codes,
+            ips,
+            np.concatenate(
+                [[0]] + [p.offsets[1:] + start for p, start in zip(parts, starts)]
+            ),
+            b"".join(p.payloads for p in parts),
+        )
+
+    def extended(self, rows: List[tuple]) -> Optional["Columns"]:
+        """A new snapshot with rows added, or None if they do not all sort last"""
+        return Columns.joined([self, Columns.from_rows(rows)])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def max_id(self) -> int:
+        return int(self.ids.max()) if len(self.ids) else 0
+
+    def nbytes(self) -> int:
+        arrays = (self.ids, self.ts, self.user_ids, self.action_codes, self.ip_codes)
+        strings = sum(map(sys.getsizeof, self.ips)) + sum(
+            map(sys.getsizeof, self.actions)
+        )
+        positions = sum(p.nbytes for p in self.by_action.values())
+        return (
+            sum(a.nbytes for a in arrays)
+            + self.offsets.nbytes
+            + len(self.payloads)
+            + strings
+            + positions
+        )
+
+    def end_before(self, ts: int, log_id: int) -> int:
+        """Index of the first row at or after (ts, log_id); rows before it are older"""
+        lo = int(np.searchsorted(self.ts, ts, "left"))
+        hi = int(np.searchsorted(self.ts, ts, "right"))
+        return lo + int(np.searchsorted(self.ids[lo:hi], log_id, "left"))
+
+    def positions(
+        self, limit: int, end: int, action: Optional[str], start: int = 0
+    ) -> np.ndarray:
+        """Newest-first positions of up to limit rows in [start, end)"""
+        if action is None:
+            return np.arange(end - 1, max(end - limit, start) - 1, -1)
+        matching = self.by_action.get(action)
+        if matching is None:
+            return np.empty(0, dtype=np.int64)
+        lo = int(np.searchsorted(matching, start))
+        hi = int(np.searchsorted(matching, end))
+        return matching[max(hi - limit, lo) : hi][::-1]
+
+    def values(self, key: str, as_text: bool, idx: np.ndarray) -> list:
+        """One column's Python values for the rows at idx"""
+        if key == "id":
+            return self.ids[idx].tolist()
+        if key == "user_id":
+            return self.user_ids[idx].tolist()
+        if key == "action":
+            return self.actions[self.action_codes[idx]].tolist()
+        if key == "ip_address":
+            return self.ips[self.ip_codes[idx]].tolist()
+        if key == "timestamp":
+            stamps = self.ts[idx].astype("datetime64[us]")
+            if as_text:
+                # The text SQLite stores, as GraphQL reads it
+                return [s.replace("T", " ") for s in np.datetime_as_string(stamps)]
+            return stamps.tolist()
+        if key == "metadata_json":
+            starts = self.offsets[idx].tolist()
+            ends = self.offsets[idx + 1].tolist()
+            buf = self.payloads
+            return [buf[s:e].decode() for s, e in zip(starts, ends)]
+        raise KeyError(key)
+
+
+_row_types: Dict[Tuple[str, ...], type] = {}
+
+
+def row_type(keys: Tuple[str, ...]) -> type:
+    """Named tuple for a column set: iterates like a Core row, reads like an ORM object"""
+    cls = _row_types.get(keys)
+    if cls is None:
+        cls = _row_types[keys] = namedtuple("Row", keys)
+    return cls
+
+
+class ColumnStore:
+    """logs held in memory as sorted NumPy columns; pages are slices, not queries"""
+
+    def __init__(self, path: str = DB_PATH, refresh_sec: float = REFRESH_SEC):
+        self.path = path
+        self.refresh_sec = refresh_sec
+        self.columns = Columns.from_rows([])
+        self.load_ms = 0.0
+        self.reloads = 0
+        self.appends = 0
+        self._stale = False
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._watch: Optional[sqlite3.Connection] = None
+        self._seen_version: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+
+    def _version(self) -> int:
+        """PRAGMA data_version, which moves whenever another connection commits"""
+        # Only meaningful on one connection over time, so this one stays open
+        if self._watch is None:
+            self._watch = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+            )
+        return self._watch.execute("PRAGMA data_version").fetchone()[0]
+
+    def _read(self, after_id: int) -> Tuple[int, List[tuple]]:
+        """The row total, and the rows with id above after_id, from one snapshot"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            max_id, total = conn.execute(STATE_SQL).fetchone()
+            if not max_id or max_id <= after_id:
+                return total or 0, []
+            return total or 0, conn.execute(LOAD_SQL, (after_id,)).fetchall()
+        finally:
+            conn.close()
+
+    def _build(self) -> Columns:
+        """The whole table as columns, converted LOAD_CHUNK rows at a time"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(ORDERED_SQL)
+            parts = []
+            while rows := cursor.fetchmany(LOAD_CHUNK):
+                parts.append(Columns.from_rows(rows))
+            columns = Columns.joined(parts)
+            if columns is None:
+                # Stored text that sorts unlike its parsed time: sort in one go
+                parts.clear()
+                columns = Columns.from_rows(conn.execute(SELECT_SQL).fetchall())
+            return columns
+        finally:
+            conn.close()
+
+    async def load(self):
+        """Reads the whole table and builds the columns, off the event loop"""
+        async with self._lock:
+            start = time.perf_counter()
+            # Taken first, so a commit during the build shows in the next refresh
+            self._seen_version = await asyncio.to_thread(self._version)
+            self.columns = await asyncio.to_thread(self._build)
+            self.load_ms = (time.perf_counter() - start) * 1000
+            self.reloads += 1
+        if self.refresh_sec and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._follow())
+
+    async def refresh(self):
+        """Appends rows written since the last look; reloads if any went missing"""
+        async with self._lock:
+            version = await asyncio.to_thread(self._version)
+            if version == self._seen_version:
+                return
+            self._seen_version = version
+            columns = self.columns
+            total, new = await asyncio.to_thread(self._read, columns.max_id)
+            if not new and total == len(columns):
+                return
+            extended = None
+            # logs is AUTOINCREMENT, so an insert after a delete comes in as a new
+            # row and the total still comes up one short
+            if total == len(columns) + len(new):
+                extended = await asyncio.to_thread(columns.extended, new)
+            if extended is None:
+                # Deleted or back-dated rows: only a full rebuild keeps the order
+                extended = await asyncio.to_thread(self._build)
+                self.reloads += 1
+            else:
+                self.appends += 1
+            self.columns = extended
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
+
+    def mark_stale(self):
+        """Called after a local commit, so the next read takes it in first"""
+        self._stale = True
+
+    async def current(self):
+        """Brings in this process's own writes before a read; cheap when there are none"""
+        if self._stale:
+            self._stale = False
+            await self.refresh()
+
+    async def _follow(self):
+        while True:
+            await asyncio.sleep(self.refresh_sec)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Column store refresh failed: {e}")
+
+    @staticmethod
+    def serves(filt: LogFilter) -> bool:
+        """Whether the columns can answer filt without a scan; SQLite takes the rest"""
+        return filt.user_id is None and not filt.metadata and filt.search is None
+
+    def page(
+        self,
+        columns: Sequence,
+        limit: int,
+        cursor: Optional[str] = None,
+        filt: LogFilter = NO_FILTER,
+    ) -> list:
+        """Newest-first rows of just the given columns, as fetch_log_rows returns them"""
+        snapshot = self.columns
+        idx = self._positions(snapshot, limit, cursor, filt)
+        return self._rows(snapshot, columns, idx)
+
+    def scan(
+        self,
+        columns: Sequence,
+        limit: int,
+        cursor: Optional[str] = None,
+        chunk=1000,
+        filt: LogFilter = NO_FILTER,
+    ) -> Iterator[list]:
+        """The rows of page(), in lists of up to chunk, all from one snapshot"""
+        snapshot = self.columns
+        idx = self._positions(snapshot, limit, cursor, filt)
+        for start in range(0, len(idx), chunk):
+            yield self._rows(snapshot, columns, idx[start : start + chunk])
+
+    @staticmethod
+    def _positions(
+        snapshot: Columns, limit: int, cursor: Optional[str], filt: LogFilter
+    ) -> np.ndarray:
+        # Rows are sorted by time, so a time range is a pair of binary searches
+        start, end = 0, len(snapshot)
+        if cursor:
+            ts, log_id = decode_cursor(cursor)
+            end = snapshot.end_before(to_micros(ts), log_id)
+        if filt.since is not None:
+            start = int(np.searchsorted(snapshot.ts, to_micros(filt.since), "left"))
+        if filt.until is not None:
+            until = int(np.searchsorted(snapshot.ts, to_micros(filt.until), "left"))
+            end = min(end, until)
+        return snapshot.positions(max(limit, 0), end, filt.action, start)
+
+    @staticmethod
+    def _rows(snapshot: Columns, columns: Sequence, idx: np.ndarray) -> list:
+        keys = tuple(c.key for c in columns)
+        # A String-typed timestamp is GraphQL's type_coerce: it wants the stored text
+        values = [
+            snapshot.values(c.key, isinstance(c.type, String), idx) for c in columns
+        ]
+        return list(map(row_type(keys)._make, zip(*values)))
+
+    def stats(self) -> dict:
+        return {
+            "rows": len(self.columns),
+            "memory_mb": round(self.columns.nbytes() / 1024 / 1024, 1),
+            "load_ms": round(self.load_ms, 1),
+            "reloads": self.reloads,
+            "appends": self.appends,
+        }
+
+
+store = ColumnStore()
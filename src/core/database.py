@@ -1,11 +1,52 @@
 import os
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, func, select
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    case,
+    event,
+    func,
+    literal_column,
+    select,
+    text,
+)
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 DB_PATH = "./data/arena.db"
 DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
+READONLY_URL = f"sqlite+aiosqlite:///file:{DB_PATH}?mode=ro&uri=true"
+
+# Storage profiles, picked with ARENA_DB_PROFILE. "default" is SQLAlchemy's stock
+# setup; "tuned" adds WAL, mmap and a separate pool of read-only reader connections
+STORAGE_PROFILES = {
+    "default": {"pragmas": {}, "readers": 0},
+    "tuned": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 1 << 30,
+            "cache_size": -64 * 1024,  # KiB
+            "temp_store": "MEMORY",
+        },
+        "readers": 8,
+    },
+}
+DB_PROFILE = os.getenv("ARENA_DB_PROFILE", "default")
+PROFILE = STORAGE_PROFILES[DB_PROFILE]
+READERS = int(os.getenv("ARENA_DB_READERS", PROFILE["readers"]))
+# Where the read APIs serve pages from: "sqlite" queries the file per request,
+# "columnar" loads logs into memory at startup (src/core/columnar.py)
+STORAGES = ("sqlite", "columnar")
+STORAGE = os.getenv("ARENA_STORAGE", "sqlite")
+if STORAGE not in STORAGES:
+    raise ValueError(f"Unknown storage {STORAGE!r}, expected {STORAGES}")
 
 Base = declarative_base()
 
@@ -13,16 +54,171 @@ Base = declarative_base()
 class DBLog(Base):
     __tablename__ = "logs"
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, index=True)
+    user_id = Column(Integer)
     action = Column(String)
-    timestamp = Column(DateTime, index=True)
+    timestamp = Column(DateTime)
     ip_address = Column(String)
     metadata_json = Column(Text)
 
+    # Keyset pagination walks (timestamp, id) newest-first. Each filter's index
+    # ends in the same pair, so a filtered page is a range scan with no sort
+    __table_args__ = (
+        Index("ix_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_logs_user_timestamp_id", "user_id", "timestamp", "id"),
+        Index("ix_logs_action_timestamp_id", "action", "timestamp", "id"),
+        # Ids are never reused after the newest rows are deleted, so "id > last
+        # seen" (change feed) and max(id) (response cache) always mean new rows
+        {"sqlite_autoincrement": True},
+    )
+
+
+# metadata_json keys filtered on often enough to get an index. The index is on
+# the json_extract expression itself, which is all an indexed VIRTUAL generated
+# column would store, without adding a column to every SELECT * and ORM load
+METADATA_KEYS = ("session", "page")
+
+
+def metadata_value(key: str):
+    """json_extract of one metadata key, spelled exactly as its index is"""
+    # Ingested payloads need not be JSON, and json_extract raises on those. The
+    # path is literal, not bound: SQLite only matches identical expressions
+    document = case((func.json_valid(DBLog.metadata_json), DBLog.metadata_json))
+    return func.json_extract(document, literal_column(f"'$.{key}'"))
+
+
+for _key in METADATA_KEYS:
+    Index(
+        f"ix_logs_meta_{_key}_timestamp_id",
+        metadata_value(_key),
+        DBLog.timestamp,
+        DBLog.id,
+    )
+
+# Full-text index over metadata_json. It is external-content: the text stays in
+# logs, and logs_fts holds only the tokens, kept in step by the triggers below
+SEARCH_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts "
+    "USING fts5(metadata_json, content='logs', content_rowid='id')"
+)
+# Indexes the rows already in logs, once, like ROLLUP_BACKFILL
+SEARCH_BACKFILL = [
+    """INSERT INTO logs_fts (logs_fts) SELECT 'rebuild' WHERE NOT EXISTS (
+    SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'logs_fts_insert')"""
+]
+SEARCH_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS logs_fts_insert AFTER INSERT ON logs BEGIN
+    INSERT INTO logs_fts (rowid, metadata_json) VALUES (NEW.id, NEW.metadata_json);
+END""",
+    """CREATE TRIGGER IF NOT EXISTS logs_fts_delete AFTER DELETE ON logs BEGIN
+    INSERT INTO logs_fts (logs_fts, rowid, metadata_json)
+        VALUES ('delete', OLD.id, OLD.metadata_json);
+END""",
+]
+
+
+# Rollups: counts kept up to date by triggers on logs (ROLLUP_TRIGGERS), so
+# reading a total is a key lookup instead of a scan. NULL text counts as ""
+class RollupAction(Base):
+    __tablename__ = "rollup_actions"
+    action = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+class RollupMinute(Base):
+    __tablename__ = "rollup_minute_actions"
+    minute = Column(String, primary_key=True)  # "YYYY-MM-DD HH:MM" timestamp prefix
+    action = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+    __table_args__ = {"sqlite_with_rowid": False}
+
+
+class RollupUser(Base):
+    __tablename__ = "rollup_users"
+    user_id = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+ROLLUP_TABLES = [m.__table__ for m in (RollupAction, RollupMinute, RollupUser)]
+
+# Fills the rollups from the rows already in logs. Each statement checks for
+# the insert trigger itself, so servers starting together backfill only once
+NOT_BACKFILLED = (
+    "NOT EXISTS (SELECT 1 FROM sqlite_master "
+    "WHERE type = 'trigger' AND name = 'logs_rollup_insert')"
+)
+ROLLUP_BACKFILL = [
+    f"""INSERT INTO rollup_actions (action, count)
+    SELECT coalesce(action, ''), count(*) FROM logs
+    WHERE {NOT_BACKFILLED} GROUP BY 1""",
+    # The minute is a prefix of the text SQLAlchemy stores DateTime as
+    f"""INSERT INTO rollup_minute_actions (minute, action, count)
+    SELECT coalesce(substr(timestamp, 1, 16), ''), coalesce(action, ''), count(*)
+    FROM logs WHERE {NOT_BACKFILLED} GROUP BY 1, 2""",
+    f"""INSERT INTO rollup_users (user_id, count)
+    SELECT user_id, count(*) FROM logs
+    WHERE user_id IS NOT NULL AND {NOT_BACKFILLED} GROUP BY 1""",
+]
+# Rows in logs are only ever inserted and deleted, never updated in place.
+# A count that drops to 0 takes its row with it
+ROLLUP_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS logs_rollup_insert AFTER INSERT ON logs BEGIN
+    INSERT INTO rollup_actions (action, count)
+        VALUES (coalesce(NEW.action, ''), 1)
+        ON CONFLICT (action) DO UPDATE SET count = count + 1;
+    INSERT INTO rollup_minute_actions (minute, action, count)
+        VALUES (coalesce(substr(NEW.timestamp, 1, 16), ''), coalesce(NEW.action, ''), 1)
+        ON CONFLICT (minute, action) DO UPDATE SET count = count + 1;
+    INSERT INTO rollup_users (user_id, count)
+        SELECT NEW.user_id, 1 WHERE NEW.user_id IS NOT NULL
+        ON CONFLICT (user_id) DO UPDATE SET count = count + 1;
+END""",
+    """CREATE TRIGGER IF NOT EXISTS logs_rollup_delete AFTER DELETE ON logs BEGIN
+    UPDATE rollup_actions SET count = count - 1
+        WHERE action = coalesce(OLD.action, '');
+    DELETE FROM rollup_actions WHERE action = coalesce(OLD.action, '') AND count = 0;
+    UPDATE rollup_minute_actions SET count = count - 1
+        WHERE minute = coalesce(substr(OLD.timestamp, 1, 16), '')
+        AND action = coalesce(OLD.action, '');
+    DELETE FROM rollup_minute_actions
+        WHERE minute = coalesce(substr(OLD.timestamp, 1, 16), '')
+        AND action = coalesce(OLD.action, '') AND count = 0;
+    UPDATE rollup_users SET count = count - 1 WHERE user_id = OLD.user_id;
+    DELETE FROM rollup_users WHERE user_id = OLD.user_id AND count = 0;
+END""",
+]
+
+
+def _apply_pragmas(target, pragmas):
+    """Runs the PRAGMAs on every new DBAPI connection the engine opens"""
+    if not pragmas:
+        return
+
+    @event.listens_for(target.sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
 
 engine = create_async_engine(DATABASE_URL)
+_apply_pragmas(engine, PROFILE["pragmas"])
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
+if READERS:
+    # aiosqlite runs each connection on its own thread, so N readers give N-way reads
+    read_engine = create_async_engine(READONLY_URL, pool_size=READERS, max_overflow=0)
+    reader_pragmas = {
+        k: v
+        for k, v in PROFILE["pragmas"].items()
+        if k not in ("journal_mode", "synchronous")
+    }
+    _apply_pragmas(read_engine, {**reader_pragmas, "query_only": "ON"})
+else:
+    read_engine = engine
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False)
+
 
 async def get_db_stats():
     """Returns row count for dashboard verification"""
@@ -30,11 +226,45 @@ async def get_db_stats():
         return 0
     try:
         async with AsyncSessionLocal() as session:
-            return await session.scalar(select(func.count()).select_from(DBLog))
+            try:
+                total = select(func.coalesce(func.sum(RollupAction.count), 0))
+                return await session.scalar(total)
+            except OperationalError:
+                # No rollups until a server has run init_db on this file
+                await session.rollback()
+                return await session.scalar(select(func.count()).select_from(DBLog))
     except Exception:
         return 0
 
 
+# How long a server waits for another one's init_db to finish; backfilling a
+# large file holds the write lock for a while
+INIT_LOCK_TIMEOUT_MS = 10 * 60 * 1000
+
+
+def _create_schema(conn):
+    # create_all checks and creates in two steps, which servers starting together
+    # can interleave, and checkfirst can't see expression indexes (reflection
+    # skips them). IF NOT EXISTS leaves both checks to SQLite
+    for table in Base.metadata.sorted_tables:
+        conn.execute(CreateTable(table, if_not_exists=True))
+        for index in table.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+
 async def init_db():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        busy_timeout = await conn.scalar(text("PRAGMA busy_timeout"))
+        await conn.exec_driver_sql(f"PRAGMA busy_timeout = {INIT_LOCK_TIMEOUT_MS}")
+        try:
+            # One write transaction from the first statement on: a server that
+            # starts later waits here, then finds everything already in place
+            await conn.exec_driver_sql("BEGIN IMMEDIATE")
+            await conn.run_sync(_create_schema)
+            await conn.exec_driver_sql(SEARCH_TABLE)
+            for statement in (
+                ROLLUP_BACKFILL + ROLLUP_TRIGGERS + SEARCH_BACKFILL + SEARCH_TRIGGERS
+            ):
+                await conn.exec_driver_sql(statement)
+        finally:
+            await conn.exec_driver_sql(f"PRAGMA busy_timeout = {busy_timeout}")
@@ -0,0 +1,107 @@
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import literal_column, select, table
+from sqlalchemy.dialects import sqlite
+
+from src.core.database import METADATA_KEYS, DBLog, metadata_value
+
+# The FTS5 table from SEARCH_TABLE; rowid is the logs id
+logs_fts = table("logs_fts", literal_column("rowid"))
+
+
+class LogFilter(NamedTuple):
+    """Row filters shared by the read APIs; each one is served by an index"""
+
+    user_id: Optional[int] = None
+    action: Optional[str] = None
+    since: Optional[datetime] = None  # inclusive, naive UTC
+    until: Optional[datetime] = None  # exclusive, naive UTC
+    metadata: Tuple[Tuple[str, str], ...] = ()  # (key, value), keys in METADATA_KEYS
+    search: Optional[str] = None  # words that must all appear in metadata_json
+
+
+NO_FILTER = LogFilter()
+
+
+def naive_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC; aware ones are converted first"""
+    if ts is None or ts.tzinfo is None:
+        return ts
+    return ts.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def make_filter(
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    metadata: Optional[Dict[str, str]] = None,
+    search: Optional[str] = None,
+) -> LogFilter:
+    """LogFilter from API arguments; raises ValueError on a key with no index"""
+    metadata = metadata or {}
+    unindexed = set(metadata) - set(METADATA_KEYS)
+    if unindexed:
+        raise ValueError(
+            f"Metadata keys {sorted(unindexed)} are not indexed, expected {METADATA_KEYS}"
+        )
+    return LogFilter(
+        user_id=user_id,
+        action=action or None,
+        since=naive_utc(since),
+        until=naive_utc(until),
+        # Sorted, so equal filters are equal keys for the cache and single-flight
+        metadata=tuple(sorted(metadata.items())),
+        search=(search or "").strip() or None,
+    )
+
+
+def parse_metadata(pairs: List[str]) -> Dict[str, str]:
+    """REST's key:value strings as a dict"""
+    metadata = {}
+    for pair in pairs:
+        key, sep, value = pair.partition(":")
+        if not sep:
+            raise ValueError(f"Expected key:value, got {pair!r}")
+        metadata[key] = value
+    return metadata
+
+
+def fts_query(text: str) -> str:
+    """Each word as a quoted FTS5 string, so user input is never query syntax"""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def apply_filter(stmt, filt: LogFilter):
+    """Adds filt's conditions to a select over logs"""
+    if filt.user_id is not None:
+        stmt = stmt.where(DBLog.user_id == filt.user_id)
+    if filt.action is not None:
+        stmt = stmt.where(DBLog.action == filt.action)
+    if filt.since is not None:
+        stmt = stmt.where(DBLog.timestamp >= filt.since)
+    if filt.until is not None:
+        stmt = stmt.where(DBLog.timestamp < filt.until)
+    for key, value in filt.metadata:
+        stmt = stmt.where(metadata_value(key) == value)
+    if filt.search:
+        matches = select(logs_fts.c.rowid).where(
+            literal_column("logs_fts").op("MATCH")(fts_query(filt.search))
+        )
+        stmt = stmt.where(DBLog.id.in_(matches))
+    return stmt
+
+
+def literal_sql(stmt) -> str:
+    """stmt as SQLite SQL with its values inlined, for sqlite3 and EXPLAIN"""
+    return str(
+        stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    )
+
+
+def query_plan(conn: sqlite3.Connection, stmt) -> List[str]:
+    """The detail lines of SQLite's EXPLAIN QUERY PLAN for stmt"""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {literal_sql(stmt)}").fetchall()
+    return [detail for _, _, _, detail in rows]
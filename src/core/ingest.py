@@ -0,0 +1,163 @@
+import asyncio
+import os
+import statistics
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+
+from src.core.database import DBLog, engine
+from src.core.models import NewLog
+
+# A commit goes out at BATCH_ROWS queued rows, or MAX_DELAY_MS after the oldest write
+BATCH_ROWS = int(os.getenv("ARENA_INGEST_BATCH", "1000"))
+MAX_DELAY_MS = float(os.getenv("ARENA_INGEST_DELAY_MS", "5"))
+# Rows waiting for a commit before writers are made to wait for room
+QUEUE_ROWS = int(os.getenv("ARENA_INGEST_QUEUE", "100000"))
+
+
+def parse_ndjson(body: bytes) -> List[NewLog]:
+    """One NewLog per non-blank line; raises ValueError naming the first bad line"""
+    logs = []
+    for number, line in enumerate(body.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            logs.append(NewLog.model_validate_json(line))
+        except ValidationError as e:
+            raise ValueError(f"Line {number}: {e.errors()[0]['msg']}") from e
+    return logs
+
+
+def row_values(log: NewLog) -> dict:
+    """Column values for one insert, stamped now if the writer sent no timestamp"""
+    ts = log.timestamp
+    if ts is None:
+        ts = datetime.now(timezone.utc)
+    if ts.tzinfo is not None:
+        # Stored timestamps are naive UTC
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return {
+        "user_id": log.user_id,
+        "action": log.action,
+        "timestamp": ts,
+        "ip_address": log.ip_address,
+        "metadata_json": log.metadata_json,
+    }
+
+
+class GroupCommitWriter:
+    """Single writer per process: concurrent writes share one transaction per batch"""
+
+    def __init__(
+        self,
+        batch_rows: int = BATCH_ROWS,
+        max_delay_ms: float = MAX_DELAY_MS,
+        max_queued: int = QUEUE_ROWS,
+        target=engine,
+    ):
+        self.batch_rows = max(batch_rows, 1)
+        self.max_delay = max_delay_ms / 1000
+        self.max_queued = max_queued
+        self.target = target
+        self.pending: deque = deque()  # (values, future, enqueued_at), oldest first
+        self.queued = 0
+        self.rows = 0
+        self.batches = 0
+        self.failed = 0
+        self.latencies: deque = deque(maxlen=10_000)  # submit-to-commit, ms
+        self.on_commit: List[Callable[[], None]] = []  # called after every commit
+        self._wake = asyncio.Event()
+        self._room = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, logs: List[NewLog]) -> asyncio.Future:
+        """Queues logs as one unit; the returned future resolves once they are committed"""
+        while self.max_queued and self.queued >= self.max_queued:
+            self._room.clear()
+            await self._room.wait()
+        future = asyncio.get_running_loop().create_future()
+        values = [row_values(log) for log in logs]
+        if not values:
+            future.set_result(0)
+            return future
+        self.pending.append((values, future, time.perf_counter()))
+        self.queued += len(values)
+        self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return future
+
+    async def write(self, logs: List[NewLog]) -> int:
+        """Inserts logs and returns how many were committed"""
+        return await (await self.submit(logs))
+
+    async def _run(self):
+        while True:
+            while not self.pending:
+                self._wake.clear()
+                await self._wake.wait()
+            # Let more writers join the batch until it is full or the oldest is due
+            deadline = self.pending[0][2] + self.max_delay
+            while self.queued < self.batch_rows:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            await self._commit(self._take())
+
+    def _take(self) -> list:
+        # Whole submissions only, so each one is committed all-or-nothing
+        batch, size = [], 0
+        while self.pending and (not batch or size < self.batch_rows):
+            values, future, enqueued_at = self.pending.popleft()
+            batch.append((values, future, enqueued_at))
+            size += len(values)
+        self.queued -= size
+        self._room.set()
+        return batch
+
+    async def _commit(self, batch: list):
+        values = [row for rows, _, _ in batch for row in rows]
+        try:
+            async with self.target.begin() as conn:
+                await conn.execute(insert(DBLog.__table__), values)
+        except Exception as e:
+            self.failed += len(values)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        now = time.perf_counter()
+        self.rows += len(values)
+        self.batches += 1
+        for rows, future, enqueued_at in batch:
+            self.latencies.append((now - enqueued_at) * 1000)
+            if not future.done():
+                future.set_result(len(rows))
+        for callback in self.on_commit:
+            callback()
+
+    def stats(self) -> dict:
+        latencies = sorted(self.latencies) or [0]
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        return {
+            "rows": self.rows,
+            "batches": self.batches,
+            "avg_batch": round(self.rows / self.batches, 1) if self.batches else 0,
+            "queued": self.queued,
+            "failed": self.failed,
+            "commit_p50_ms": round(statistics.median(latencies), 2),
+            "commit_p99_ms": round(p99, 2),
+        }
+
+
+# Shared by every server in this process
+writer = GroupCommitWriter()
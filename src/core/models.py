@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class LogEntry(BaseModel):
@@ -14,3 +14,13 @@ class LogEntry(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class NewLog(BaseModel):
+    """A row to ingest; the id is assigned on insert, the timestamp if left out"""
+
+    user_id: int
+    action: str = Field(min_length=1)
+    timestamp: Optional[datetime] = None
+    ip_address: str = ""
+    metadata_json: str = ""
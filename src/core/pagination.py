@@ -0,0 +1,40 @@
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import desc, tuple_
+
+from src.core.database import DBLog
+
+
+def encode_cursor(timestamp, log_id: int) -> str:
+    """Opaque keyset cursor pointing just past (timestamp, id)"""
+    # str() covers both datetimes and timestamps read back as stored text
+    raw = f"{timestamp}|{log_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError on anything that was not produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, log_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(ts), int(log_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def paginate(stmt, limit: int, cursor: Optional[str] = None):
+    """Applies newest-first keyset ordering backed by ix_logs_timestamp_id"""
+    if cursor:
+        ts, log_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(DBLog.timestamp, DBLog.id) < tuple_(ts, log_id))
+    return stmt.order_by(desc(DBLog.timestamp), desc(DBLog.id)).limit(limit)
+
+
+def next_cursor(rows, limit: int) -> Optional[str]:
+    """Cursor for the page after rows, or None once the scan is exhausted"""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.timestamp, last.id)
@@ -0,0 +1,151 @@
+import os
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import func, select
+
+from src.core.columnar import store
+from src.core.database import (
+    STORAGE,
+    DBLog,
+    ReadSessionLocal,
+    RollupAction,
+    RollupMinute,
+    RollupUser,
+)
+from src.core.filters import NO_FILTER, LogFilter, apply_filter
+from src.core.ingest import writer
+from src.core.pagination import paginate
+from src.core.singleflight import SingleFlight
+
+# Shared read path for the REST, GraphQL and gRPC servers
+flight = SingleFlight(enabled=os.getenv("ARENA_SINGLE_FLIGHT", "1") != "0")
+LOG_COLUMNS = tuple(DBLog.__table__.columns)
+# Widest per-minute window /stats serves, so its cost stays bounded
+STATS_MAX_MINUTES = 1440
+MINUTE_FORMAT = "%Y-%m-%d %H:%M"
+if STORAGE == "columnar":
+    # Rows ingested by this process show up on its next read, not the next refresh
+    writer.on_commit.append(store.mark_stale)
+
+
+async def open_storage():
+    """Loads the in-memory store when ARENA_STORAGE=columnar; SQLite needs nothing"""
+    if STORAGE == "columnar":
+        await store.load()
+
+
+def storage_stats() -> dict:
+    if STORAGE == "columnar":
+        return {"backend": STORAGE, **store.stats()}
+    return {"backend": STORAGE}
+
+
+def columnar(filt: LogFilter) -> bool:
+    """Whether reads with filt come from the in-memory store"""
+    return STORAGE == "columnar" and store.serves(filt)
+
+
+async def fetch_logs(
+    limit: int, cursor: Optional[str] = None, filt: LogFilter = NO_FILTER
+):
+    """Newest-first DBLog objects, one query for all identical concurrent callers"""
+    if columnar(filt):
+        # Rows with every DBLog attribute, sliced out of memory
+        await store.current()
+        return store.page(LOG_COLUMNS, limit, cursor, filt)
+
+    async def query():
+        stmt = paginate(apply_filter(select(DBLog), filt), limit, cursor)
+        async with ReadSessionLocal() as session:
+            result = await session.execute(stmt)
+            return result.scalars().all()
+
+    return await flight.do(("logs", limit, cursor, filt), query)
+
+
+async def fetch_log_rows(
+    columns: Tuple,
+    limit: int,
+    cursor: Optional[str] = None,
+    filt: LogFilter = NO_FILTER,
+):
+    """Newest-first Core rows of just the given columns"""
+    if columnar(filt):
+        await store.current()
+        return store.page(columns, limit, cursor, filt)
+
+    async def query():
+        stmt = paginate(apply_filter(select(*columns), filt), limit, cursor)
+        async with ReadSessionLocal() as session:
+            result = await session.execute(stmt)
+            return result.all()
+
+    return await flight.do(("rows", columns, limit, cursor, filt), query)
+
+
+async def stream_log_rows(
+    columns: Tuple,
+    limit: int,
+    cursor: Optional[str] = None,
+    chunk: int = 1000,
+    filt: LogFilter = NO_FILTER,
+):
+    """Newest-first Core rows in lists of up to chunk, read off a server-side cursor"""
+    if columnar(filt):
+        await store.current()
+        for rows in store.scan(columns, limit, cursor, chunk, filt):
+            yield rows
+        return
+    stmt = paginate(apply_filter(select(*columns), filt), limit, cursor)
+    stmt = stmt.execution_options(yield_per=chunk)
+    async with ReadSessionLocal() as session:
+        result = await session.stream(stmt)
+        async for rows in result.partitions(chunk):
+            yield rows
+
+
+async def fetch_stats(minutes: int = 60, user_id: Optional[int] = None) -> dict:
+    """Row counts read off the rollup tables, in key lookups whatever the size of logs
+
+    minutes is a window of per-(minute, action) counts ending at the newest
+    minute with rows, not at the wall clock: generated datasets end in the past.
+    """
+    if not 0 <= minutes <= STATS_MAX_MINUTES:
+        raise ValueError(f"minutes must be between 0 and {STATS_MAX_MINUTES}")
+    async with ReadSessionLocal() as session:
+        result = await session.execute(
+            select(RollupAction.action, RollupAction.count).order_by(
+                RollupAction.action
+            )
+        )
+        actions = dict(result.all())
+
+        recent = []
+        latest = await session.scalar(select(func.max(RollupMinute.minute)))
+        if minutes and latest:
+            first = datetime.strptime(latest, MINUTE_FORMAT) - timedelta(
+                minutes=minutes - 1
+            )
+            result = await session.execute(
+                select(RollupMinute.minute, RollupMinute.action, RollupMinute.count)
+                .where(RollupMinute.minute >= first.strftime(MINUTE_FORMAT))
+                .order_by(RollupMinute.minute.desc(), RollupMinute.action)
+            )
+            recent = [row._asdict() for row in result]
+
+        user_logs = None
+        if user_id is not None:
+            user_logs = (
+                await session.scalar(
+                    select(RollupUser.count).where(RollupUser.user_id == user_id)
+                )
+                or 0
+            )
+    return {
+        "total": sum(actions.values()),
+        "actions": actions,
+        "minutes": recent,
+        "user_id": user_id,
+        "user_logs": user_logs,
+    }
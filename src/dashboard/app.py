@@ -11,7 +11,9 @@ import streamlit as st
 sys.path.append(os.getcwd())
 
 from src.benchmarks.engine import BenchmarkEngine
+from src.benchmarks.scaling_benchmark import WORKER_COUNTS, scaling_curve
 from src.core.database import get_db_stats
+from src.scripts.datasets import DATASETS
 from src.servers.manager import SERVER_MAP, ServerManager
 
 st.set_page_config(
@@ -144,7 +146,7 @@ for protocol, cfg in SERVER_MAP.items():
             stats = ServerManager.get_stats(protocol)
             if stats:
                 st.sidebar.markdown(
-                    f"<span class='status-active'>●</span> **Active** | CPU: **{stats['cpu']:.1f}%** | RAM: **{stats['memory_mb']:.1f}MB**",
+                    f"<span class='status-active'>●</span> **Active** | CPU: **{stats['cpu']:.1f}%** | RAM: **{stats['memory_mb']:.1f}MB** | Procs: **{stats['processes']}**",
                     unsafe_allow_html=True,
                 )
             else:
@@ -165,9 +167,6 @@ for protocol, cfg in SERVER_MAP.items():
 # --- Main Dashboard ---
 total_rows = asyncio.run(get_db_stats())
 
-# --- Main Dashboard ---
-total_rows = asyncio.run(get_db_stats())
-
 st.markdown("### 📊 Global Arena Status")
 col_stat1, col_stat2, col_stat3 = st.columns(3)
 with col_stat1:
@@ -241,9 +240,12 @@ with tab2:
 
     col_siege1, col_siege2 = st.columns([1, 4])
     siege_dur = col_siege1.slider("Duration (s)", 1, 10, 3)
+    siege_apq = col_siege1.checkbox(
+        "GraphQL persisted queries", help="Send sha256 hashes instead of query text"
+    )
 
     if col_siege1.button("💥 Launch Siege", disabled=not active_now, type="primary"):
-        engine = BenchmarkEngine()
+        engine = BenchmarkEngine(graphql_apq=siege_apq)
         rps_results = {}
 
         with st.status("🌪️ Sieging Servers...") as status:
@@ -272,11 +274,59 @@ with tab2:
                 chart_spot.plotly_chart(fig, use_container_width=True)
             status.update(label="🏁 Siege Finished", state="complete")
 
+    st.markdown("---")
+    st.subheader("Scaling Curve (RPS vs Workers)")
+    st.caption(
+        "Restarts each server with ARENA_WORKERS processes; other servers are left alone."
+    )
+
+    col_scale1, col_scale2 = st.columns([1, 4])
+    scale_protocols = col_scale1.multiselect(
+        "Protocols", ["REST", "GraphQL", "gRPC"], default=["REST", "GraphQL", "gRPC"]
+    )
+    scale_workers = col_scale1.multiselect(
+        "Worker Counts", sorted({1, 2, 4, 8, *WORKER_COUNTS}), default=WORKER_COUNTS
+    )
+    scale_dur = col_scale1.slider("Seconds per Point", 1, 10, 3)
+
+    if col_scale1.button(
+        "📈 Run Scaling Curve",
+        disabled=not (scale_protocols and scale_workers),
+        type="primary",
+    ):
+        with st.status("🧵 Scaling...") as status:
+            rows = scaling_curve(
+                scale_protocols,
+                sorted(scale_workers),
+                scale_dur,
+                on_step=lambda p, n: status.write(f"{p} with {n} worker(s)..."),
+            )
+            # Back to one worker each, as the toggles would start them
+            for p in scale_protocols:
+                ServerManager.restart(p)
+            status.update(label="🏁 Curve Complete", state="complete")
+
+        curve_df = pd.DataFrame(rows).dropna(subset=["RPS"])
+        fig = px.line(
+            curve_df,
+            x="Workers",
+            y="RPS",
+            color="Protocol",
+            markers=True,
+            title=f"Throughput vs Worker Processes ({os.cpu_count()} cores)",
+            template="plotly_dark",
+        )
+        col_scale2.plotly_chart(fig, use_container_width=True)
+        col_scale2.dataframe(curve_df, use_container_width=True)
+
 with tab3:
     st.subheader("Arena Maintenance")
-    if st.button("🔄 Clean Re-Seed (100k Rows)"):
-        with st.spinner("Processing..."):
-            os.system("PYTHONPATH=. uv run python src/scripts/generate.py")
+    dataset = st.selectbox(
+        "Dataset", list(DATASETS), format_func=lambda n: f"{n} (seed {DATASETS[n]['seed']})"
+    )
+    if st.button(f"🔄 Clean Re-Seed ({dataset})"):
+        with st.spinner("Processing (prebuilt datasets install in seconds)..."):
+            os.system(f"PYTHONPATH=. uv run python src/scripts/datasets.py {dataset}")
             st.success("Database Re-Hydrated!")
             st.rerun()
 
@@ -0,0 +1,126 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from src.core.database import DB_PATH
+from src.scripts.generate import (
+    GENERATOR_VERSION,
+    generate,
+    make_profile,
+    replace_db,
+    rollup_ddl,
+    schema_ddl,
+    search_ddl,
+)
+
+# --- CONFIG ---
+ARTIFACT_DIR = "./data/datasets"
+SCHEMA_PATH = "./data/schema.sql"
+END = "2026-01-01"  # fixed so every build of a profile has the same timestamps
+
+# Named, fully seeded datasets; benchmark runs on the same name are comparable
+DATASETS = {
+    "small-100k": make_profile(100_000, 100, seed=100, end=END),
+    "wide-payload-1M": make_profile(
+        1_000_000, 2048, seed=1_000, payload_sigma=0.75, end=END
+    ),
+    "zipf-users-10M": make_profile(
+        10_000_000,
+        100,
+        seed=10_000,
+        users=1_000_000,
+        zipf=1.2,
+        span_days=365,
+        end=END,
+    ),
+}
+
+
+def dataset_key(profile) -> str:
+    """Hash of everything that decides the file's contents"""
+    schema = schema_ddl() + rollup_ddl() + search_ddl()
+    spec = {"profile": profile, "schema": schema, "version": GENERATOR_VERSION}
+    raw = json.dumps(spec, sort_keys=True).encode()
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def artifact_path(name: str) -> str:
+    return os.path.join(ARTIFACT_DIR, f"{name}-{dataset_key(DATASETS[name])}.db")
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build(name: str, workers: int) -> str:
+    """Path of the prebuilt artifact for name, generating it on first use"""
+    path = artifact_path(name)
+    if os.path.exists(path):
+        return path
+    profile = DATASETS[name]
+    print(f"🌊 Building {name} ({profile['rows']:,} rows)...")
+    timings = generate(profile, workers, path)
+    manifest = {
+        "name": name,
+        "key": dataset_key(profile),
+        "profile": profile,
+        "sha256": file_sha256(path),
+        "build_seconds": round(sum(timings.values()), 2),
+    }
+    with open(f"{path}.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+def install(path: str, out: str = DB_PATH):
+    """Copies an artifact over the live database, leaving the artifact pristine"""
+    tmp = f"{out}.tmp"
+    shutil.copyfile(path, tmp)
+    replace_db(tmp, out)
+
+
+def write_schema(path: str = SCHEMA_PATH):
+    header = "-- Generated from the models in src/core/database.py; do not edit.\n"
+    header += "-- Regenerate with: python -m src.scripts.datasets --schema\n\n"
+    with open(path, "w") as f:
+        ddl = schema_ddl() + rollup_ddl() + search_ddl()
+        f.write(header + ";\n\n".join(ddl) + ";\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and install dataset profiles")
+    parser.add_argument("name", nargs="?", choices=sorted(DATASETS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", default=DB_PATH)
+    parser.add_argument("--build-only", action="store_true")
+    parser.add_argument("--list", action="store_true")
+    parser.add_argument("--schema", action="store_true", help=f"rewrite {SCHEMA_PATH}")
+    args = parser.parse_args()
+
+    if args.schema:
+        write_schema()
+        print(f"✅ Wrote {SCHEMA_PATH}")
+    if args.list:
+        for name in DATASETS:
+            path = artifact_path(name)
+            state = "cached" if os.path.exists(path) else "not built"
+            print(f"{name:<18} {DATASETS[name]['rows']:>12,} rows  {state}  {path}")
+    if not args.name:
+        return
+
+    started = time.perf_counter()
+    path = build(args.name, args.workers)
+    if not args.build_only:
+        install(path, args.out)
+    print(f"✅ {args.name} ready in {time.perf_counter() - started:.2f}s ({path})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,321 @@
-import asyncio
-import datetime
+import argparse
 import os
-import random
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-from sqlalchemy.ext.asyncio import create_async_engine
+import numpy as np
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex, CreateTable
 
-from src.core.database import DATABASE_URL, Base, DBLog
+from src.core.database import (
+    DB_PATH,
+    ROLLUP_BACKFILL,
+    ROLLUP_TABLES,
+    ROLLUP_TRIGGERS,
+    SEARCH_BACKFILL,
+    SEARCH_TABLE,
+    SEARCH_TRIGGERS,
+    DBLog,
+)
 
-# Config
+# --- CONFIG ---
 ROWS = 100_000
-BATCH = 5000
+PAYLOAD_BYTES = 100
+USERS = 5000
+SPAN_DAYS = 30  # timestamps run evenly over the N days before "end", oldest first
+CHUNK = 100_000  # rows built and inserted per executemany call
+MIN_SHARD = 250_000  # smaller shards cost more to merge than they save
+ROWS_PER_SESSION = 20  # metadata "session" ids are shared by this many rows on average
+PAGES = 1000  # distinct metadata "page" values
+# Bump whenever the same profile would produce different rows
+GENERATOR_VERSION = 2
 
 ACTIONS = ["LOGIN", "VIEW", "CLICK", "BUY", "LOGOUT", "ERROR"]
 
+TABLE = DBLog.__table__
+DIALECT = sqlite.dialect()
+INSERT = "INSERT INTO {} ({}) VALUES ({})".format(
+    TABLE.name, ", ".join(TABLE.columns.keys()), ", ".join("?" * len(TABLE.columns))
+)
+# Nothing to recover from mid-load: the file is only moved into place once complete
+LOAD_PRAGMAS = [
+    "journal_mode=OFF",
+    "synchronous=OFF",
+    "locking_mode=EXCLUSIVE",
+    "temp_store=MEMORY",
+    "cache_size=-262144",
+]
 
-async def seed():
-    print(f"🌊 Generating {ROWS} rows...")
-    engine = create_async_engine(DATABASE_URL)
-
-    # Ensure data directory exists
-    os.makedirs("./data", exist_ok=True)
-
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
-
-    async with engine.connect() as conn:
-        for i in range(0, ROWS, BATCH):
-            data = []
-            for _ in range(BATCH):
-                data.append(
-                    {
-                        "user_id": random.randint(1, 5000),
-                        "action": random.choice(ACTIONS),
-                        "timestamp": datetime.datetime.now(),
-                        "ip_address": f"10.0.{random.randint(0,255)}.{random.randint(0,255)}",
-                        "metadata_json": '{"payload": "heavy"}'
-                        * 5,  # ~100 bytes padding
-                    }
+_ACTIONS = np.array(ACTIONS, dtype=object)
+_IPS = np.array([f"10.0.{i >> 8}.{i & 255}" for i in range(1 << 16)], dtype=object)
+_PAGES = np.array([f"/p/{i}" for i in range(PAGES)], dtype=object)
+PAYLOAD_TEMPLATE = '{{"session": "{:08x}", "page": "{}", "payload": "{}"}}'
+PAYLOAD_OVERHEAD = len(PAYLOAD_TEMPLATE.format(0, _PAGES[0], ""))
+
+
+def _codes(strings, width):
+    """Fixed-width strings as a (n, width) matrix of UTF-32 code points"""
+    raw = np.asarray(strings, dtype=f"U{width}").tobytes()
+    return np.frombuffer(raw, dtype=np.uint32).reshape(-1, width)
+
+
+_CLOCK = _codes(
+    [f" {s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}." for s in range(86400)], 10
+)
+_DIGITS3 = _codes([f"{i:03d}" for i in range(1000)], 3)
+
+
+def format_timestamps(micros):
+    """Epoch microseconds to SQLAlchemy's SQLite DATETIME text, without a Python loop"""
+    days, rem = np.divmod(micros, 86_400_000_000)
+    secs, frac = np.divmod(rem, 1_000_000)
+    first = days.min()
+    dates = np.arange(first, days.max() + 1).astype("datetime64[D]")
+    text = np.hstack(
+        [
+            _codes(np.datetime_as_string(dates), 10)[days - first],
+            _CLOCK[secs],
+            _DIGITS3[frac // 1000],
+            _DIGITS3[frac % 1000],
+        ]
+    )
+    return np.ascontiguousarray(text).view("U26").ravel().tolist()
+
+
+def make_profile(rows=ROWS, payload_bytes=PAYLOAD_BYTES, seed=None, **shape):
+    """Everything that determines the generated rows, with defaults filled in"""
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % 2**32)
+    profile = {
+        "rows": rows,
+        "seed": seed,
+        "payload_bytes": payload_bytes,
+        "payload_sigma": 0.0,  # lognormal spread of payload sizes, 0 = fixed
+        "users": USERS,
+        "zipf": 0.0,  # user_id skew exponent (> 1), 0 = uniform
+        "span_days": SPAN_DAYS,
+        "end": None,  # ISO date the timestamps run up to, None = now
+    }
+    unknown = set(shape) - set(profile)
+    if unknown:
+        raise ValueError(f"Unknown profile keys: {sorted(unknown)}")
+    profile.update(shape)
+    return profile
+
+
+def _payloads(rng, profile, sizes):
+    """metadata_json strings of (roughly) the given byte sizes, with a session and page"""
+    count = len(sizes)
+    sessions = rng.integers(0, max(profile["rows"] // ROWS_PER_SESSION, 1), count)
+    pages = _PAGES[rng.integers(0, PAGES, count)]
+    # Padding is built once per distinct size
+    unique, inverse = np.unique(sizes, return_inverse=True)
+    padding = np.array(
+        ["x" * max(int(n) - PAYLOAD_OVERHEAD, 0) for n in unique], dtype=object
+    )[inverse]
+    return list(
+        map(
+            PAYLOAD_TEMPLATE.format, sessions.tolist(), pages.tolist(), padding.tolist()
+        )
+    )
+
+
+def build_columns(profile, first_id, count, start_us, span_us):
+    """One chunk of rows as per-column lists, keyed by column name"""
+    # Seeded per chunk, so the rows do not depend on how the work is sharded
+    rng = np.random.default_rng([profile["seed"], (first_id - 1) // CHUNK])
+    offsets = np.arange(first_id - 1, first_id - 1 + count, dtype=np.float64)
+    users = profile["users"]
+    if profile["zipf"]:
+        user_ids = (rng.zipf(profile["zipf"], count) - 1) % users + 1
+    else:
+        user_ids = rng.integers(1, users + 1, count)
+    sizes = np.full(count, profile["payload_bytes"])
+    if profile["payload_sigma"]:
+        drawn = rng.lognormal(
+            np.log(profile["payload_bytes"]), profile["payload_sigma"], count
+        )
+        sizes = np.maximum(16, drawn // 16 * 16).astype(np.int64)
+    return {
+        "id": range(first_id, first_id + count),
+        "user_id": user_ids.tolist(),
+        "action": _ACTIONS[rng.integers(0, len(ACTIONS), count)].tolist(),
+        "timestamp": format_timestamps(
+            start_us + (offsets * (span_us / profile["rows"])).astype(np.int64)
+        ),
+        "ip_address": _IPS[rng.integers(0, len(_IPS), count)].tolist(),
+        "metadata_json": _payloads(rng, profile, sizes),
+    }
+
+
+def open_for_load(path):
+    """Fresh file with just the logs table; indexes come after the rows"""
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path, isolation_level=None)
+    for pragma in LOAD_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+    conn.execute(schema_ddl()[0])
+    return conn
+
+
+def load_shard(path, profile, first_id, count, start_us, span_us):
+    """Writes rows first_id..first_id+count-1 into their own database file"""
+    conn = open_for_load(path)
+    conn.execute("BEGIN")
+    for offset in range(0, count, CHUNK):
+        n = min(CHUNK, count - offset)
+        columns = build_columns(profile, first_id + offset, n, start_us, span_us)
+        conn.executemany(INSERT, zip(*(columns[k] for k in TABLE.columns.keys())))
+    conn.execute("COMMIT")
+    conn.close()
+    return path
+
+
+def merge_shards(conn, paths):
+    """Appends each shard's rows into conn with one INSERT ... SELECT per file"""
+    for path in paths:
+        conn.execute("ATTACH DATABASE ? AS shard", (path,))
+        conn.execute("BEGIN")
+        conn.execute(f"INSERT INTO {TABLE.name} SELECT * FROM shard.{TABLE.name}")
+        conn.execute("COMMIT")
+        conn.execute("DETACH DATABASE shard")
+        os.remove(path)
+
+
+def schema_ddl():
+    """The canonical logs schema as SQLite DDL, table first then indexes"""
+    indexes = sorted(TABLE.indexes, key=lambda i: i.name)
+    return [str(CreateTable(TABLE).compile(dialect=DIALECT)).strip()] + [
+        str(CreateIndex(index).compile(dialect=DIALECT)) for index in indexes
+    ]
+
+
+def create_indexes(conn):
+    for statement in schema_ddl()[1:]:
+        conn.execute(statement)
+
+
+def rollup_ddl():
+    """The rollup tables, then the triggers on logs that keep them up to date"""
+    tables = [
+        str(CreateTable(table).compile(dialect=DIALECT)).strip()
+        for table in ROLLUP_TABLES
+    ]
+    return tables + ROLLUP_TRIGGERS
+
+
+def create_rollups(conn):
+    """Rollups filled with one GROUP BY each, cheaper than firing triggers per row"""
+    ddl = rollup_ddl()
+    for statement in ddl[: len(ROLLUP_TABLES)] + ROLLUP_BACKFILL + ROLLUP_TRIGGERS:
+        conn.execute(statement)
+
+
+def search_ddl():
+    """The full-text index over metadata_json and the triggers that keep it in step"""
+    return [SEARCH_TABLE] + SEARCH_TRIGGERS
+
+
+def create_search_index(conn):
+    """The FTS5 index built in one rebuild pass, then the triggers for later rows"""
+    for statement in [SEARCH_TABLE] + SEARCH_BACKFILL + SEARCH_TRIGGERS:
+        conn.execute(statement)
+
+
+def replace_db(src, out):
+    """Moves a finished database file over out"""
+    # A leftover WAL from the old file would be replayed into the new one
+    for suffix in ("-wal", "-shm", "-journal"):
+        if os.path.exists(out + suffix):
+            os.remove(out + suffix)
+    os.replace(src, out)
+
+
+def generate(profile, workers, out=DB_PATH):
+    """Builds a fresh logs database at out and returns per-stage timings"""
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    tmp = f"{out}.tmp"
+    rows = profile["rows"]
+    span_us = profile["span_days"] * 86_400_000_000
+    end = profile["end"]
+    end_s = np.datetime64(end, "s").astype(np.int64) if end else int(time.time())
+    start_us = int(end_s) * 1_000_000 - span_us
+
+    # Shards are whole chunks so the per-chunk seeds line up for any worker count
+    chunks = -(-rows // CHUNK)
+    workers = max(1, min(workers, chunks, rows // MIN_SHARD))
+    bounds = [
+        min(c * CHUNK, rows)
+        for c in np.linspace(0, chunks, workers + 1, dtype=np.int64).tolist()
+    ]
+    timings = {}
+
+    started = time.perf_counter()
+    if workers == 1:
+        load_shard(tmp, profile, 1, rows, start_us, span_us)
+        conn = sqlite3.connect(tmp, isolation_level=None)
+        timings["load"] = time.perf_counter() - started
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [
+                pool.submit(
+                    load_shard,
+                    f"{tmp}.{k}",
+                    profile,
+                    lo + 1,
+                    hi - lo,
+                    start_us,
+                    span_us,
                 )
-            await conn.execute(DBLog.__table__.insert(), data)
-            print(f"Inserted {i+BATCH}...", end="\r")
-            await conn.commit()
-    print("\n✅ Database Hydrated.")
+                for k, (lo, hi) in enumerate(zip(bounds, bounds[1:]))
+            ]
+            paths = [f.result() for f in futures]
+        timings["load"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        conn = open_for_load(tmp)
+        merge_shards(conn, paths)
+        timings["merge"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for pragma in LOAD_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+    create_indexes(conn)
+    timings["index"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    create_rollups(conn)
+    timings["rollups"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    create_search_index(conn)
+    conn.close()
+    timings["search"] = time.perf_counter() - started
+
+    replace_db(tmp, out)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-generate the arena logs DB")
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--payload-bytes", type=int, default=PAYLOAD_BYTES)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default=DB_PATH)
+    args = parser.parse_args()
+
+    profile = make_profile(args.rows, args.payload_bytes, args.seed)
+    print(
+        f"🌊 Generating {args.rows:,} rows ({args.payload_bytes} B payloads, seed {profile['seed']})..."
+    )
+    timings = generate(profile, args.workers, args.out)
+    total = sum(timings.values())
+    stages = ", ".join(f"{k} {v:.2f}s" for k, v in timings.items())
+    print(f"✅ Database Hydrated: {args.rows / total:,.0f} rows/s ({stages})")
 
 
 if __name__ == "__main__":
-    asyncio.run(seed())
+    main()
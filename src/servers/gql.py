@@ -1,11 +1,37 @@
-from typing import List
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import partial
+from typing import AsyncGenerator, Dict, List, Optional, Set
 
 import strawberry
-from fastapi import FastAPI
-from sqlalchemy import desc, select
+from fastapi import FastAPI, Response
+from graphql import DocumentNode, GraphQLError
+from sqlalchemy import String, select, type_coerce
+from strawberry.extensions import SchemaExtension
 from strawberry.fastapi import GraphQLRouter
+from strawberry.types.nodes import SelectedField
+from strawberry.types.unset import UNSET
 
-from src.core.database import AsyncSessionLocal, DBLog
+from src.core.action_index import ActionIndex
+from src.core.broadcast import BroadcastHub
+from src.core.cache import response_cache
+from src.core.database import DBLog, ReadSessionLocal, init_db
+from src.core.filters import NO_FILTER, LogFilter, make_filter
+from src.core.pagination import next_cursor
+from src.core.queries import (
+    fetch_log_rows,
+    fetch_stats,
+    flight,
+    open_storage,
+    storage_stats,
+)
+
+# Parsed + validated documents kept, by sha256 of the query text; 0 disables
+DOCUMENT_CACHE_SIZE = int(os.getenv("ARENA_GQL_DOCUMENTS", "1000"))
 
 
 @strawberry.type
@@ -18,39 +44,346 @@ class LogType:
     metadata_json: str
 
 
+@strawberry.type
+class LogPage:
+    logs: List[LogType]
+    next_cursor: Optional[str]
+
+
+@strawberry.input
+class MetadataMatch:
+    key: str
+    value: str
+
+
+@strawberry.input
+class LogFilterInput:
+    user_id: Optional[int] = None
+    action: Optional[str] = None
+    since: Optional[datetime] = None  # inclusive
+    until: Optional[datetime] = None  # exclusive
+    metadata: Optional[List[MetadataMatch]] = None  # indexed keys only
+    search: Optional[str] = None  # words that must all appear in the metadata
+
+
+def log_filter(where: Optional[LogFilterInput]) -> LogFilter:
+    if where is None:
+        return NO_FILTER
+    return make_filter(
+        where.user_id,
+        where.action,
+        where.since,
+        where.until,
+        {m.key: m.value for m in where.metadata or []},
+        where.search,
+    )
+
+
+@strawberry.type
+class ActionCount:
+    action: str
+    count: int
+
+
+@strawberry.type
+class MinuteCount:
+    minute: str
+    action: str
+    count: int
+
+
+@strawberry.type
+class Stats:
+    total: int
+    actions: List[ActionCount]
+    minutes: List[MinuteCount]
+    user_logs: Optional[int]
+
+
+@strawberry.type
+class LogEvent:
+    id: int
+    user_id: int
+    action: str
+    timestamp: str
+    # Server wall clock (epoch seconds) when the event was published
+    emitted_at: float
+
+
+# GraphQL field -> SQL column. timestamp is returned as its stored text,
+# skipping the datetime parse/str() round-trip
+LOG_COLUMNS = {
+    "id": DBLog.id,
+    "userId": DBLog.user_id,
+    "action": DBLog.action,
+    "timestamp": type_coerce(DBLog.timestamp, String).label("timestamp"),
+    "ipAddress": DBLog.ip_address,
+    "metadataJson": DBLog.metadata_json,
+}
+
+
+def selected_names(selections) -> Set[str]:
+    """Field names requested on a type, looking through fragments"""
+    names = set()
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            names.add(selection.name)
+        else:
+            names |= selected_names(selection.selections)
+    return names
+
+
+async def fetch_selected_rows(
+    names: Set[str], limit: int, cursor: Optional[str], filt: LogFilter = NO_FILTER
+):
+    """Selects only the requested columns as Core rows, skipping ORM hydration"""
+    columns = tuple(col for name, col in LOG_COLUMNS.items() if name in names)
+    return await fetch_log_rows(columns, limit, cursor, filt)
+
+
+def allow_cache(info: strawberry.Info, cacheable: bool):
+    """Records whether this field lets the whole response be cached"""
+    # Every field of the operation has to agree, like REST caching "latest N" only
+    state = info.context["request"].state
+    state.cacheable = getattr(state, "cacheable", True) and cacheable
+
+
 @strawberry.type
 class Query:
     @strawberry.field
-    async def logs(self, limit: int = 100) -> List[LogType]:
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(DBLog).order_by(desc(DBLog.timestamp)).limit(limit)
-            )
-            data = result.scalars().all()
-            return [
-                LogType(
-                    id=d.id,
-                    user_id=d.user_id,
-                    action=d.action,
-                    timestamp=str(d.timestamp),
-                    ip_address=d.ip_address,
-                    metadata_json=d.metadata_json,
+    async def logs(
+        self,
+        info: strawberry.Info,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        where: Optional[LogFilterInput] = None,
+    ) -> List[LogType]:
+        names = selected_names(info.selected_fields[0].selections)
+        # Always select id so a bare { __typename } query still has a column
+        rows = await fetch_selected_rows(
+            names | {"id"}, limit, cursor, log_filter(where)
+        )
+        allow_cache(info, cursor is None)
+        return rows
+
+    @strawberry.field
+    async def logs_page(
+        self,
+        info: strawberry.Info,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        where: Optional[LogFilterInput] = None,
+    ) -> LogPage:
+        names = set()
+        for field in info.selected_fields[0].selections:
+            if isinstance(field, SelectedField) and field.name == "logs":
+                names |= selected_names(field.selections)
+        # The cursor is built from the last row's (timestamp, id)
+        rows = await fetch_selected_rows(
+            names | {"id", "timestamp"}, limit, cursor, log_filter(where)
+        )
+        allow_cache(info, cursor is None)
+        return LogPage(logs=rows, next_cursor=next_cursor(rows, limit))
+
+    @strawberry.field
+    async def stats(
+        self, info: strawberry.Info, minutes: int = 60, user_id: Optional[int] = None
+    ) -> Stats:
+        allow_cache(info, False)
+        stats = await fetch_stats(minutes, user_id)
+        return Stats(
+            total=stats["total"],
+            actions=[
+                ActionCount(action=a, count=n) for a, n in stats["actions"].items()
+            ],
+            minutes=[MinuteCount(**m) for m in stats["minutes"]],
+            user_logs=stats["user_logs"],
+        )
+
+
+action_index = ActionIndex()
+# One producer per action filter (None = any action), shared by its subscribers
+hubs: Dict[Optional[str], BroadcastHub] = {}
+
+
+async def sample_event(action: Optional[str]) -> Optional[LogEvent]:
+    """A random row matching action, the same object handed to every subscriber"""
+    rand_id = action_index.random_id(action)
+    if rand_id is None:
+        return None
+    async with ReadSessionLocal() as session:
+        result = await session.execute(
+            select(
+                DBLog.id, DBLog.user_id, DBLog.action, LOG_COLUMNS["timestamp"]
+            ).where(DBLog.id == rand_id)
+        )
+        row = result.first()
+    if row is None:
+        return None
+    return LogEvent(**row._mapping, emitted_at=time.time())
+
+
+def event_hub(action: Optional[str]) -> BroadcastHub:
+    hub = hubs.get(action)
+    if hub is None:
+        hub = hubs[action] = BroadcastHub(partial(sample_event, action))
+    return hub
+
+
+@strawberry.type
+class Subscription:
+    @strawberry.subscription
+    async def log_events(
+        self, action_filter: Optional[str] = None
+    ) -> AsyncGenerator[LogEvent, None]:
+        await action_index.load()
+        if action_index.random_id(action_filter) is None:
+            raise ValueError(f"No logs with action {action_filter!r}")
+        async for event in event_hub(action_filter).listen():
+            yield event
+
+
+class DocumentCache:
+    """LRU of query hash -> (query text, document that passed validation)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple[str, DocumentNode]]" = OrderedDict()
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, query: str, document: DocumentNode):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (query, document)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+documents = DocumentCache(DOCUMENT_CACHE_SIZE)
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+def apq_error(message: str, code: str) -> GraphQLError:
+    """The errors Apollo clients look for to resend the full query"""
+    return GraphQLError(message, extensions={"code": code})
+
+
+class PersistedQueries(SchemaExtension):
+    """Apollo-style persisted queries, and parse/validate skipped for known documents
+
+    A request may carry extensions.persistedQuery.sha256Hash instead of the
+    query text. Unknown hashes get PERSISTED_QUERY_NOT_FOUND, and the client
+    resends the text once to register it. Plain text queries go through the
+    same cache, keyed by their hash.
+    """
+
+    def on_operation(self):
+        ctx = self.execution_context
+        persisted = (ctx.operation_extensions or {}).get("persistedQuery")
+        key = persisted.get("sha256Hash") if isinstance(persisted, dict) else None
+        if key and ctx.query and query_hash(ctx.query) != key:
+            raise apq_error("provided sha does not match query", "BAD_REQUEST")
+        if ctx.query and not key:
+            key = query_hash(ctx.query)
+
+        self.key = key
+        entry = documents.get(key) if key else None
+        self.cached = entry is not None
+        if entry:
+            # Both checks below are skipped when these are already set
+            ctx.query, ctx.graphql_document = entry
+            ctx.pre_execution_errors = []
+        elif not ctx.query and key:
+            if documents.max_entries <= 0:
+                raise apq_error(
+                    "PersistedQueryNotSupported", "PERSISTED_QUERY_NOT_SUPPORTED"
                 )
-                for d in data
-            ]
+            raise apq_error("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+        yield
+
+    def on_validate(self):
+        yield
+        ctx = self.execution_context
+        if not self.cached and ctx.pre_execution_errors == []:
+            documents.put(self.key, ctx.query, ctx.graphql_document)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    await open_storage()
+    yield
+
+
+class CachingRouter(GraphQLRouter):
+    """Serves repeated cacheable queries as their stored response bytes
+
+    The key is the request itself (query string and body), so a hit skips
+    parsing, execution and JSON encoding. Only responses whose fields all
+    called allow_cache(info, True), and that have no errors, are stored.
+    """
+
+    async def run(self, request, context=UNSET, root_value=UNSET):
+        if not response_cache.enabled or self.is_websocket_request(request):
+            return await super().run(request, context, root_value)
+        key = ("GraphQL", request.url.query, await request.body())
+        body = await response_cache.get(key)
+        if body is not None:
+            return Response(body, media_type="application/json")
+        generation = response_cache.generation
+        response = await super().run(request, context, root_value)
+        # Skip the store if the data changed while the query ran
+        if (
+            getattr(request.state, "cacheable", False)
+            and response.status_code == 200
+            and generation == response_cache.generation
+        ):
+            response_cache.put(key, response.body, len(response.body))
+        return response
+
+    async def process_result(self, request, result):
+        if result.errors:
+            request.state.cacheable = False
+        return await super().process_result(request, result)
 
 
-schema = strawberry.Schema(query=Query)
-app = FastAPI(title="Arena GraphQL Server")
-app.include_router(GraphQLRouter(schema), prefix="/graphql")
+schema = strawberry.Schema(
+    query=Query, subscription=Subscription, extensions=[PersistedQueries]
+)
+app = FastAPI(title="Arena GraphQL Server", lifespan=lifespan)
+app.include_router(CachingRouter(schema), prefix="/graphql")
 
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "cache": response_cache.stats(),
+        "coalescing": flight.stats(),
+        "storage": storage_stats(),
+        "documents": documents.stats(),
+        "hubs": {action or "*": hub.stats() for action, hub in hubs.items()},
+    }
 
 
 if __name__ == "__main__":
-    import uvicorn
+    from src.servers.launch import serve
 
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    serve(app, "src.servers.gql:app", 8001)
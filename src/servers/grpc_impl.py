@@ -1,46 +1,315 @@
 import asyncio
+import multiprocessing
+import os
+import signal
+from datetime import datetime, timedelta
+from typing import Tuple
 
 import grpc
-from sqlalchemy import desc, select
 
-from src.core.database import AsyncSessionLocal, DBLog
+from src.core.cache import response_cache
+from src.core.database import DBLog, init_db
+from src.core.filters import NO_FILTER, LogFilter, make_filter
+from src.core.ingest import writer
+from src.core.models import NewLog
+from src.core.pagination import decode_cursor, encode_cursor, next_cursor
+from src.core.queries import (
+    fetch_log_rows,
+    fetch_stats,
+    flight,
+    open_storage,
+    storage_stats,
+    stream_log_rows,
+)
 from src.servers.protos import logs_pb2, logs_pb2_grpc
 
+PORT = 50051
+STREAM_CHUNK = 1000
+STATS_MINUTES = 60  # GetStats window when the request leaves it at 0
+
+# --- Launch settings ---
+# Processes sharing PORT via SO_REUSEPORT
+WORKERS = int(os.getenv("ARENA_WORKERS", "1"))
+MAX_MESSAGE_MB = int(os.getenv("ARENA_GRPC_MAX_MESSAGE_MB", "0"))  # 0 = gRPC's caps
+KEEPALIVE_MS = int(os.getenv("ARENA_GRPC_KEEPALIVE_MS", "0"))  # 0 = no server pings
+COMPRESSION = os.getenv("ARENA_GRPC_COMPRESSION", "none")  # none | gzip | deflate
+# Concurrent streams per connection, 0 = gRPC's default
+MAX_STREAMS = int(os.getenv("ARENA_GRPC_MAX_STREAMS", "0"))
+MAX_RPCS = int(os.getenv("ARENA_GRPC_MAX_RPCS", "0")) or None  # per process, 0 = no cap
+COMPRESSIONS = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+LOG_COLUMNS = tuple(DBLog.__table__.columns)
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_micros(ts: datetime) -> int:
+    """Naive UTC datetime to microseconds since the epoch, without float rounding"""
+    return (ts - EPOCH) // timedelta(microseconds=1)
+
+
+# LogEntry field -> (column it is read from, value as sent)
+ENTRY_FIELDS = {
+    "id": (DBLog.id, lambda log: log.id),
+    "user_id": (DBLog.user_id, lambda log: log.user_id),
+    "action": (DBLog.action, lambda log: log.action),
+    "timestamp": (DBLog.timestamp, lambda log: str(log.timestamp)),
+    "timestamp_us": (DBLog.timestamp, lambda log: to_micros(log.timestamp)),
+    "ip_address": (DBLog.ip_address, lambda log: log.ip_address),
+    "metadata_json": (DBLog.metadata_json, lambda log: log.metadata_json or ""),
+}
+ALL_FIELDS = tuple(ENTRY_FIELDS)
+
+
+def mask_fields(mask) -> Tuple[str, ...]:
+    """LogEntry fields named by a FieldMask, all of them when it is empty"""
+    if not mask.paths:
+        return ALL_FIELDS
+    unknown = set(mask.paths) - set(ENTRY_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown LogEntry fields in mask: {sorted(unknown)}")
+    # Canonical order, so equal masks share cache entries
+    return tuple(f for f in ALL_FIELDS if f in mask.paths)
+
+
+def mask_columns(fields) -> Tuple:
+    """Columns to select for fields, plus the (timestamp, id) keyset every page needs"""
+    needed = {"id", "timestamp"} | {ENTRY_FIELDS[f][0].key for f in fields}
+    return tuple(c for c in LOG_COLUMNS if c.key in needed)
+
+
+def from_micros(us: int) -> datetime:
+    return EPOCH + timedelta(microseconds=us)
+
+
+def new_log(entry: logs_pb2.LogEntry) -> NewLog:
+    """NewLog from an ingested LogEntry; timestamp_us wins over the timestamp string"""
+    if entry.timestamp_us:
+        timestamp = from_micros(entry.timestamp_us)
+    else:
+        timestamp = entry.timestamp or None
+    return NewLog(
+        user_id=entry.user_id,
+        action=entry.action,
+        timestamp=timestamp,
+        ip_address=entry.ip_address,
+        metadata_json=entry.metadata_json,
+    )
+
+
+def log_entry(log, fields=ALL_FIELDS) -> logs_pb2.LogEntry:
+    """LogEntry with just fields set, from anything with DBLog's attributes"""
+    return logs_pb2.LogEntry(**{f: ENTRY_FIELDS[f][1](log) for f in fields})
+
+
+def log_filter(message: logs_pb2.LogFilter) -> LogFilter:
+    return make_filter(
+        message.user_id if message.HasField("user_id") else None,
+        message.action,
+        from_micros(message.since_us) if message.since_us else None,
+        from_micros(message.until_us) if message.until_us else None,
+        dict(message.metadata),
+        message.search,
+    )
+
+
+async def parse_request(request, context) -> Tuple[Tuple[str, ...], LogFilter]:
+    """Validates the cursor, field mask and filter, aborting with INVALID_ARGUMENT"""
+    try:
+        if request.cursor:
+            decode_cursor(request.cursor)
+        return mask_fields(request.fields), log_filter(request.filter)
+    except ValueError as e:
+        await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
 
 class ActivityService(logs_pb2_grpc.ActivityServiceServicer):
     async def CheckHealth(self, request, context):
-        return logs_pb2.HealthResponse(status="healthy")
+        counters = {f"cache_{k}": v for k, v in response_cache.stats().items()}
+        counters["flight_calls"] = flight.calls
+        counters["flight_executions"] = flight.executions
+        storage = storage_stats()
+        if storage["backend"] == "columnar":
+            counters["storage_rows"] = storage["rows"]
+            counters["storage_load_ms"] = int(storage["load_ms"])
+        ingest = writer.stats()
+        counters["ingest_rows"] = ingest["rows"]
+        counters["ingest_batches"] = ingest["batches"]
+        counters["ingest_commit_p50_us"] = int(ingest["commit_p50_ms"] * 1000)
+        counters["ingest_commit_p99_us"] = int(ingest["commit_p99_ms"] * 1000)
+        return logs_pb2.HealthResponse(status="healthy", counters=counters)
 
     async def GetLogs(self, request, context):
         limit = request.limit
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(DBLog).order_by(desc(DBLog.timestamp)).limit(limit)
+        fields, filt = await parse_request(request, context)
+        if not request.cursor:
+            # "Latest N" is served as already-serialized LogList bytes
+            async def build():
+                body = (
+                    await self.build_log_list(limit, None, fields, filt)
+                ).SerializeToString()
+                return body, len(body)
+
+            key = ("gRPC", limit, fields, filt)
+            return await response_cache.get_or_build(key, build)
+
+        return await self.build_log_list(limit, request.cursor, fields, filt)
+
+    async def StreamLogs(self, request, context):
+        fields, filt = await parse_request(request, context)
+        chunk = request.chunk_size or STREAM_CHUNK
+        if chunk < 1:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT, "chunk_size must be positive"
             )
-            db_logs = result.scalars().all()
-
-        response_logs = [
-            logs_pb2.LogEntry(
-                id=log.id,
-                user_id=log.user_id,
-                action=log.action,
-                timestamp=str(log.timestamp),
-                ip_address=log.ip_address,
-                metadata_json=log.metadata_json if log.metadata_json else "",
+        columns = mask_columns(fields)
+        cursor = request.cursor or None
+        stream = stream_log_rows(columns, request.limit, cursor, chunk, filt)
+        async for rows in stream:
+            last = rows[-1]
+            yield logs_pb2.LogList(
+                logs=[log_entry(row, fields) for row in rows],
+                next_cursor=encode_cursor(last.timestamp, last.id),
+            )
+
+    async def IngestLogs(self, request_iterator, context):
+        # The whole stream is checked before any of it is queued, so like REST and
+        # WS /ingest a bad entry means nothing was written
+        try:
+            logs = [new_log(entry) async for entry in request_iterator]
+        except ValueError as e:
+            # pydantic's ValidationError is a ValueError
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        # One unit, so the stream is committed all-or-nothing
+        return logs_pb2.IngestResponse(inserted=await writer.write(logs))
+
+    async def GetStats(self, request, context):
+        try:
+            stats = await fetch_stats(
+                request.minutes or STATS_MINUTES, request.user_id or None
             )
-            for log in db_logs
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        return logs_pb2.StatsResponse(
+            total=stats["total"],
+            actions=stats["actions"],
+            minutes=[logs_pb2.MinuteCount(**m) for m in stats["minutes"]],
+            user_logs=stats["user_logs"] or 0,
+        )
+
+    async def build_log_list(self, limit, cursor, fields=ALL_FIELDS, filt=NO_FILTER):
+        rows = await fetch_log_rows(mask_columns(fields), limit, cursor, filt)
+        return logs_pb2.LogList(
+            logs=[log_entry(row, fields) for row in rows],
+            next_cursor=next_cursor(rows, limit) or "",
+        )
+
+
+def serialize(message) -> bytes:
+    # Cached responses are already serialized
+    return message if isinstance(message, bytes) else message.SerializeToString()
+
+
+def add_servicer(servicer, server):
+    """The generated add_ActivityServiceServicer_to_server, with a bytes-aware serializer"""
+    handlers = {
+        "GetLogs": grpc.unary_unary_rpc_method_handler(
+            servicer.GetLogs,
+            request_deserializer=logs_pb2.GetLogsRequest.FromString,
+            response_serializer=serialize,
+        ),
+        "StreamLogs": grpc.unary_stream_rpc_method_handler(
+            servicer.StreamLogs,
+            request_deserializer=logs_pb2.StreamLogsRequest.FromString,
+            response_serializer=serialize,
+        ),
+        "CheckHealth": grpc.unary_unary_rpc_method_handler(
+            servicer.CheckHealth,
+            request_deserializer=logs_pb2.HealthRequest.FromString,
+            response_serializer=serialize,
+        ),
+        "IngestLogs": grpc.stream_unary_rpc_method_handler(
+            servicer.IngestLogs,
+            request_deserializer=logs_pb2.LogEntry.FromString,
+            response_serializer=serialize,
+        ),
+        "GetStats": grpc.unary_unary_rpc_method_handler(
+            servicer.GetStats,
+            request_deserializer=logs_pb2.StatsRequest.FromString,
+            response_serializer=serialize,
+        ),
+    }
+    server.add_generic_rpc_handlers(
+        (grpc.method_handlers_generic_handler("logs.ActivityService", handlers),)
+    )
+
+
+def server_options():
+    """Channel arguments for grpc.aio.server from the ARENA_GRPC_* settings"""
+    options = [("grpc.so_reuseport", 1)]
+    if MAX_MESSAGE_MB:
+        size = MAX_MESSAGE_MB * 1024 * 1024
+        options += [
+            ("grpc.max_send_message_length", size),
+            ("grpc.max_receive_message_length", size),
+        ]
+    if KEEPALIVE_MS:
+        options += [
+            ("grpc.keepalive_time_ms", KEEPALIVE_MS),
+            ("grpc.keepalive_timeout_ms", 20_000),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.min_ping_interval_without_data_ms", KEEPALIVE_MS),
         ]
-        return logs_pb2.LogList(logs=response_logs)
+    if MAX_STREAMS:
+        options.append(("grpc.max_concurrent_streams", MAX_STREAMS))
+    return options
 
 
-async def serve():
-    server = grpc.aio.server()
-    logs_pb2_grpc.add_ActivityServiceServicer_to_server(ActivityService(), server)
-    server.add_insecure_port("[::]:50051")
-    print("🚀 Arena gRPC Server starting on port 50051...")
+async def serve(init: bool = True):
+    if init:
+        await init_db()
+    await open_storage()
+    server = grpc.aio.server(
+        options=server_options(),
+        compression=COMPRESSIONS[COMPRESSION],
+        maximum_concurrent_rpcs=MAX_RPCS,
+    )
+    add_servicer(ActivityService(), server)
+    server.add_insecure_port(f"[::]:{PORT}")
+    print(f"🚀 Arena gRPC Server starting on port {PORT} (pid {os.getpid()})...")
     await server.start()
     await server.wait_for_termination()
 
 
+def run_worker():
+    asyncio.run(serve(init=False))
+
+
+def main():
+    if WORKERS <= 1:
+        asyncio.run(serve())
+        return
+
+    # Schema work happens once, before any worker opens the database
+    asyncio.run(init_db())
+    # Spawned, not forked: gRPC's runtime does not survive fork()
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=run_worker) for _ in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+
+    def shutdown(signum, frame):
+        for worker in workers:
+            worker.terminate()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    for worker in workers:
+        worker.join()
+
+
 if __name__ == "__main__":
-    asyncio.run(serve())
+    main()
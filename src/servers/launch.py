@@ -0,0 +1,14 @@
+import os
+
+import uvicorn
+
+WORKERS = int(os.getenv("ARENA_WORKERS", "1"))
+
+
+def serve(app, import_path: str, port: int, **options):
+    """uvicorn.run for an arena app, as ARENA_WORKERS processes when that is > 1"""
+    if WORKERS > 1:
+        # Each worker imports the app itself, so uvicorn needs its import string
+        uvicorn.run(import_path, host="0.0.0.0", port=port, workers=WORKERS, **options)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port, **options)
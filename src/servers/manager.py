@@ -3,7 +3,7 @@ import signal
 import socket
 import subprocess
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import psutil
 
@@ -20,6 +20,7 @@ class ServerManager:
     """Singleton to manage background server processes"""
 
     _processes: Dict[str, subprocess.Popen] = {}
+    _ps: Dict[int, psutil.Process] = {}
 
     @staticmethod
     def is_port_open(port: int) -> bool:
@@ -27,7 +28,21 @@ class ServerManager:
             return s.connect_ex(("localhost", port)) == 0
 
     @staticmethod
-    def start(protocol: str):
+    def wait_until_ready(protocol: str, timeout: float = 15.0) -> bool:
+        """Polls the protocol's port until it accepts connections"""
+        cfg = SERVER_MAP.get(protocol)
+        if not cfg:
+            return False
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if ServerManager.is_port_open(cfg["port"]):
+                return True
+            time.sleep(0.2)
+        return False
+
+    @staticmethod
+    def start(protocol: str, env: Optional[Dict[str, str]] = None):
+        """Launches the server; env adds ARENA_* settings to the child's environment"""
         cfg = SERVER_MAP.get(protocol)
         if not cfg:
             return
@@ -50,7 +65,7 @@ class ServerManager:
             cwd=os.getcwd(),
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
-            env={**os.environ, "PYTHONPATH": "."},
+            env={**os.environ, "PYTHONPATH": ".", **(env or {})},
         )
         ServerManager._processes[protocol] = p
 
@@ -69,14 +84,25 @@ class ServerManager:
         # Fallback: kill anything on that port if it's still stuck
         cfg = SERVER_MAP.get(protocol)
         if cfg and ServerManager.is_port_open(cfg["port"]):
-            for proc in psutil.process_iter(["pid", "name", "connections"]):
+            for proc in psutil.process_iter(["pid", "name", "net_connections"]):
                 try:
-                    for conn in proc.info.get("connections") or []:
+                    for conn in proc.info.get("net_connections") or []:
                         if conn.laddr.port == cfg["port"]:
                             os.kill(proc.info["pid"], signal.SIGKILL)
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
 
+    @staticmethod
+    def restart(protocol: str, env: Optional[Dict[str, str]] = None) -> bool:
+        """Stops whatever serves the protocol and relaunches it with env"""
+        ServerManager.stop(protocol)
+        cfg = SERVER_MAP[protocol]
+        deadline = time.time() + 10
+        while ServerManager.is_port_open(cfg["port"]) and time.time() < deadline:
+            time.sleep(0.2)
+        ServerManager.start(protocol, env)
+        return ServerManager.wait_until_ready(protocol)
+
     @staticmethod
     def stop_all():
         keys = list(ServerManager._processes.keys())
@@ -85,7 +111,7 @@ class ServerManager:
 
     @staticmethod
     def get_stats(protocol: str) -> Optional[dict]:
-        """Returns CPU/Memory of the running server"""
+        """Returns CPU/Memory summed over the server's whole worker group"""
         cfg = SERVER_MAP.get(protocol)
         if not cfg:
             return None
@@ -94,38 +120,82 @@ class ServerManager:
         if not ServerManager.is_port_open(cfg["port"]):
             return None
 
-        # Try to find the process by port if not in _processes
-        pid = None
-        if protocol in ServerManager._processes:
-            pid = ServerManager._processes[protocol].pid
-        if not pid:
-            # Fallback for macOS: use lsof to find PID by port
+        group = {}
+        for pid in ServerManager._root_pids(protocol):
             try:
-                import subprocess
+                root = ServerManager._process(pid)
+                group[pid] = root
+                for child in root.children(recursive=True):
+                    if child.pid not in group:
+                        group[child.pid] = ServerManager._process(child.pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        if not group:
+            return None
+
+        mem = 0
+        cpu = 0.0
+        for proc in group.values():
+            try:
+                mem += proc.memory_info().rss
+                cpu += proc.cpu_percent(interval=None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return {
+            "cpu": cpu,
+            "memory_mb": mem / 1024 / 1024,
+            "pids": sorted(group),
+            "processes": len(group),
+        }
+
+    @staticmethod
+    def _root_pids(protocol: str) -> List[int]:
+        """Top of the protocol's process tree: ours, or whatever listens on its port"""
+        if protocol in ServerManager._processes:
+            return [ServerManager._processes[protocol].pid]
 
+        # Started elsewhere; SO_REUSEPORT servers have several listeners
+        port = SERVER_MAP[protocol]["port"]
+        try:
+            listeners = {
+                conn.pid
+                for conn in psutil.net_connections(kind="inet")
+                if conn.pid
+                and conn.laddr
+                and conn.laddr.port == port
+                and conn.status == psutil.CONN_LISTEN
+            }
+        except psutil.AccessDenied:
+            # macOS only lists other processes' sockets to root: ask lsof instead
+            try:
                 output = subprocess.check_output(
-                    ["lsof", "-t", f"-i:{cfg['port']}", "-sTCP:LISTEN"],
+                    ["lsof", "-t", f"-i:{port}", "-sTCP:LISTEN"],
                     stderr=subprocess.STDOUT,
                 )
-                pids = output.decode().strip().split("\n")
-                if pids and pids[0]:
-                    pid = int(pids[0])
-            except:
+                listeners = {int(pid) for pid in output.decode().split()}
+            except (OSError, subprocess.CalledProcessError):
+                return []
+
+        # A listener may be one worker of many: climb to the process that
+        # launched the server script, whose children are the whole group
+        script = SERVER_MAP[protocol]["cmd"][-1]
+        roots = set()
+        for pid in listeners:
+            try:
+                root = psutil.Process(pid)
+                for parent in root.parents():
+                    if not any(script in arg for arg in parent.cmdline()):
+                        break
+                    root = parent
+                roots.add(root.pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
                 pass
+        return sorted(roots)
 
-        if not pid:
-            return None
-
-        try:
-            proc = psutil.Process(pid)
-            mem = proc.memory_info().rss
-            cpu = proc.cpu_percent(interval=None)
-            for child in proc.children(recursive=True):
-                try:
-                    mem += child.memory_info().rss
-                    cpu += child.cpu_percent(interval=None)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-            return {"cpu": cpu, "memory_mb": mem / 1024 / 1024}
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            return None
+    @staticmethod
+    def _process(pid: int) -> psutil.Process:
+        """Cached handle, so cpu_percent measures the time since the previous poll"""
+        proc = ServerManager._ps.get(pid)
+        if proc is None or not proc.is_running():
+            proc = ServerManager._ps[pid] = psutil.Process(pid)
+        return proc
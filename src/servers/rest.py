@@ -1,29 +1,177 @@
-from typing import List
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from fastapi import Depends, FastAPI
-from sqlalchemy import desc, select
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 
-from src.core.database import AsyncSessionLocal, DBLog
+from src.core.cache import response_cache
+from src.core.database import DBLog, init_db
+from src.core.filters import LogFilter, make_filter, parse_metadata
+from src.core.ingest import parse_ndjson, writer
 from src.core.models import LogEntry
+from src.core.pagination import decode_cursor, next_cursor
+from src.core.queries import (
+    fetch_log_rows,
+    fetch_logs,
+    fetch_stats,
+    flight,
+    open_storage,
+    storage_stats,
+    stream_log_rows,
+)
 
-app = FastAPI(title="Arena REST Server")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    await open_storage()
+    yield
+
+
+app = FastAPI(title="Arena REST Server", lifespan=lifespan)
+
+LOG_COLUMNS = tuple(DBLog.__table__.columns)
+LOG_KEYS = [c.name for c in LOG_COLUMNS]
+LOG_LIST = TypeAdapter(List[LogEntry])
 
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "cache": response_cache.stats(),
+        "coalescing": flight.stats(),
+        "storage": storage_stats(),
+        "ingest": writer.stats(),
+    }
+
+
+def log_filter(
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    meta: List[str] = Query([], description="key:value on an indexed metadata key"),
+    search: Optional[str] = None,
+) -> LogFilter:
+    """The filter query parameters shared by /logs and /logs/stream"""
+    try:
+        return make_filter(user_id, action, since, until, parse_metadata(meta), search)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def encode_fast(
+    limit: int, cursor: Optional[str], filt: LogFilter
+) -> Tuple[bytes, Optional[str]]:
+    """Core row tuples encoded straight to JSON bytes, bypassing ORM and pydantic"""
+    rows = await fetch_log_rows(LOG_COLUMNS, limit, cursor, filt)
+    body = orjson.dumps([dict(zip(LOG_KEYS, row)) for row in rows])
+    return body, next_cursor(rows, limit)
+
+
+async def encode_standard(
+    limit: int, cursor: Optional[str], filt: LogFilter
+) -> Tuple[bytes, Optional[str]]:
+    """ORM objects validated through LogEntry, encoded up front so the body can be cached"""
+    logs = await fetch_logs(limit, cursor, filt)
+    body = LOG_LIST.dump_json(LOG_LIST.validate_python(logs, from_attributes=True))
+    return body, next_cursor(logs, limit)
 
 
 @app.get("/logs", response_model=List[LogEntry])
-async def get_logs(limit: int = 100):
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(
-            select(DBLog).order_by(desc(DBLog.timestamp)).limit(limit)
-        )
-        return result.scalars().all()
+async def get_logs(
+    response: Response,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fast: bool = False,
+    filt: LogFilter = Depends(log_filter),
+):
+    """Newest-first page of logs; the next page's cursor is sent in X-Next-Cursor"""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # Only "latest N" is shared between clients, so only it is cached
+    cached = response_cache.enabled and not cursor
+    if not fast and not cached:
+        # The original path, kept for comparison: FastAPI validates and encodes
+        # the ORM objects through response_model
+        logs = await fetch_logs(limit, cursor, filt)
+        nc = next_cursor(logs, limit)
+        if nc:
+            response.headers["X-Next-Cursor"] = nc
+        return logs
+
+    encode = encode_fast if fast else encode_standard
+    if cached:
+
+        async def build():
+            body, nc = await encode(limit, None, filt)
+            return (body, nc), len(body)
+
+        key = ("REST", limit, "fast" if fast else "standard", filt)
+        body, nc = await response_cache.get_or_build(key, build)
+    else:
+        body, nc = await encode(limit, cursor, filt)
+
+    response = Response(content=body, media_type="application/json")
+    if nc:
+        response.headers["X-Next-Cursor"] = nc
+    return response
+
+
+@app.post("/logs", status_code=201)
+async def ingest_logs(request: Request):
+    """Inserts an NDJSON body of logs, one object per line, in a single commit"""
+    try:
+        logs = parse_ndjson(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"inserted": await writer.write(logs)}
+
+
+@app.get("/stats")
+async def stats(minutes: int = 60, user_id: Optional[int] = None):
+    """Row counts by action, by minute and for one user, from the rollup tables"""
+    try:
+        return await fetch_stats(minutes, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def encode_ndjson(limit: int, cursor: Optional[str], chunk: int, filt: LogFilter):
+    """One JSON object per line, flushed a chunk of rows at a time"""
+    async for rows in stream_log_rows(LOG_COLUMNS, limit, cursor, chunk, filt):
+        yield b"".join(orjson.dumps(dict(zip(LOG_KEYS, row))) + b"\n" for row in rows)
+
+
+@app.get("/logs/stream")
+async def stream_logs(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    chunk: int = 1000,
+    filt: LogFilter = Depends(log_filter),
+):
+    """Same rows as /logs?fast=true as NDJSON, with memory bounded by chunk not limit"""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if chunk < 1:
+        raise HTTPException(status_code=400, detail="chunk must be positive")
+    return StreamingResponse(
+        encode_ndjson(limit, cursor, chunk, filt), media_type="application/x-ndjson"
+    )
 
 
 if __name__ == "__main__":
-    import uvicorn
+    from src.servers.launch import serve
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    serve(app, "src.servers.rest:app", 8000)
@@ -1,50 +1,140 @@
 import asyncio
 import json
+import os
 import random
+import secrets
+import time
+from typing import Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header
 from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 
-from src.core.database import AsyncSessionLocal, DBLog
+from src.core.broadcast import BroadcastHub, SlowConsumer
+from src.core.changefeed import SOURCE, feed
+from src.core.database import ReadSessionLocal, DBLog
 
 app = FastAPI(title="Arena SSE Server")
 
+NO_DATA = b'data: {"error": "No data"}\n\n'
+# Recent frames kept per process for Last-Event-ID replay; 0 disables
+REPLAY_SIZE = int(os.getenv("ARENA_SSE_REPLAY", "1000"))
 
-async def event_stream():
-    """Simulate real-time events by picking random rows"""
-    async with AsyncSessionLocal() as session:
-        max_id = await session.scalar(select(func.max(DBLog.id)))
-        if not max_id:
-            yield 'data: {"error": "No data"}\n\n'
-            return
+_max_id = None
+db_queries = 0
 
-        while True:
-            await asyncio.sleep(0.1)
-            rand_id = random.randint(1, max_id)
-            result = await session.execute(select(DBLog).where(DBLog.id == rand_id))
-            log = result.scalar_one_or_none()
 
-            if log:
-                data = {
-                    "id": log.id,
-                    "action": log.action,
-                    "timestamp": str(log.timestamp),
-                }
-                yield f"data: {json.dumps(data)}\n\n"
+async def get_max_id():
+    global _max_id, db_queries
+    if not _max_id:
+        db_queries += 1
+        async with ReadSessionLocal() as session:
+            _max_id = await session.scalar(select(func.max(DBLog.id)))
+    return _max_id
+
+
+def encode_row(row, emitted_at: float) -> bytes:
+    data = {
+        "id": row.id,
+        "action": row.action,
+        "timestamp": str(row.timestamp),
+        "emitted_at": emitted_at,
+    }
+    return f"data: {json.dumps(data)}\n\n".encode()
+
+
+async def sample_event():
+    """Simulate a real-time event by picking a random row, encoded once for all clients"""
+    global db_queries
+    max_id = await get_max_id()
+    if not max_id:
+        return None
+    db_queries += 1
+    async with ReadSessionLocal() as session:
+        rand_id = random.randint(1, max_id)
+        result = await session.execute(select(DBLog).where(DBLog.id == rand_id))
+        log = result.scalar_one_or_none()
+
+    if not log:
+        return None
+    return encode_row(log, time.time())
+
+
+feed_sub = None
+
+
+async def feed_events():
+    """Frames for the rows inserted since the last call, waiting for at least one"""
+    global feed_sub
+    if feed_sub is None:
+        feed_sub = feed.subscribe()
+    try:
+        rows = await feed_sub.get()
+    except asyncio.CancelledError:
+        # The hub stopped for lack of clients; so does the feed
+        feed.unsubscribe(feed_sub)
+        feed_sub = None
+        raise
+    now = time.time()
+    return [encode_row(row, now) for row in rows]
+
+
+def with_event_id(event_id: str, frame: bytes) -> bytes:
+    return b"id: " + event_id.encode() + b"\n" + frame
+
+
+# Ids are "<worker>-<seq>". The token is new for every process, so an id from
+# another worker (ARENA_WORKERS) or an earlier process never matches this
+# hub's events, however close the sequence numbers are: it gets no replay and
+# counts as a gap
+hub = BroadcastHub(
+    feed_events if SOURCE == "feed" else sample_event,
+    interval=0 if SOURCE == "feed" else 0.1,
+    replay=REPLAY_SIZE,
+    stamp=with_event_id,
+    worker=secrets.token_hex(4),
+)
+
+
+async def event_stream(last_event_id: Optional[str] = None):
+    """Relay the shared hub's pre-encoded frames to a single client"""
+    if SOURCE == "sample" and not await get_max_id():
+        yield NO_DATA
+        return
+
+    try:
+        async for frame in hub.listen(last_event_id):
+            yield frame
+    except SlowConsumer:
+        # Ending the response is the disconnect; the client resumes via Last-Event-ID
+        return
 
 
 @app.get("/stream")
-async def stream():
-    return StreamingResponse(event_stream(), media_type="text/event-stream")
+async def stream(last_event_id: Optional[str] = Header(None)):
+    # EventSource resends the last id it saw when it reconnects
+    return StreamingResponse(
+        event_stream(last_event_id or None), media_type="text/event-stream"
+    )
 
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "source": SOURCE,
+        "hub": hub.stats(),
+        "feed": feed.stats(),
+        "db_queries": db_queries + feed.polls,
+    }
+
+
+@app.get("/connections")
+async def connections():
+    return hub.connections()
 
 
 if __name__ == "__main__":
-    import uvicorn
+    from src.servers.launch import serve
 
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    serve(app, "src.servers.sse:app", 8002)
@@ -1,18 +1,148 @@
 import asyncio
 import json
-import random
+import os
+import time
 
+import msgpack
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from sqlalchemy import func, select
+from sqlalchemy import select
 
-from src.core.database import AsyncSessionLocal, DBLog
+from src.core.action_index import ActionIndex
+from src.core.broadcast import POLICY, SlowConsumer, Subscription
+from src.core.changefeed import SOURCE, feed
+from src.core.database import ReadSessionLocal, DBLog
+from src.core.ingest import parse_ndjson, writer
 
 app = FastAPI(title="Arena WebSocket Server")
 
+TICK_MS = 100  # default gap between events, per connection
+INGEST_IN_FLIGHT = 64  # unacknowledged /ingest messages per connection
+# Opt-in: accept permessage-deflate from clients that offer it in the handshake
+DEFLATE = os.getenv("ARENA_WS_DEFLATE", "0") != "0"
+# How sampled events honour action_filter: "index" picks ids of matching rows,
+# "discard" is the original loop that reads any random row and drops mismatches
+FILTER_MODES = ("index", "discard")
+FILTER_MODE = os.getenv("ARENA_WS_FILTER", "index")
+if FILTER_MODE not in FILTER_MODES:
+    raise ValueError(f"Unknown filter mode {FILTER_MODE!r}, expected {FILTER_MODES}")
+# JSON goes out as text frames, msgpack as binary frames
+ENCODERS = {
+    "json": lambda obj: orjson.dumps(obj).decode(),
+    "msgpack": msgpack.packb,
+}
+
+action_index = ActionIndex()
+# Live per-connection outboxes, for /health and /connections
+outboxes = set()
+closed = {"dropped": 0, "coalesced": 0, "disconnected": 0}
+
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "source": SOURCE,
+        "feed": feed.stats(),
+        "outbox": {
+            "connections": len(outboxes),
+            "policy": POLICY,
+            "queued_bytes": sum(o.bytes for o in outboxes),
+            "dropped": closed["dropped"] + sum(o.dropped for o in outboxes),
+            "coalesced": closed["coalesced"] + sum(o.coalesced for o in outboxes),
+            "disconnected": closed["disconnected"],
+        },
+        "ingest": writer.stats(),
+    }
+
+
+@app.get("/connections")
+async def connections():
+    stats = [outbox.stats() for outbox in outboxes]
+    return sorted(stats, key=lambda c: c["queued_bytes"], reverse=True)
+
+
+class Batcher:
+    """Packs events into one frame per max_events, or max_ms after the first one"""
+
+    def __init__(self, outbox: Subscription, encoding: str, batch=None):
+        self.outbox = outbox
+        self.encode = ENCODERS[encoding]
+        # Without a batch every event is its own frame, as an object, not a list
+        if batch is not None and not isinstance(batch, dict):
+            raise ValueError(f"batch must be an object, not {type(batch).__name__}")
+        self.batched = batch is not None
+        batch = batch or {}
+        self.max_events = max(int(batch.get("max_events", 100)), 1)
+        self.max_ms = max(float(batch.get("max_ms", 50)), 0)
+        self.pending = []
+        self._timer = None
+
+    def add(self, event: dict):
+        if not self.batched:
+            self.outbox.put(self.encode(event))
+            return
+        self.pending.append(event)
+        if len(self.pending) >= self.max_events:
+            self.flush()
+        elif self._timer is None and self.max_ms:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.max_ms / 1000, self.flush)
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.pending:
+            self.outbox.put(self.encode(self.pending))
+            self.pending = []
+
+
+async def produce(batcher: Batcher, action_filter, interval: float):
+    """Ticks out one matching row per interval, whether or not the client keeps up"""
+    discard = FILTER_MODE == "discard"
+    while True:
+        await asyncio.sleep(interval)
+        rand_id = action_index.random_id(None if discard else action_filter)
+        # Short-lived session so idle sockets do not pin pooled reader connections
+        async with ReadSessionLocal() as session:
+            result = await session.execute(
+                select(DBLog.id, DBLog.user_id, DBLog.action).where(DBLog.id == rand_id)
+            )
+            row = result.first()
+
+        if row and not (discard and action_filter and row.action != action_filter):
+            batcher.add(
+                {
+                    "id": row.id,
+                    "user": row.user_id,
+                    "action": row.action,
+                    "emitted_at": time.time(),
+                }
+            )
+
+
+async def follow_feed(batcher: Batcher, action_filter):
+    """Sends every newly inserted row that matches, as soon as the feed reads it"""
+    sub = feed.subscribe()
+    try:
+        while True:
+            rows = await sub.get()
+            now = time.time()
+            for row in rows:
+                if action_filter and row.action != action_filter:
+                    continue
+                batcher.add(
+                    {
+                        "id": row.id,
+                        "user": row.user_id,
+                        "action": row.action,
+                        "timestamp": str(row.timestamp),
+                        "emitted_at": now,
+                    }
+                )
+    finally:
+        feed.unsubscribe(sub)
 
 
 @app.websocket("/ws")
@@ -24,26 +154,102 @@ async def websocket_endpoint(websocket: WebSocket):
         data = await websocket.receive_text()
         request_data = json.loads(data)
         action_filter = request_data.get("action_filter")
+        # Optional, negotiated once: encoding, batch {max_events, max_ms}, interval_ms
+        encoding = request_data.get("encoding", "json")
+        if encoding not in ENCODERS:
+            await websocket.close(code=1003, reason=f"Unknown encoding {encoding!r}")
+            return
+        try:
+            interval = float(request_data.get("interval_ms", TICK_MS))
+        except (TypeError, ValueError):
+            await websocket.close(code=1003, reason="interval_ms must be a number")
+            return
+        interval = min(max(interval, 1), 1000)
 
-        async with AsyncSessionLocal() as session:
-            max_id = await session.scalar(select(func.max(DBLog.id)))
-            if not max_id:
+        if SOURCE == "sample":
+            # The filter is applied when choosing the row, so every lookup yields a message
+            await action_index.load()
+            if action_index.random_id(action_filter) is None:
                 return
 
+        # The producer never waits on the socket; a slow client only fills its outbox
+        outbox = Subscription()
+        try:
+            batcher = Batcher(outbox, encoding, request_data.get("batch"))
+        except (TypeError, ValueError):
+            await websocket.close(
+                code=1003, reason="batch must be an object of numeric max_events, max_ms"
+            )
+            return
+        outboxes.add(outbox)
+        if SOURCE == "feed":
+            producer = asyncio.create_task(follow_feed(batcher, action_filter))
+        else:
+            producer = asyncio.create_task(
+                produce(batcher, action_filter, interval / 1000)
+            )
+        try:
             while True:
-                await asyncio.sleep(0.1)
-                rand_id = random.randint(1, max_id)
-                result = await session.execute(select(DBLog).where(DBLog.id == rand_id))
-                log = result.scalar_one_or_none()
-
-                if log and (not action_filter or log.action == action_filter):
-                    payload = {"id": log.id, "user": log.user_id, "action": log.action}
-                    await websocket.send_json(payload)
+                frame = await outbox.get()
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
+        except SlowConsumer:
+            await websocket.close(code=1013)  # Try Again Later
+        finally:
+            producer.cancel()
+            batcher.flush()
+            outboxes.discard(outbox)
+            closed["dropped"] += outbox.dropped
+            closed["coalesced"] += outbox.coalesced
+            closed["disconnected"] += outbox.closed
     except WebSocketDisconnect:
         pass
 
 
+async def ack_ingest(websocket: WebSocket, acks: asyncio.Queue):
+    """Sends one ack per ingest message, in the order the messages arrived"""
+    while True:
+        seq, result = await acks.get()
+        try:
+            inserted = await result
+            await websocket.send_text(
+                orjson.dumps({"seq": seq, "inserted": inserted}).decode()
+            )
+        except Exception as e:
+            # Bad input, or a failed commit: either way none of the message was written
+            await websocket.send_text(
+                orjson.dumps({"seq": seq, "error": str(e)}).decode()
+            )
+
+
+@app.websocket("/ingest")
+async def ingest_endpoint(websocket: WebSocket):
+    """Each message is an NDJSON chunk of logs, acked with its seq once committed"""
+    await websocket.accept()
+    # Messages are queued for commit without waiting on earlier acks, up to a bound
+    acks = asyncio.Queue(maxsize=INGEST_IN_FLIGHT)
+    acker = asyncio.create_task(ack_ingest(websocket, acks))
+    seq = 0
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            body = message.get("bytes") or (message.get("text") or "").encode()
+            try:
+                result = await writer.submit(parse_ndjson(body))
+            except ValueError as e:
+                result = asyncio.get_running_loop().create_future()
+                result.set_exception(e)
+            await acks.put((seq, result))
+            seq += 1
+    finally:
+        acker.cancel()
+
+
 if __name__ == "__main__":
-    import uvicorn
+    from src.servers.launch import serve
 
-    uvicorn.run(app, host="0.0.0.0", port=8003)
+    serve(app, "src.servers.ws:app", 8003, ws_per_message_deflate=DEFLATE)
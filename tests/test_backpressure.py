@@ -0,0 +1,68 @@
+import asyncio
+import statistics
+import time
+
+import pytest
+
+from src.core.broadcast import BroadcastHub, SlowConsumer
+
+FRAME_BYTES = 200
+HIGH_WATER = 20 * FRAME_BYTES
+RUN_SEC = 0.5
+
+
+async def timestamped_frame():
+    return str(time.perf_counter()).encode().ljust(FRAME_BYTES)
+
+
+async def fast_reader(sub, latencies, stop):
+    while not stop.is_set():
+        frame = await sub.get()
+        latencies.append(time.perf_counter() - float(frame))
+
+
+async def run_hub(policy, with_slow_client):
+    """Latencies of three fast readers, and the slow subscription if there is one"""
+    hub = BroadcastHub(
+        timestamped_frame, interval=0.002, high_water=HIGH_WATER, policy=policy
+    )
+    # Never reads: everything published piles up behind its high-water mark
+    slow = hub.subscribe() if with_slow_client else None
+    stop = asyncio.Event()
+    latencies = [[], [], []]
+    readers = [
+        asyncio.create_task(fast_reader(hub.subscribe(), lats, stop))
+        for lats in latencies
+    ]
+    await asyncio.sleep(RUN_SEC)
+    stop.set()
+    for task in readers:
+        task.cancel()
+    await asyncio.gather(*readers, return_exceptions=True)
+    hub._task.cancel()
+    return hub, slow, latencies
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy", ["drop-oldest", "coalesce", "disconnect"])
+async def test_slow_consumer_does_not_delay_fast_ones(policy):
+    _, _, baseline = await run_hub(policy, with_slow_client=False)
+    hub, slow, latencies = await run_hub(policy, with_slow_client=True)
+
+    # Every fast reader saw every frame, as promptly as with no slow client
+    assert all(len(lats) >= hub.published - 1 for lats in latencies)
+    p50 = statistics.median(lat for lats in latencies for lat in lats)
+    base_p50 = statistics.median(lat for lats in baseline for lat in lats)
+    assert p50 < max(base_p50 * 3, 0.005)
+
+    # The slow one stayed bounded, in the way its policy says
+    assert slow.bytes <= HIGH_WATER
+    if policy == "drop-oldest":
+        assert slow.dropped > 0 and slow.bytes > HIGH_WATER - FRAME_BYTES
+        assert hub.connections()[0]["id"] == slow.id
+    elif policy == "coalesce":
+        assert slow.coalesced > 0 and slow.dropped == 0
+    else:
+        assert slow.closed
+        with pytest.raises(SlowConsumer):
+            await slow.get()
@@ -0,0 +1,66 @@
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.core.changefeed import ChangeFeed
+from src.core.ingest import GroupCommitWriter
+from src.core.models import NewLog
+from src.scripts.generate import generate, make_profile
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "feed.db")
+    generate(make_profile(1_000, 16, seed=1), workers=1, out=path)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_feed_tails_new_rows_in_id_order(db_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    # Polls too slowly to matter: local commits have to wake it
+    feed = ChangeFeed(poll_ms=60_000, sessions=async_sessionmaker(engine))
+    writer = GroupCommitWriter(max_delay_ms=1, target=engine)
+    writer.on_commit.append(feed.notify)
+    sub = feed.subscribe()
+    await asyncio.sleep(0.1)  # first read sets the high-water mark at the tail
+    start = feed.high_water
+    try:
+        await writer.write([NewLog(user_id=1, action="VIEW") for _ in range(3)])
+        rows = await asyncio.wait_for(sub.get(), 1)
+        assert [row.id for row in rows] == [start + 1, start + 2, start + 3]
+
+        # Rows committed by another connection are found by polling
+        feed.poll = 0.01
+        feed.notify()  # ends the minute-long wait, later ones are 10 ms
+        await asyncio.sleep(0.05)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO logs (user_id, action) VALUES (2, 'BUY')")
+        rows = await asyncio.wait_for(sub.get(), 1)
+        assert [(row.id, row.action) for row in rows] == [(start + 4, "BUY")]
+
+        # Deleting the newest rows does not hide the ones written after them
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DELETE FROM logs WHERE id > ?", (start,))
+        await writer.write([NewLog(user_id=3, action="LOGIN") for _ in range(2)])
+        rows = await asyncio.wait_for(sub.get(), 1)
+        assert [row.user_id for row in rows] == [3, 3]
+    finally:
+        feed.unsubscribe(sub)
+        await engine.dispose()
+
+
+
+@pytest.mark.asyncio
+async def test_idle_feed_checks_the_tail_every_n_reads(db_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    feed = ChangeFeed(sessions=async_sessionmaker(engine), tail_check=10)
+    try:
+        for _ in range(25):
+            assert await feed._read() == []
+    finally:
+        await engine.dispose()
+    # One max(id) to start from, 25 reads, and a tail lookup after every 10th
+    assert (feed.polls, feed.tail_checks) == (1 + 25 + 2, 2)
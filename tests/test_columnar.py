@@ -0,0 +1,130 @@
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+import pytest
+
+from src.core.columnar import Columns, ColumnStore
+from src.core.filters import LogFilter
+from src.core.pagination import encode_cursor
+from src.core.queries import LOG_COLUMNS
+from src.scripts.generate import generate, make_profile
+from src.servers.gql import LOG_COLUMNS as GQL_COLUMNS
+
+NEWEST_FIRST = (
+    "SELECT id, user_id, action, timestamp, ip_address, metadata_json FROM logs "
+    "{} ORDER BY timestamp DESC, id DESC LIMIT ?"
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "columns.db")
+    generate(make_profile(5_000, 16, seed=1, end="2026-01-01"), workers=1, out=path)
+    return path
+
+
+def sqlite_page(path, limit, where="", params=()):
+    with closing(sqlite3.connect(path)) as conn:
+        return conn.execute(NEWEST_FIRST.format(where), (*params, limit)).fetchall()
+
+
+def as_stored(row):
+    """A column-store row in the shape SQLite hands back"""
+    return (*row[:3], row.timestamp.strftime("%Y-%m-%d %H:%M:%S.%f"), *row[4:])
+
+
+@pytest.mark.asyncio
+async def test_pages_match_sqlite(db_path):
+    store = ColumnStore(db_path, refresh_sec=0)
+    await store.load()
+    store.close()
+
+    first = store.page(LOG_COLUMNS, 50)
+    assert [as_stored(r) for r in first] == sqlite_page(db_path, 50)
+
+    last = first[-1]
+    cursor = encode_cursor(last.timestamp, last.id)
+    expected = sqlite_page(
+        db_path, 50, "WHERE (timestamp, id) < (?, ?)", (as_stored(last)[3], last.id)
+    )
+    assert [as_stored(r) for r in store.page(LOG_COLUMNS, 50, cursor)] == expected
+
+    # GraphQL's text timestamp is the stored text
+    rows = store.page(tuple(GQL_COLUMNS.values()), 5)
+    assert [r.timestamp for r in rows] == [r[3] for r in sqlite_page(db_path, 5)]
+
+    buys = store.page(LOG_COLUMNS, 20, filt=LogFilter(action="BUY"))
+    assert [as_stored(r) for r in buys] == sqlite_page(
+        db_path, 20, "WHERE action = ?", ("BUY",)
+    )
+
+    # A time range is cut out of the sorted columns
+    stamps = [r[3] for r in sqlite_page(db_path, 300)]
+    since, until = stamps[-1], stamps[100]
+    window = LogFilter(
+        action="BUY",
+        since=datetime.fromisoformat(since),
+        until=datetime.fromisoformat(until),
+    )
+    assert [as_stored(r) for r in store.page(LOG_COLUMNS, 500, filt=window)] == (
+        sqlite_page(
+            db_path,
+            500,
+            "WHERE action = ? AND timestamp >= ? AND timestamp < ?",
+            ("BUY", since, until),
+        )
+    )
+
+    chunks = list(store.scan(LOG_COLUMNS, 250, cursor, chunk=100))
+    assert [len(c) for c in chunks] == [100, 100, 50]
+    assert [as_stored(r) for c in chunks for r in c] == sqlite_page(
+        db_path, 250, "WHERE (timestamp, id) < (?, ?)", (as_stored(last)[3], last.id)
+    )
+
+
+def test_extended_matches_one_load(db_path):
+    with closing(sqlite3.connect(db_path)) as conn:
+        rows = conn.execute(
+            "SELECT id, user_id, action, timestamp, ip_address, metadata_json "
+            "FROM logs ORDER BY id LIMIT 2000"
+        ).fetchall()
+    whole = Columns.from_rows(rows)
+    grown = Columns.from_rows(rows[:1500]).extended(rows[1500:])
+    for key in ("id", "user_id", "action", "timestamp", "ip_address", "metadata_json"):
+        idx = whole.positions(2000, len(whole), None)
+        assert grown.values(key, False, idx) == whole.values(key, False, idx)
+    # Rows that sort before the tail cannot just be appended
+    assert Columns.from_rows(rows[1500:]).extended(rows[:10]) is None
+
+
+def execute(path, *statements):
+    with closing(sqlite3.connect(path)) as conn, conn:
+        for sql in statements:
+            conn.execute(sql)
+
+
+@pytest.mark.asyncio
+async def test_refresh_follows_commits(db_path):
+    store = ColumnStore(db_path, refresh_sec=0)
+    await store.load()
+    newer = (
+        "INSERT INTO logs (user_id, action, timestamp) "
+        "VALUES (1, 'BUY', '2026-01-02 00:00:00.000000')"
+    )
+    try:
+        # Nothing committed since the load: no query at all
+        await store.refresh()
+        assert (store.reloads, store.appends) == (1, 0)
+
+        execute(db_path, newer)
+        await store.refresh()
+        assert (store.reloads, store.appends, len(store.columns)) == (1, 1, 5_001)
+
+        # The row count is back where it was, but row 10 is gone
+        execute(db_path, "DELETE FROM logs WHERE id = 10", newer)
+        await store.refresh()
+        assert (store.reloads, len(store.columns)) == (2, 5_001)
+        assert 10 not in store.columns.ids
+    finally:
+        store.close()
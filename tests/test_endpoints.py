@@ -1,7 +1,18 @@
+import asyncio
+import json
+import sqlite3
+import time
+from contextlib import aclosing, closing
+
 import grpc
 import httpx
 import pytest
+import websockets
+from google.protobuf.field_mask_pb2 import FieldMask
 
+from src.client.graphql_client import log_events, persisted_query
+from src.client.ws_client import decode_events
+from src.core.database import DB_PATH
 from src.servers.protos import logs_pb2, logs_pb2_grpc
 
 
@@ -34,3 +45,335 @@ async def test_rest_logs():
         resp = await client.get("http://localhost:8000/logs?limit=5")
         assert resp.status_code == 200
         assert len(resp.json()) == 5
+
+
+@pytest.mark.asyncio
+async def test_rest_logs_cursor():
+    async with httpx.AsyncClient() as client:
+        first = await client.get("http://localhost:8000/logs?limit=5")
+        cursor = first.headers["X-Next-Cursor"]
+        second = await client.get(
+            "http://localhost:8000/logs", params={"limit": 5, "cursor": cursor}
+        )
+        assert second.status_code == 200
+        first_ids = {log["id"] for log in first.json()}
+        assert len(second.json()) == 5
+        assert first_ids.isdisjoint(log["id"] for log in second.json())
+        assert second.json()[0]["timestamp"] <= first.json()[-1]["timestamp"]
+
+
+@pytest.mark.asyncio
+async def test_grpc_logs_cursor():
+    async with grpc.aio.insecure_channel("localhost:50051") as channel:
+        stub = logs_pb2_grpc.ActivityServiceStub(channel)
+        first = await stub.GetLogs(logs_pb2.GetLogsRequest(limit=5))
+        second = await stub.GetLogs(
+            logs_pb2.GetLogsRequest(limit=5, cursor=first.next_cursor)
+        )
+        assert len(second.logs) == 5
+        assert {l.id for l in first.logs}.isdisjoint(l.id for l in second.logs)
+
+
+@pytest.mark.asyncio
+async def test_grpc_stream_logs_matches_unary():
+    async with grpc.aio.insecure_channel("localhost:50051") as channel:
+        stub = logs_pb2_grpc.ActivityServiceStub(channel)
+        unary = await stub.GetLogs(logs_pb2.GetLogsRequest(limit=25))
+        request = logs_pb2.StreamLogsRequest(limit=25, chunk_size=10)
+        pages = [page async for page in stub.StreamLogs(request)]
+        assert [len(page.logs) for page in pages] == [10, 10, 5]
+        assert [log for page in pages for log in page.logs] == list(unary.logs)
+
+
+@pytest.mark.asyncio
+async def test_grpc_field_mask():
+    async with grpc.aio.insecure_channel("localhost:50051") as channel:
+        stub = logs_pb2_grpc.ActivityServiceStub(channel)
+        mask = FieldMask(paths=["id", "timestamp_us"])
+        full = await stub.GetLogs(logs_pb2.GetLogsRequest(limit=3))
+        sparse = await stub.GetLogs(logs_pb2.GetLogsRequest(limit=3, fields=mask))
+        assert [l.id for l in sparse.logs] == [l.id for l in full.logs]
+        assert [l.timestamp_us for l in sparse.logs] == [
+            l.timestamp_us for l in full.logs
+        ]
+        assert not any(l.action or l.timestamp for l in sparse.logs)
+        assert sparse.next_cursor == full.next_cursor
+
+
+@pytest.mark.asyncio
+async def test_graphql_logs_sparse_selection():
+    query = "{ logsPage(limit: 3) { nextCursor logs { id action } } }"
+    async with httpx.AsyncClient() as client:
+        resp = await client.post("http://localhost:8001/graphql", json={"query": query})
+        page = resp.json()["data"]["logsPage"]
+        assert page["nextCursor"]
+        assert [set(log) for log in page["logs"]] == [{"id", "action"}] * 3
+
+
+@pytest.mark.asyncio
+async def test_graphql_persisted_query():
+    # A unique query, so the hash cannot be registered by an earlier run
+    query = "query Apq%d { logs(limit: 2) { id } }" % time.time_ns()
+    hashed = {"extensions": persisted_query(query)}
+    url = "http://localhost:8001/graphql"
+    async with httpx.AsyncClient() as client:
+        miss = (await client.post(url, json=hashed)).json()
+        assert miss["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+        full = (await client.post(url, json={**hashed, "query": query})).json()
+        hit = (await client.post(url, json=hashed)).json()
+        assert hit["data"] == full["data"]
+        assert len(hit["data"]["logs"]) == 2
+
+        wrong = {**hashed, "query": "{ logs(limit: 1) { id } }"}
+        assert (await client.post(url, json=wrong)).json()["errors"]
+
+
+@pytest.mark.asyncio
+async def test_graphql_subscription_log_events():
+    events = []
+    async with aclosing(log_events("LOGIN", "id action emittedAt")) as stream:
+        async for event in stream:
+            events.append(event)
+            if len(events) == 3:
+                break
+    assert {event["action"] for event in events} == {"LOGIN"}
+    assert events[0]["emittedAt"] <= events[-1]["emittedAt"] <= time.time()
+
+
+async def sse_ids(client, count, headers=None):
+    ids = []
+    async with client.stream(
+        "GET", "http://localhost:8002/stream", headers=headers
+    ) as resp:
+        async for line in resp.aiter_lines():
+            if line.startswith("id: "):
+                ids.append(line[4:])
+                if len(ids) == count:
+                    return ids
+
+
+@pytest.mark.asyncio
+async def test_sse_last_event_id_replay():
+    async with httpx.AsyncClient(timeout=10) as client:
+        first = await sse_ids(client, 3)
+        seqs = [int(event_id.rpartition("-")[2]) for event_id in first]
+        assert seqs == sorted(seqs)
+        # Resume from the first id: the next two come from the replay buffer
+        resumed = await sse_ids(client, 2, {"Last-Event-ID": first[0]})
+        assert resumed == first[1:]
+
+
+@pytest.mark.asyncio
+async def test_ws_batched_msgpack():
+    options = {
+        "action_filter": "BUY",
+        "interval_ms": 5,
+        "encoding": "msgpack",
+        "batch": {"max_events": 4, "max_ms": 1000},
+    }
+    async with websockets.connect("ws://localhost:8003/ws") as ws:
+        await ws.send(json.dumps(options))
+        frame = await asyncio.wait_for(ws.recv(), 5)
+    assert isinstance(frame, bytes)
+    events = decode_events(frame)
+    assert len(events) == 4
+    assert {event["action"] for event in events} == {"BUY"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch", [5, "x", {"max_events": "many"}])
+async def test_ws_rejects_malformed_batch(batch):
+    async with websockets.connect("ws://localhost:8003/ws") as ws:
+        await ws.send(json.dumps({"batch": batch}))
+        with pytest.raises(websockets.ConnectionClosed) as closed:
+            await asyncio.wait_for(ws.recv(), 5)
+    assert closed.value.rcvd.code == 1003
+    assert "batch" in closed.value.rcvd.reason
+
+
+@pytest.mark.asyncio
+async def test_rest_logs_fast_matches_standard():
+    async with httpx.AsyncClient() as client:
+        standard = await client.get("http://localhost:8000/logs?limit=5")
+        fast = await client.get("http://localhost:8000/logs?limit=5&fast=true")
+        assert fast.status_code == 200
+        assert fast.json() == standard.json()
+
+
+@pytest.mark.asyncio
+async def test_rest_logs_stream_ndjson():
+    async with httpx.AsyncClient() as client:
+        fast = await client.get("http://localhost:8000/logs?limit=25&fast=true")
+        resp = await client.get("http://localhost:8000/logs/stream?limit=25&chunk=10")
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line) for line in resp.text.splitlines()] == fast.json()
+
+
+@pytest.mark.asyncio
+async def test_rest_cache_hits():
+    async with httpx.AsyncClient() as client:
+        first = await client.get("http://localhost:8000/logs?limit=7")
+        before = (await client.get("http://localhost:8000/health")).json()["cache"]
+        second = await client.get("http://localhost:8000/logs?limit=7")
+        after = (await client.get("http://localhost:8000/health")).json()["cache"]
+        assert second.content == first.content
+        assert after["hits"] == before["hits"] + 1
+
+
+@pytest.mark.asyncio
+async def test_graphql_cache_stores_responses():
+    query = {"query": "{ logs(limit: 7) { id action } }"}
+    # Cursor pages are never stored, and neither are errors (this cursor is bad)
+    paged = {"query": '{ logs(limit: 7, cursor: "bad") { id } }'}
+    async with httpx.AsyncClient() as client:
+        first = await client.post("http://localhost:8001/graphql", json=query)
+        before = (await client.get("http://localhost:8001/health")).json()["cache"]
+        second = await client.post("http://localhost:8001/graphql", json=query)
+        for _ in range(2):
+            await client.post("http://localhost:8001/graphql", json=paged)
+        after = (await client.get("http://localhost:8001/health")).json()["cache"]
+    assert second.content == first.content
+    assert after["hits"] == before["hits"] + 1
+    assert after["entries"] == before["entries"]
+
+
+@pytest.fixture
+def cleanup_writes():
+    """Deletes the rows a test ingests, so the seeded benchmark data stays as built"""
+    with closing(sqlite3.connect(DB_PATH, timeout=30)) as conn:
+        last_id = conn.execute("SELECT max(id) FROM logs").fetchone()[0] or 0
+    yield
+    with closing(sqlite3.connect(DB_PATH, timeout=30)) as conn, conn:
+        conn.execute("DELETE FROM logs WHERE id > ?", (last_id,))
+
+
+def ingest_rows(marker, count):
+    return [
+        {"user_id": 1, "action": "LOGIN", "metadata_json": json.dumps({"test": marker})}
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rest_ingest_ndjson(cleanup_writes):
+    marker = f"rest-{time.time_ns()}"
+    body = "".join(json.dumps(row) + "\n" for row in ingest_rows(marker, 3))
+    async with httpx.AsyncClient() as client:
+        await client.get("http://localhost:8000/logs?limit=1")  # cached
+        resp = await client.post("http://localhost:8000/logs", content=body)
+        assert resp.status_code == 201
+        assert resp.json() == {"inserted": 3}
+        # The cached "latest N" body is dropped by the commit, not a later poll
+        latest = await client.get("http://localhost:8000/logs?limit=1")
+        assert marker in latest.json()[0]["metadata_json"]
+        # Stamped now, so they are the newest rows
+        newest = await client.get("http://localhost:8000/logs/stream?limit=3")
+        assert all(marker in line for line in newest.text.splitlines())
+
+        bad = await client.post("http://localhost:8000/logs", content=body + "{}\n")
+        assert bad.status_code == 400
+        assert bad.json()["detail"].startswith("Line 4")
+
+
+@pytest.mark.asyncio
+async def test_grpc_and_ws_ingest(cleanup_writes):
+    rows = ingest_rows(f"stream-{time.time_ns()}", 5)
+    async with grpc.aio.insecure_channel("localhost:50051") as channel:
+        stub = logs_pb2_grpc.ActivityServiceStub(channel)
+        resp = await stub.IngestLogs(iter(logs_pb2.LogEntry(**row) for row in rows))
+        assert resp.inserted == 5
+
+        # More than a commit's worth of good rows, then a bad one: none are kept
+        marker = f"stream-bad-{time.time_ns()}"
+        entries = [logs_pb2.LogEntry(**row) for row in ingest_rows(marker, 1500)]
+        with pytest.raises(grpc.aio.AioRpcError) as failed:
+            await stub.IngestLogs(iter(entries + [logs_pb2.LogEntry(user_id=1)]))
+        assert failed.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+    with closing(sqlite3.connect(DB_PATH)) as conn:
+        kept = conn.execute(
+            "SELECT count(*) FROM logs WHERE metadata_json LIKE ?", (f"%{marker}%",)
+        ).fetchone()[0]
+    assert kept == 0
+
+    async with websockets.connect("ws://localhost:8003/ingest") as ws:
+        await ws.send("\n".join(json.dumps(row) for row in rows))
+        await ws.send('{"user_id": 1}')
+        acks = [json.loads(await asyncio.wait_for(ws.recv(), 5)) for _ in range(2)]
+    assert acks[0] == {"seq": 0, "inserted": 5}
+    assert acks[1]["seq"] == 1 and "error" in acks[1]
+
+
+@pytest.mark.asyncio
+async def test_stats_from_rollups(cleanup_writes):
+    user_id = 10**9 + time.time_ns() % 10**6  # a user no generated row has
+    body = "\n".join(
+        json.dumps({"user_id": user_id, "action": "LOGIN"}) for _ in range(4)
+    )
+    async with httpx.AsyncClient() as client:
+        await client.post("http://localhost:8000/logs", content=body)
+        rest = (
+            await client.get(f"http://localhost:8000/stats?minutes=1&user_id={user_id}")
+        ).json()
+        query = f"{{ stats(minutes: 1, userId: {user_id}) {{ total userLogs }} }}"
+        gql = await client.post("http://localhost:8001/graphql", json={"query": query})
+        assert (await client.get("http://localhost:8000/stats?minutes=-1")).is_error
+    assert rest["user_logs"] == 4
+    assert rest["total"] == sum(rest["actions"].values())
+    # Just inserted, so they are counted in the newest minute
+    assert rest["minutes"][0]["action"] in rest["actions"]
+    assert gql.json()["data"]["stats"] == {"total": rest["total"], "userLogs": 4}
+
+    async with grpc.aio.insecure_channel("localhost:50051") as channel:
+        stub = logs_pb2_grpc.ActivityServiceStub(channel)
+        resp = await stub.GetStats(logs_pb2.StatsRequest(user_id=user_id))
+    assert resp.total == rest["total"]
+    assert dict(resp.actions) == rest["actions"]
+    assert resp.user_logs == 4
+
+
+@pytest.mark.asyncio
+async def test_filters_agree_across_protocols(cleanup_writes):
+    session = f"s{time.time_ns()}"
+    rows = [
+        {
+            "user_id": 7,
+            "action": action,
+            "metadata_json": json.dumps({"session": session}),
+        }
+        for action in ("BUY", "VIEW", "BUY")
+    ]
+    async with httpx.AsyncClient() as client:
+        await client.post(
+            "http://localhost:8000/logs", content="\n".join(map(json.dumps, rows))
+        )
+        params = {"meta": f"session:{session}", "action": "BUY", "user_id": 7}
+        rest = (await client.get("http://localhost:8000/logs", params=params)).json()
+        searched = await client.get(
+            "http://localhost:8000/logs/stream", params={"search": session}
+        )
+        query = (
+            '{ logs(where: {action: "BUY", userId: 7, metadata: [{key: "session", '
+            f'value: "{session}"}}]}}) {{ id }} }}'
+        )
+        gql = await client.post("http://localhost:8001/graphql", json={"query": query})
+        unindexed = await client.get(
+            "http://localhost:8000/logs", params={"meta": "payload:x"}
+        )
+    assert [r["action"] for r in rest] == ["BUY", "BUY"]
+    assert len(searched.text.splitlines()) == 3
+    assert [r["id"] for r in gql.json()["data"]["logs"]] == [r["id"] for r in rest]
+    assert unindexed.status_code == 400
+
+    async with grpc.aio.insecure_channel("localhost:50051") as channel:
+        stub = logs_pb2_grpc.ActivityServiceStub(channel)
+        filt = logs_pb2.LogFilter(
+            user_id=7, action="BUY", metadata={"session": session}
+        )
+        resp = await stub.GetLogs(logs_pb2.GetLogsRequest(limit=10, filter=filt))
+        assert [log.id for log in resp.logs] == [r["id"] for r in rest]
+        with pytest.raises(grpc.aio.AioRpcError) as err:
+            await stub.GetLogs(
+                logs_pb2.GetLogsRequest(filter=logs_pb2.LogFilter(metadata={"x": "1"}))
+            )
+        assert err.value.code() == grpc.StatusCode.INVALID_ARGUMENT
@@ -0,0 +1,68 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from src.core.database import DBLog
+from src.core.filters import apply_filter, literal_sql, make_filter, query_plan
+from src.core.pagination import encode_cursor, paginate
+from src.scripts.generate import generate, make_profile
+
+SINCE = datetime(2025, 12, 31)
+
+# Each filter and the index its page must come from
+FILTERS = [
+    ({"user_id": 7}, "ix_logs_user_timestamp_id"),
+    ({"action": "BUY"}, "ix_logs_action_timestamp_id"),
+    ({"since": SINCE}, "ix_logs_timestamp_id"),
+    ({"metadata": {"session": "00000010"}}, "ix_logs_meta_session_timestamp_id"),
+    ({"metadata": {"page": "/p/7"}}, "ix_logs_meta_page_timestamp_id"),
+]
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("filters") / "filters.db")
+    generate(make_profile(5_000, 16, seed=1, end="2026-01-01"), workers=1, out=path)
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+def page(filt, cursor=None):
+    return paginate(apply_filter(select(DBLog), filt), 100, cursor)
+
+
+@pytest.mark.parametrize("args,index", FILTERS)
+def test_filters_page_off_an_index(conn, args, index):
+    filt = make_filter(**args)
+    cursor = encode_cursor(datetime(2026, 1, 1), 10**9)
+    for stmt in (page(filt), page(filt, cursor)):
+        plan = query_plan(conn, stmt)
+        # Walked in (timestamp, id) order, so the LIMIT stops it early
+        assert any(f"USING INDEX {index}" in step for step in plan), plan
+        assert not any("TEMP B-TREE" in step for step in plan), plan
+        assert not any(step.startswith("SCAN logs") for step in plan), plan
+
+
+def test_search_uses_fts_and_matches_like(conn):
+    session = conn.execute("SELECT metadata_json FROM logs LIMIT 1").fetchone()[0]
+    session = session.split('"')[3]
+    filt = make_filter(search=session)
+    plan = query_plan(conn, page(filt))
+    assert any("VIRTUAL TABLE INDEX" in step for step in plan), plan
+    assert any("USING INTEGER PRIMARY KEY" in step for step in plan), plan
+
+    found = [row[0] for row in conn.execute(literal_sql(page(filt)))]
+    expected = conn.execute(
+        "SELECT id FROM logs WHERE metadata_json LIKE ? "
+        "ORDER BY timestamp DESC, id DESC LIMIT 100",
+        (f"%{session}%",),
+    ).fetchall()
+    assert found and found == [row[0] for row in expected]
+
+
+def test_unindexed_metadata_key_is_rejected():
+    with pytest.raises(ValueError, match="not indexed"):
+        make_filter(metadata={"payload": "x"})
@@ -0,0 +1,30 @@
+from src.core.broadcast import BroadcastHub
+
+
+async def no_frame():
+    return None
+
+
+def worker_hub(worker):
+    hub = BroadcastHub(no_frame, replay=10, worker=worker)
+    for n in range(20):
+        hub.publish(f"{worker} frame {n}")
+    return hub
+
+
+def test_replay_ignores_ids_from_other_workers():
+    # Two workers started together: their sequence numbers cover the same range
+    a, b = worker_hub("a"), worker_hub("b")
+
+    # Its own id: just the frames after it
+    assert b.since("b-18") == ["b frame 18", "b frame 19"]
+    # Its own id, but older than the buffer: what is left, and a gap
+    assert b.since("b-2") == [f"b frame {n}" for n in range(10, 20)]
+    assert b.replay_gaps == 1
+
+    # Another worker's id, inside this one's range: no replay, and a gap
+    assert b.since("a-15") == []
+    assert a.since("b-15") == []
+    # Unprefixed, malformed or not yet handed out: the same
+    assert b.since("15") == [] and b.since("b-x") == [] and b.since("b-21") == []
+    assert b.replay_gaps == 5 and a.replay_gaps == 1
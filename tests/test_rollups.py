@@ -0,0 +1,47 @@
+import sqlite3
+
+from src.scripts.generate import generate, make_profile
+
+GROUP_BYS = {
+    "rollup_actions": "SELECT action, count(*) FROM logs GROUP BY 1",
+    "rollup_minute_actions": (
+        "SELECT substr(timestamp, 1, 16), action, count(*) FROM logs GROUP BY 1, 2"
+    ),
+    "rollup_users": "SELECT user_id, count(*) FROM logs GROUP BY 1",
+}
+
+
+def assert_rollups_match(conn):
+    for table, group_by in GROUP_BYS.items():
+        expected = sorted(conn.execute(group_by).fetchall())
+        assert sorted(conn.execute(f"SELECT * FROM {table}").fetchall()) == expected
+
+
+def test_rollups_follow_inserts_and_deletes(tmp_path):
+    path = str(tmp_path / "rollups.db")
+    generate(make_profile(5_000, 16, seed=1, users=50), workers=1, out=path)
+    conn = sqlite3.connect(path)
+    try:
+        # Built in bulk by the generator
+        assert_rollups_match(conn)
+
+        with conn:
+            conn.executemany(
+                "INSERT INTO logs (user_id, action, timestamp) VALUES (?, ?, ?)",
+                [(7, "BUY", "2030-01-01 00:00:00.000000")] * 3
+                + [(999, "NEW", "2030-01-01 00:01:30.000000")],
+            )
+        assert_rollups_match(conn)
+
+        with conn:
+            conn.execute("DELETE FROM logs WHERE user_id IN (7, 999)")
+        # Counts that reach zero lose their row
+        assert_rollups_match(conn)
+        assert not conn.execute(
+            "SELECT 1 FROM rollup_users WHERE user_id = 999"
+        ).fetchall()
+        assert not conn.execute(
+            "SELECT 1 FROM rollup_minute_actions WHERE minute >= '2030'"
+        ).fetchall()
+    finally:
+        conn.close()